@@ -0,0 +1,22 @@
+from django.contrib import admin
+from .models import ListingDailyStats, PromotionDailyStats, RollupWatermark
+
+
+@admin.register(PromotionDailyStats)
+class PromotionDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("target_type", "target_id", "day", "impressions", "clicks")
+    list_filter = ("target_type",)
+    search_fields = ("target_id",)
+    ordering = ("-day",)
+
+
+@admin.register(ListingDailyStats)
+class ListingDailyStatsAdmin(admin.ModelAdmin):
+    list_display = ("listing", "seller", "day", "views", "saves", "conversations")
+    raw_id_fields = ("listing", "seller")
+    ordering = ("-day",)
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("source", "last_id", "last_at", "updated_at")
@@ -0,0 +1,193 @@
+"""
+Impression and click events for promoted listings, stores and repair shops,
+and page views of every listing.
+
+record() appends to a per-process buffer that is pushed to a Redis list in a
+single RPUSH once it holds ANALYTICS_BUFFER_SIZE events or is older than
+ANALYTICS_BUFFER_SECONDS, so a request costs at most one Redis round trip and
+usually none. Events still buffered when a process dies are lost, which is
+acceptable for exposure stats.
+
+flush() runs from Celery beat and moves the Redis list into PostgreSQL in
+batches: each batch is COPYed into promotion_events and its impressions and
+clicks are added onto promotion_daily_stats with one upsert, in the same
+transaction. A batch is trimmed from Redis only after that commits, so a
+crash replays it instead of dropping it. Listing views are folded into the
+seller dashboard's daily stats by rollups.py.
+
+A run renames the queue to a processing list once and drains only that
+snapshot, so it ends however busy producers are. Runs are single-flight: the
+flush lock holds a per-run token and is renewed, checked against that token,
+right before each batch commits and again as the batch is trimmed. A run
+that finds its lock gone rolls its batch back and stops, so a second run can
+only start once the first has stopped writing; rollups.py relies on this.
+"""
+import atexit
+import io
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from config.redis_utils import acquire_lock, get_redis, release_lock, renew_lock
+from .models import PromotionDailyStats, PromotionEvent
+
+logger = logging.getLogger(__name__)
+
+IMPRESSION = PromotionEvent.Kind.IMPRESSION.value
+CLICK = PromotionEvent.Kind.CLICK.value
+VIEW = PromotionEvent.Kind.VIEW.value
+
+QUEUE_KEY = "analytics:promotion_events"
+PROCESSING_KEY = "analytics:promotion_events:processing"
+FLUSH_LOCK_KEY = "analytics:promotion_events:flushing"
+FLUSH_LOCK_SECONDS = 300  # renewed every batch; only a stalled run loses it
+
+# Drop the first ARGV[3] processing entries if ``token`` still holds the lock.
+TRIM_IF_LOCKED = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('ltrim', KEYS[2], ARGV[3], -1)
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_lock = threading.Lock()
+_pending = []
+_pending_since = 0.0
+
+
+def record(kind, target_type, target_ids):
+    """Count one ``kind`` event for each of ``target_ids``."""
+    global _pending_since
+    if not target_ids:
+        return
+    now = time.time()
+    entries = [f"{target_type}|{pk}|{kind}|{now:.3f}" for pk in target_ids]
+    with _lock:
+        if not _pending:
+            _pending_since = now
+        _pending.extend(entries)
+        if len(_pending) < settings.ANALYTICS_BUFFER_SIZE and now - _pending_since < settings.ANALYTICS_BUFFER_SECONDS:
+            return
+        batch = _pending[:]
+        _pending.clear()
+    _push(batch)
+
+
+def push_pending():
+    """Send whatever this process has buffered to Redis."""
+    with _lock:
+        batch = _pending[:]
+        _pending.clear()
+    _push(batch)
+
+
+atexit.register(push_pending)
+
+
+def _push(entries):
+    if not entries:
+        return
+    try:
+        get_redis().rpush(cache.make_key(QUEUE_KEY), *entries)
+    except Exception:
+        logger.exception("Dropped %d promotion events", len(entries))
+
+
+def _parse(raw):
+    events = []
+    for entry in raw:
+        try:
+            target_type, target_id, kind, ts = entry.decode().split("|")
+            events.append((target_type, uuid.UUID(target_id), kind, datetime.fromtimestamp(float(ts), dt_timezone.utc)))
+        except ValueError:
+            logger.warning("Skipping malformed promotion event %r", entry)
+    return events
+
+
+def _insert_events(events):
+    table = PromotionEvent._meta.db_table
+    if connection.vendor != "postgresql":
+        PromotionEvent.objects.bulk_create(
+            [PromotionEvent(target_type=t, target_id=pk, kind=k, occurred_at=at) for t, pk, k, at in events]
+        )
+        return
+    rows = io.StringIO("".join(f"{t}\t{pk}\t{k}\t{at.isoformat()}\n" for t, pk, k, at in events))
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} (target_type, target_id, kind, occurred_at) FROM STDIN", rows)
+
+
+def _add_to_rollups(events):
+    counts = defaultdict(lambda: [0, 0])
+    for target_type, target_id, kind, at in events:
+        if kind == VIEW:
+            continue  # listing views are rolled up per seller by rollups.py
+        counts[(target_type, target_id, at.date())][0 if kind == IMPRESSION else 1] += 1
+    if not counts:
+        return
+    table = PromotionDailyStats._meta.db_table
+    params = []
+    for (target_type, target_id, day), (impressions, clicks) in sorted(counts.items()):
+        params += [uuid.uuid4(), target_type, target_id, day, impressions, clicks]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (id, target_type, target_id, day, impressions, clicks)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(counts))}
+            ON CONFLICT (target_type, target_id, day) DO UPDATE SET
+                impressions = {table}.impressions + EXCLUDED.impressions,
+                clicks = {table}.clicks + EXCLUDED.clicks
+            """,
+            params,
+        )
+
+
+class FlushLockLost(Exception):
+    """Another flush took over; this run's batch must not commit."""
+
+
+def flush(batch_size=None):
+    """Move buffered events from Redis into the event log and daily rollups. Returns the number moved."""
+    batch_size = batch_size or settings.ANALYTICS_FLUSH_BATCH_SIZE
+    token = acquire_lock(FLUSH_LOCK_KEY, FLUSH_LOCK_SECONDS)
+    if token is None:
+        return 0
+    client = get_redis()
+    queue, processing = cache.make_key(QUEUE_KEY), cache.make_key(PROCESSING_KEY)
+    flushed = 0
+    try:
+        # A non-empty processing list is a crashed run's snapshot; finish that
+        # first and leave the queue for the next run.
+        if not client.exists(processing) and client.exists(queue):
+            client.rename(queue, processing)
+        while True:
+            raw = client.lrange(processing, 0, batch_size - 1)
+            if not raw:
+                break
+            events = _parse(raw)
+            with transaction.atomic():
+                if events:
+                    _insert_events(events)
+                    _add_to_rollups(events)
+                if not renew_lock(FLUSH_LOCK_KEY, token, FLUSH_LOCK_SECONDS):
+                    raise FlushLockLost
+            trimmed = client.eval(
+                TRIM_IF_LOCKED, 2, cache.make_key(FLUSH_LOCK_KEY), processing, token, FLUSH_LOCK_SECONDS, len(raw)
+            )
+            if not trimmed:
+                raise FlushLockLost
+            flushed += len(raw)
+    except FlushLockLost:
+        logger.warning("Promotion event flush lost its lock after %d events; stopping", flushed)
+    finally:
+        release_lock(FLUSH_LOCK_KEY, token)
+    if flushed:
+        logger.info("Flushed %d promotion events", flushed)
+    return flushed
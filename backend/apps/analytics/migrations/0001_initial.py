@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:40
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromotionEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('target_type', models.CharField(choices=[('listing', 'Listing'), ('store', 'Store'), ('repair_shop', 'Repair shop')], max_length=20)),
+                ('target_id', models.UUIDField()),
+                ('kind', models.CharField(choices=[('impression', 'Impression'), ('click', 'Click')], max_length=10)),
+                ('occurred_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'promotion_events',
+            },
+        ),
+        migrations.CreateModel(
+            name='PromotionDailyStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target_type', models.CharField(choices=[('listing', 'Listing'), ('store', 'Store'), ('repair_shop', 'Repair shop')], max_length=20)),
+                ('target_id', models.UUIDField()),
+                ('day', models.DateField()),
+                ('impressions', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'promotion_daily_stats',
+                'constraints': [models.UniqueConstraint(fields=('target_type', 'target_id', 'day'), name='promotion_daily_stats_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+import uuid
+from django.conf import settings
+from django.db import models
+
+from apps.transactions.models import PromotionPayment
+
+
+class PromotionEvent(models.Model):
+    """
+    Append-only log of impressions and clicks on promoted items, and of listing
+    page views. Rows arrive in bulk from the event buffer (see events.py), never
+    one per request.
+    """
+
+    class Kind(models.TextChoices):
+        IMPRESSION = "impression", "Impression"
+        CLICK = "click", "Click"
+        VIEW = "view", "Listing view"
+
+    id = models.BigAutoField(primary_key=True)
+    target_type = models.CharField(max_length=20, choices=PromotionPayment.Target.choices)
+    target_id = models.UUIDField()
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    occurred_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "promotion_events"
+
+    def __str__(self):
+        return f"{self.kind} {self.target_type} {self.target_id}"
+
+
+class PromotionDailyStats(models.Model):
+    """Impressions and clicks per promoted item per day (UTC), kept up to date as events are flushed."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    target_type = models.CharField(max_length=20, choices=PromotionPayment.Target.choices)
+    target_id = models.UUIDField()
+    day = models.DateField()
+    impressions = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "promotion_daily_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["target_type", "target_id", "day"], name="promotion_daily_stats_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.target_type} {self.target_id} {self.day}"
+
+
+class ListingDailyStats(models.Model):
+    """
+    Views, saves and conversations started per listing per day (UTC), for the
+    seller dashboard. Filled incrementally by rollups.py; never written per request.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    listing = models.ForeignKey("listings.Listing", on_delete=models.CASCADE, related_name="daily_stats")
+    seller = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    conversations = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "listing_daily_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["listing", "day"], name="listing_daily_stats_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["seller", "day"], name="listing_daily_stats_seller_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.listing_id} {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """How far each rollup source has been folded into the daily stats (see rollups.py)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    source = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(null=True, blank=True)
+    last_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rollup_watermarks"
+
+    def __str__(self):
+        return f"{self.source}: {self.last_id or self.last_at}"
@@ -0,0 +1,125 @@
+"""
+Incremental daily rollups for the seller dashboard (PostgreSQL).
+
+listing_daily_stats holds views, saves and conversations started per listing
+per day, so the dashboard never aggregates the raw tables. Each source keeps a
+watermark in rollup_watermarks; a run folds only the rows past it into the
+stats with one INSERT ... SELECT ... ON CONFLICT upsert per batch and moves the
+watermark in the same transaction, so a crashed run is simply repeated. The
+watermark row is locked for the batch, so overlapping runs take turns.
+
+Views come from promotion_events, which only events.flush() writes. That
+flush is single-flight: a run re-checks its token lock right before each
+batch commits and rolls back if the lock has moved on. So batches commit one
+after another, every id at or below the highest committed id is already
+visible, and the id watermark never steps past a row that is still in
+flight. Rolling views up by occurred_at would not be safe, because buffered
+events can reach the table minutes after they happen. Saves and conversations are stamped by
+created_at in request transactions that may commit slightly out of order, so
+those sources stop ANALYTICS_ROLLUP_SETTLE_SECONDS short of now. A first run
+starts from the oldest row and backfills history a day at a time.
+
+Saves count listings saved that day; unsaving later does not take one back.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.listings.models import Listing, SavedListing
+from apps.messaging.models import Conversation
+from .models import ListingDailyStats, PromotionEvent, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+WINDOW = timedelta(days=1)  # created_at range folded per statement
+
+# source -> (table, listing id column, timestamp column, extra condition, counter, watermark kind)
+SOURCES = {
+    "listing_views": (
+        PromotionEvent._meta.db_table, "target_id", "occurred_at",
+        "src.kind = 'view' AND src.target_type = 'listing'", "views", "id",
+    ),
+    "listing_saves": (SavedListing._meta.db_table, "listing_id", "created_at", "", "saves", "time"),
+    "listing_conversations": (Conversation._meta.db_table, "listing_id", "created_at", "", "conversations", "time"),
+}
+
+
+def _upsert_sql(source):
+    table, listing_column, at_column, condition, counter, kind = SOURCES[source]
+    stats, listings = ListingDailyStats._meta.db_table, Listing._meta.db_table
+    bounds = "src.id > %s AND src.id <= %s" if kind == "id" else f"src.{at_column} >= %s AND src.{at_column} < %s"
+    if condition:
+        bounds += f" AND {condition}"
+    return f"""
+        INSERT INTO {stats} (id, listing_id, seller_id, day, views, saves, conversations)
+        SELECT gen_random_uuid(), l.id, l.seller_id, day, {", ".join(
+            "count(*)" if column == counter else "0" for column in ("views", "saves", "conversations")
+        )}
+        FROM (
+            SELECT src.{listing_column} AS listing_id, (src.{at_column} AT TIME ZONE 'UTC')::date AS day
+            FROM {table} AS src
+            WHERE {bounds}
+        ) AS rows
+        JOIN {listings} AS l ON l.id = rows.listing_id
+        GROUP BY l.id, l.seller_id, day
+        ON CONFLICT (listing_id, day) DO UPDATE SET {counter} = {stats}.{counter} + EXCLUDED.{counter}
+    """
+
+
+def _scalar(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def roll_up_batch(source, now=None, batch_size=None):
+    """
+    Fold one batch of ``source`` rows past its watermark. Returns whether more
+    are waiting, or None if there was nothing to fold.
+    """
+    table, _, at_column, _, _, kind = SOURCES[source]
+    RollupWatermark.objects.get_or_create(source=source)
+    with transaction.atomic():
+        mark = RollupWatermark.objects.select_for_update().get(source=source)
+        if kind == "id":
+            end = _scalar(f"SELECT max(id) FROM {table}") or 0
+            low = mark.last_id or 0
+            high = min(low + (batch_size or settings.ANALYTICS_ROLLUP_BATCH_SIZE), end)
+        else:
+            end = (now or timezone.now()) - timedelta(seconds=settings.ANALYTICS_ROLLUP_SETTLE_SECONDS)
+            low = mark.last_at or _scalar(f"SELECT min({at_column}) FROM {table}") or end
+            high = min(low + WINDOW, end)
+        if high <= low:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(_upsert_sql(source), [low, high])
+        if kind == "id":
+            mark.last_id = high
+        else:
+            mark.last_at = high
+        mark.save(update_fields=["last_id", "last_at", "updated_at"])
+    return high < end
+
+
+def roll_up_all(now=None, batch_size=None):
+    """Bring every source up to date. Returns the number of batches folded per source."""
+    now = now or timezone.now()
+    batches = {}
+    for source in SOURCES:
+        batches[source] = 0
+        while True:
+            more = roll_up_batch(source, now, batch_size)
+            if more is None:
+                break
+            batches[source] += 1
+            if not more:
+                break
+    logger.info(
+        "Rolled up listing stats: %s",
+        ", ".join(f"{source}={count}" for source, count in batches.items()),
+        extra={"rollup_batches": batches},
+    )
+    return batches
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from .models import PromotionDailyStats
+
+
+class PromotionDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PromotionDailyStats
+        fields = ("day", "impressions", "clicks")
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from . import events, rollups
+
+
+@shared_task
+def flush_promotion_events():
+    """Move buffered impressions and clicks from Redis into PostgreSQL."""
+    return events.flush()
+
+
+@shared_task
+def roll_up_listing_stats():
+    """Fold new listing views, saves and conversations into the seller dashboard's daily stats."""
+    return rollups.roll_up_all()
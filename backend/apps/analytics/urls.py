@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("dashboard/", views.seller_dashboard, name="seller-dashboard"),
+    path("promotions/<str:target_type>/<uuid:target_id>/", views.promotion_stats, name="promotion-stats"),
+]
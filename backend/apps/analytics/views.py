@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db.models import Max, Sum
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.listings.models import Listing
+from apps.repairs.models import RepairShop
+from apps.stores.models import Store
+from apps.transactions.models import PromotionPayment
+from .models import ListingDailyStats, PromotionDailyStats, RollupWatermark
+from .serializers import PromotionDailyStatsSerializer
+
+# target_type -> (model, owner field)
+TARGETS = {
+    PromotionPayment.Target.LISTING: (Listing, "seller_id"),
+    PromotionPayment.Target.STORE: (Store, "owner_id"),
+    PromotionPayment.Target.REPAIR_SHOP: (RepairShop, "owner_id"),
+}
+MAX_DAYS = 365
+DASHBOARD_TOP_LISTINGS = 20
+COUNTERS = ("views", "saves", "conversations")
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def promotion_stats(request, target_type, target_id):
+    """
+    GET — daily impressions and clicks for one of the caller's promoted items.
+    Covers the current promotion by default, or the last ``?days=`` days.
+    Reads only the daily rollups.
+    """
+    if target_type not in TARGETS:
+        return Response({"error": "Unknown target type."}, status=status.HTTP_400_BAD_REQUEST)
+    model, owner_field = TARGETS[target_type]
+    target = model.objects.filter(pk=target_id).select_related("promotion").first()
+    if target is None or (getattr(target, owner_field) != request.user.pk and not request.user.is_staff):
+        return Response({"error": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    promotion = getattr(target, "promotion", None)
+
+    today = timezone.now().date()
+    if request.query_params.get("days"):
+        try:
+            days = min(max(int(request.query_params["days"]), 1), MAX_DAYS)
+        except ValueError:
+            return Response({"error": "days must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+        since = today - timedelta(days=days - 1)
+    elif promotion is not None:
+        since = max(promotion.started_at.date(), today - timedelta(days=MAX_DAYS - 1))
+    else:
+        since = today - timedelta(days=29)
+
+    rows = PromotionDailyStats.objects.filter(
+        target_type=target_type, target_id=target.pk, day__gte=since
+    ).order_by("day")
+    data = PromotionDailyStatsSerializer(rows, many=True).data
+    impressions = sum(row["impressions"] for row in data)
+    clicks = sum(row["clicks"] for row in data)
+    return Response({
+        "target_type": target_type,
+        "target_id": str(target.pk),
+        "promotion": None if promotion is None else {
+            "plan": promotion.plan,
+            "started_at": promotion.started_at,
+            "expires_at": promotion.expires_at,
+            "is_active": promotion.is_active,
+        },
+        "since": since,
+        "totals": {
+            "impressions": impressions,
+            "clicks": clicks,
+            "ctr": round(clicks / impressions, 4) if impressions else None,
+        },
+        "days": data,
+    })
+
+
+def _rates(row):
+    views = row["views"]
+    return {
+        **row,
+        "conversion": round(row["conversations"] / views, 4) if views else None,
+        "save_rate": round(row["saves"] / views, 4) if views else None,
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def seller_dashboard(request):
+    """
+    GET — views, saves and conversations started across the caller's listings
+    (a store's listings are its owner's), per day and per listing, over the
+    last ``?days=`` days (default 30). ``?listing=`` narrows it to one listing.
+    Reads only the daily rollups, which trail live activity by a few minutes;
+    ``updated_at`` says how far they have got.
+    """
+    try:
+        days = min(max(int(request.query_params.get("days", 30)), 1), MAX_DAYS)
+    except ValueError:
+        return Response({"error": "days must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+    since = timezone.now().date() - timedelta(days=days - 1)
+
+    rows = ListingDailyStats.objects.filter(seller=request.user, day__gte=since)
+    if request.query_params.get("listing"):
+        try:
+            listing = Listing.objects.get(pk=request.query_params["listing"], seller=request.user)
+        except (Listing.DoesNotExist, ValueError, ValidationError):
+            return Response({"error": "Listing not found."}, status=status.HTTP_404_NOT_FOUND)
+        rows = rows.filter(listing=listing)
+
+    sums = {counter: Sum(counter) for counter in COUNTERS}
+    totals = rows.aggregate(**sums)
+    daily = rows.values("day").annotate(**sums).order_by("day")
+    top = list(
+        rows.values("listing_id").annotate(**sums).order_by("-views", "-conversations")[:DASHBOARD_TOP_LISTINGS]
+    )
+    titles = dict(Listing.objects.filter(pk__in=[row["listing_id"] for row in top]).values_list("pk", "title"))
+
+    return Response({
+        "since": since,
+        "updated_at": RollupWatermark.objects.aggregate(at=Max("updated_at"))["at"],
+        "totals": _rates({counter: totals[counter] or 0 for counter in COUNTERS}),
+        "days": [_rates(row) for row in daily],
+        "listings": [
+            _rates({**row, "listing_id": str(row["listing_id"]), "title": titles.get(row["listing_id"], "")})
+            for row in top
+        ],
+    })
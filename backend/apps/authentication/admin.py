@@ -1,3 +1,16 @@
 from django.contrib import admin
+from .models import AuthenticationRequest, AuthenticationImage
 
-# Register your models here.
+
+class AuthenticationImageInline(admin.TabularInline):
+    model = AuthenticationImage
+    extra = 0
+
+
+@admin.register(AuthenticationRequest)
+class AuthenticationRequestAdmin(admin.ModelAdmin):
+    list_display = ("requester", "listing", "status", "ai_score", "ai_model", "created_at", "completed_at")
+    list_filter = ("status", "ai_model")
+    search_fields = ("requester__email", "listing__title")
+    raw_id_fields = ("requester", "listing", "reviewed_by")
+    inlines = [AuthenticationImageInline]
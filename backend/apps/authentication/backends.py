@@ -0,0 +1,73 @@
+"""
+Model backends for watch authentication.
+
+AUTHENTICATION_BACKEND names the class jobs.py uses. A backend has a ``name``
+identifying the model (results are cached per name, so switching models
+starts fresh) and a ``check(images, context)`` method taking
+[(angle, JPEG bytes)] plus what is known about the watch and returning
+{"score": 0..1, "report": {...}}. It raises BackendError when the call fails;
+the job retries those.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BackendError(Exception):
+    """The model could not produce a result."""
+
+
+PROMPT = """You are an expert watch authenticator. Examine the photos of a watch
+({watch}) and judge whether it is genuine. Photos are labelled by angle.
+Reply with JSON only:
+{{"score": <probability 0..1 that the watch is genuine>,
+  "report": {{"dial_analysis": "...", "font_check": "Pass|Fail|Unclear",
+              "serial_check": "Pass|Fail|Unclear", "overall": "..."}}}}"""
+
+
+class GeminiBackend:
+    def __init__(self):
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel(
+            settings.GEMINI_MODEL, generation_config={"response_mime_type": "application/json"}
+        )
+        self.name = f"gemini:{settings.GEMINI_MODEL}"
+
+    def check(self, images, context):
+        watch = " ".join(filter(None, [context.get("brand"), context.get("model"), context.get("reference")])) or "unknown model"
+        parts = [PROMPT.format(watch=watch)]
+        for angle, data in images:
+            parts += [f"Angle: {angle}", {"mime_type": "image/jpeg", "data": data}]
+        try:
+            response = self.model.generate_content(parts, request_options={"timeout": 60})
+            result = json.loads(response.text)
+            return {"score": min(max(float(result["score"]), 0.0), 1.0), "report": dict(result.get("report") or {})}
+        except (KeyError, TypeError, ValueError) as exc:
+            raise BackendError(f"Unreadable model reply: {exc}")
+        except Exception as exc:
+            raise BackendError(f"{type(exc).__name__}: {exc}")
+
+
+class StubBackend:
+    """Deterministic local stand-in: the score is derived from the photo bytes. For development and tests."""
+
+    name = "stub"
+
+    def check(self, images, context):
+        digest = hashlib.sha256(b"".join(data for _, data in images)).digest()
+        score = round(digest[0] / 255, 2)
+        return {"score": score, "report": {"overall": f"Stub result over {len(images)} photos", "photos": len(images)}}
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.AUTHENTICATION_BACKEND)()
+    return _backend
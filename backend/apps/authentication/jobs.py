@@ -0,0 +1,168 @@
+"""
+Watch authentication jobs.
+
+A job fingerprints its photos by content (their content-addressed names
+already carry the SHA-256) and the backend's name. A fingerprint seen before
+is answered from the cache, so re-checking the same photos costs neither
+image work nor a model call. Otherwise one of AUTHENTICATION_MODEL_CONCURRENCY
+slots shared by all workers is taken, the photos are downscaled to
+AUTHENTICATION_IMAGE_MAX_SIDE in a process pool, and the backend is called.
+When every slot is busy the task retries later instead of blocking a worker;
+the slot comes first so those retries do no image work.
+
+Celery's prefork children are daemonic and may not start processes, so there
+the photos are downscaled inline; run the "authentication" queue with
+``-P threads`` to use the pool.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.notifications.dispatch import notify
+from apps.notifications.models import Notification
+from .backends import get_backend
+from .models import AuthenticationRequest
+
+logger = logging.getLogger(__name__)
+
+SLOT_LEASE = 120  # seconds; longer than any downscale plus model call, so a dead worker's slot frees itself
+
+_pool = None
+
+
+def downscale(data, max_side):
+    """JPEG of ``data`` no larger than ``max_side`` on either side. Runs in the pool, so module-level."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=85, optimize=True)
+    return out.getvalue()
+
+
+def _downscale_all(blobs):
+    max_side = settings.AUTHENTICATION_IMAGE_MAX_SIDE
+    global _pool
+    if multiprocessing.current_process().daemon or len(blobs) < 2:
+        return [downscale(data, max_side) for data in blobs]
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.AUTHENTICATION_RESIZE_WORKERS)
+    return list(_pool.map(downscale, blobs, [max_side] * len(blobs)))
+
+
+class ModelSlots:
+    """At most ``size`` concurrent model calls across all workers, as leased cache keys."""
+
+    def __init__(self, size):
+        self.keys = [f"authentication:model_slot:{i}" for i in range(size)]
+
+    def acquire(self):
+        token = uuid.uuid4().hex
+        for key in self.keys:
+            if cache.add(key, token, timeout=SLOT_LEASE):
+                return key, token
+        return None
+
+    def release(self, slot):
+        key, token = slot
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+class SlotsBusy(Exception):
+    """Every model slot is taken; try again shortly."""
+
+
+def fingerprint(backend_name, photos):
+    """Cache key for a set of (angle, content-addressed name) photos checked by ``backend_name``."""
+    parts = sorted(f"{angle}:{os.path.splitext(os.path.basename(name))[0]}" for angle, name in photos)
+    return "authentication:result:" + hashlib.sha256("|".join([backend_name, *parts]).encode()).hexdigest()
+
+
+def _context(request):
+    listing = request.listing
+    if listing is None:
+        return {}
+    return {"brand": listing.brand, "model": listing.model, "reference": listing.reference_number}
+
+
+def run(request_id):
+    """Check one request's photos and store the verdict. Raises SlotsBusy or BackendError to be retried."""
+    request = AuthenticationRequest.objects.select_related("listing").filter(pk=request_id).first()
+    if request is None or request.status != AuthenticationRequest.Status.PROCESSING:
+        return None
+    images = list(request.images.all())
+    backend = get_backend()
+    key = fingerprint(backend.name, [(img.angle, img.image.name) for img in images])
+
+    result = cache.get(key)
+    if result is None:
+        slots = ModelSlots(settings.AUTHENTICATION_MODEL_CONCURRENCY)
+        slot = slots.acquire()
+        if slot is None:
+            raise SlotsBusy()
+        try:
+            blobs = []
+            for img in images:
+                with img.image.open("rb") as f:
+                    blobs.append(f.read())
+            scaled = _downscale_all(blobs)
+            result = backend.check([(img.angle, data) for img, data in zip(images, scaled)], _context(request))
+        finally:
+            slots.release(slot)
+        cache.set(key, result, timeout=settings.AUTHENTICATION_RESULT_TTL)
+    else:
+        logger.info("Authentication %s answered from cache", request_id)
+
+    _complete(request, result, backend.name)
+    return request.status
+
+
+def verdict(score):
+    if score >= settings.AUTHENTICATION_PASS_SCORE:
+        return AuthenticationRequest.Status.AUTHENTICATED
+    if score < settings.AUTHENTICATION_SUSPICIOUS_SCORE:
+        return AuthenticationRequest.Status.SUSPICIOUS
+    return AuthenticationRequest.Status.NEEDS_REVIEW
+
+
+def _complete(request, result, model_name):
+    request.status = verdict(result["score"])
+    request.ai_score = result["score"]
+    request.ai_report = result["report"]
+    request.ai_model = model_name
+    request.error = ""
+    request.completed_at = timezone.now()
+    request.save(update_fields=["status", "ai_score", "ai_report", "ai_model", "error", "completed_at", "updated_at"])
+    _notify(request)
+
+
+def fail(request_id, error):
+    request = AuthenticationRequest.objects.filter(pk=request_id, status=AuthenticationRequest.Status.PROCESSING).first()
+    if request is None:
+        return
+    request.status = AuthenticationRequest.Status.FAILED
+    request.error = error[:1000]
+    request.completed_at = timezone.now()
+    request.save(update_fields=["status", "error", "completed_at", "updated_at"])
+    _notify(request)
+
+
+def _notify(request):
+    notify(
+        [request.requester_id],
+        Notification.Kind.AUTHENTICATION,
+        f"Authentication result: {request.get_status_display().lower()}",
+        link=f"/authentication/{request.id}",
+        data={"authentication_id": str(request.id), "status": request.status},
+    )
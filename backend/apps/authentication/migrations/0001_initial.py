@@ -0,0 +1,60 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:30
+
+import apps.images.storage
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('listings', '0006_content_addressed_images'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthenticationRequest',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('processing', 'Processing'), ('authenticated', 'Authenticated'), ('needs_review', 'Needs review'), ('suspicious', 'Suspicious'), ('failed', 'Failed')], default='processing', max_length=20)),
+                ('ai_score', models.FloatField(blank=True, null=True)),
+                ('ai_report', models.JSONField(blank=True, default=dict)),
+                ('ai_model', models.CharField(blank=True, max_length=100)),
+                ('error', models.TextField(blank=True)),
+                ('review_note', models.TextField(blank=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('listing', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='authentication_requests', to='listings.listing')),
+                ('requester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='authentication_requests', to=settings.AUTH_USER_MODEL)),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'authentication_requests',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthenticationImage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('angle', models.CharField(choices=[('dial', 'Dial'), ('caseback', 'Caseback'), ('crown', 'Crown'), ('serial_number', 'Serial number'), ('clasp', 'Clasp'), ('other', 'Other')], default='other', max_length=20)),
+                ('image', models.ImageField(storage=apps.images.storage.content_storage, upload_to='authentication/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='authentication.authenticationrequest')),
+            ],
+            options={
+                'db_table': 'authentication_images',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='authenticationrequest',
+            index=models.Index(fields=['requester', 'created_at'], name='auth_requests_requester_idx'),
+        ),
+    ]
@@ -1,3 +1,70 @@
+import uuid
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from apps.images.storage import content_storage
+
+
+class AuthenticationRequest(models.Model):
+    """A request to check a watch's photos for authenticity; processed by a Celery job (see jobs.py)."""
+
+    class Status(models.TextChoices):
+        PROCESSING = "processing", "Processing"
+        AUTHENTICATED = "authenticated", "Authenticated"
+        NEEDS_REVIEW = "needs_review", "Needs review"
+        SUSPICIOUS = "suspicious", "Suspicious"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requester = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="authentication_requests"
+    )
+    listing = models.ForeignKey(
+        "listings.Listing", on_delete=models.SET_NULL, null=True, blank=True, related_name="authentication_requests"
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PROCESSING)
+    ai_score = models.FloatField(null=True, blank=True)
+    ai_report = models.JSONField(default=dict, blank=True)
+    # Backend that produced the result, e.g. "gemini:gemini-1.5-flash".
+    ai_model = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    review_note = models.TextField(blank=True)
+    reviewed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "authentication_requests"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["requester", "created_at"], name="auth_requests_requester_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.requester} — {self.get_status_display()}"
+
+
+class AuthenticationImage(models.Model):
+    class Angle(models.TextChoices):
+        DIAL = "dial", "Dial"
+        CASEBACK = "caseback", "Caseback"
+        CROWN = "crown", "Crown"
+        SERIAL_NUMBER = "serial_number", "Serial number"
+        CLASP = "clasp", "Clasp"
+        OTHER = "other", "Other"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    request = models.ForeignKey(AuthenticationRequest, on_delete=models.CASCADE, related_name="images")
+    angle = models.CharField(max_length=20, choices=Angle.choices, default=Angle.OTHER)
+    image = models.ImageField(upload_to="authentication/", storage=content_storage)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "authentication_images"
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"{self.request_id} — {self.angle}"
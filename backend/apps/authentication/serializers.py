@@ -0,0 +1,53 @@
+from rest_framework import serializers
+from .models import AuthenticationRequest, AuthenticationImage
+
+MAX_IMAGES = 8
+
+
+class AuthenticationImageSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AuthenticationImage
+        fields = ("id", "angle", "url")
+
+    def get_url(self, obj):
+        request = self.context.get("request")
+        return request.build_absolute_uri(obj.image.url) if request else obj.image.url
+
+
+class AuthenticationRequestSerializer(serializers.ModelSerializer):
+    images = AuthenticationImageSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = AuthenticationRequest
+        fields = (
+            "id", "listing", "status", "ai_score", "ai_report", "ai_model", "error",
+            "review_note", "images", "completed_at", "created_at", "updated_at",
+        )
+
+
+class AuthenticationImagesSerializer(serializers.Serializer):
+    """Multipart photos, optionally labelled: images=<file>&angles=dial&images=<file>&angles=caseback."""
+    images = serializers.ListField(child=serializers.ImageField(), min_length=1, max_length=MAX_IMAGES)
+    angles = serializers.ListField(child=serializers.ChoiceField(choices=AuthenticationImage.Angle.choices), required=False)
+
+    def validate(self, data):
+        angles = data.get("angles") or []
+        if len(angles) > len(data["images"]):
+            raise serializers.ValidationError({"angles": "More angles than images."})
+        data["angles"] = angles + [AuthenticationImage.Angle.OTHER] * (len(data["images"]) - len(angles))
+        return data
+
+
+class CreateAuthenticationSerializer(AuthenticationImagesSerializer):
+    listing_id = serializers.UUIDField(required=False)
+
+
+class ReviewAuthenticationSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=[
+        AuthenticationRequest.Status.AUTHENTICATED,
+        AuthenticationRequest.Status.SUSPICIOUS,
+        AuthenticationRequest.Status.NEEDS_REVIEW,
+    ])
+    note = serializers.CharField(required=False, allow_blank=True)
@@ -0,0 +1,32 @@
+import logging
+import random
+
+from celery import shared_task
+
+from . import jobs
+from .backends import BackendError
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKEND_FAILURES = 5
+
+
+@shared_task(bind=True)
+def run_authentication(self, request_id, failures=0):
+    """Run one authentication job; waits for a free model slot and retries model errors with backoff."""
+    try:
+        return jobs.run(request_id)
+    except jobs.SlotsBusy as exc:
+        raise self.retry(exc=exc, countdown=random.uniform(5, 15), max_retries=None)
+    except BackendError as exc:
+        logger.warning("Authentication %s failed: %s", request_id, exc)
+        if failures + 1 >= MAX_BACKEND_FAILURES:
+            jobs.fail(request_id, str(exc))
+            return None
+        raise self.retry(
+            exc=exc, countdown=30 * 2 ** failures, max_retries=None,
+            kwargs={"request_id": request_id, "failures": failures + 1},
+        )
+    except Exception as exc:
+        jobs.fail(request_id, f"{type(exc).__name__}: {exc}")
+        raise
@@ -1,3 +1,11 @@
 from django.urls import path
-urlpatterns = []
+from . import views
 
+urlpatterns = [
+    path("", views.authentication_requests, name="authentication-requests"),
+    path("<uuid:pk>/", views.authentication_detail, name="authentication-detail"),
+    path("<uuid:pk>/images/", views.authentication_images, name="authentication-images"),
+    path("<uuid:pk>/review/", views.authentication_review, name="authentication-review"),
+    path("<uuid:pk>/certificate/", views.authentication_certificate, name="authentication-certificate"),
+    path("<uuid:pk>/verify/", views.verify_certificate, name="authentication-verify"),
+]
@@ -1,3 +1,150 @@
-from django.shortcuts import render
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
 
-# Create your views here.
+from apps.documents import service as documents
+from apps.listings.models import Listing
+from .models import AuthenticationRequest, AuthenticationImage
+from .serializers import (
+    AuthenticationRequestSerializer, AuthenticationImagesSerializer,
+    CreateAuthenticationSerializer, ReviewAuthenticationSerializer, MAX_IMAGES,
+)
+from .tasks import run_authentication
+
+
+class AuthenticationPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+
+
+def _queue(auth_request, images, angles):
+    # One create() per photo: the save signals keep the stored-image reference counts.
+    for image, angle in zip(images, angles):
+        AuthenticationImage.objects.create(request=auth_request, image=image, angle=angle)
+    transaction.on_commit(lambda: run_authentication.delay(str(auth_request.id)))
+
+
+def _get_request(request, pk):
+    qs = AuthenticationRequest.objects.prefetch_related("images")
+    if not request.user.is_staff:
+        qs = qs.filter(requester=request.user)
+    return qs.filter(pk=pk).first()
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def authentication_requests(request):
+    """
+    GET  — your authentication requests (staff: everyone's), ``?status=`` to filter.
+    POST — photos of a watch (optionally ``listing_id`` of one of your listings);
+           the check runs in the background.
+    """
+    if request.method == "GET":
+        qs = AuthenticationRequest.objects.prefetch_related("images")
+        if not request.user.is_staff:
+            qs = qs.filter(requester=request.user)
+        if request.GET.get("status"):
+            qs = qs.filter(status=request.GET["status"])
+        paginator = AuthenticationPagination()
+        page = paginator.paginate_queryset(qs, request)
+        return paginator.get_paginated_response(
+            AuthenticationRequestSerializer(page, many=True, context={"request": request}).data
+        )
+
+    serializer = CreateAuthenticationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    listing = None
+    if serializer.validated_data.get("listing_id"):
+        listings = Listing.objects.all() if request.user.is_staff else Listing.objects.filter(seller=request.user)
+        listing = listings.filter(id=serializer.validated_data["listing_id"]).first()
+        if listing is None:
+            return Response({"error": "Listing not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    with transaction.atomic():
+        auth_request = AuthenticationRequest.objects.create(requester=request.user, listing=listing)
+        _queue(auth_request, serializer.validated_data["images"], serializer.validated_data["angles"])
+    auth_request = _get_request(request, auth_request.pk)
+    return Response(
+        AuthenticationRequestSerializer(auth_request, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def authentication_detail(request, pk):
+    auth_request = _get_request(request, pk)
+    if auth_request is None:
+        return Response({"error": "Authentication request not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(AuthenticationRequestSerializer(auth_request, context={"request": request}).data)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def authentication_images(request, pk):
+    """Add photos to a finished request and check it again."""
+    auth_request = _get_request(request, pk)
+    if auth_request is None or auth_request.requester != request.user:
+        return Response({"error": "Authentication request not found."}, status=status.HTTP_404_NOT_FOUND)
+    if auth_request.status == AuthenticationRequest.Status.PROCESSING:
+        return Response({"error": "This request is still being checked."}, status=status.HTTP_409_CONFLICT)
+
+    serializer = AuthenticationImagesSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    if auth_request.images.count() + len(serializer.validated_data["images"]) > MAX_IMAGES:
+        return Response({"error": f"At most {MAX_IMAGES} photos per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        auth_request.status = AuthenticationRequest.Status.PROCESSING
+        auth_request.completed_at = None
+        auth_request.save(update_fields=["status", "completed_at", "updated_at"])
+        _queue(auth_request, serializer.validated_data["images"], serializer.validated_data["angles"])
+    auth_request = _get_request(request, pk)
+    return Response(
+        AuthenticationRequestSerializer(auth_request, context={"request": request}).data,
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+@api_view(["PATCH"])
+@permission_classes([IsAdminUser])
+@parser_classes([JSONParser])
+def authentication_review(request, pk):
+    """Staff override of the AI verdict."""
+    auth_request = _get_request(request, pk)
+    if auth_request is None:
+        return Response({"error": "Authentication request not found."}, status=status.HTTP_404_NOT_FOUND)
+    serializer = ReviewAuthenticationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    auth_request.status = serializer.validated_data["status"]
+    auth_request.review_note = serializer.validated_data.get("note", "")
+    auth_request.reviewed_by = request.user
+    auth_request.save(update_fields=["status", "review_note", "reviewed_by", "updated_at"])
+    return Response(AuthenticationRequestSerializer(auth_request, context={"request": request}).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def authentication_certificate(request, pk):
+    """Certificate PDF for an authenticated watch: ``{"url"}``, or 202 while it is drawn — poll again."""
+    auth_request = _get_request(request, pk)
+    if auth_request is None:
+        return Response({"error": "Authentication request not found."}, status=status.HTTP_404_NOT_FOUND)
+    return documents.respond(request, documents.CERTIFICATE, auth_request)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def verify_certificate(request, pk):
+    """Public check behind a certificate's verify URL: the certificate number, watch and verdict, or 404."""
+    auth_request = AuthenticationRequest.objects.select_related("listing").filter(pk=pk).first()
+    data = documents.verification(auth_request) if auth_request is not None else None
+    if data is None:
+        return Response({"error": "No valid certificate matches this link."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(data)
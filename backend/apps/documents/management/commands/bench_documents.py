@@ -0,0 +1,89 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from apps.authentication.jobs import downscale
+from apps.documents import pdf
+from apps.documents.service import CERTIFICATE_PHOTO_SIDE
+
+
+def _invoice(n):
+    return {
+        "number": f"TT-{n:010d}",
+        "issued": "2026-10-19",
+        "seller": {"name": "Bench Seller", "email": "seller@documents-bench.invalid"},
+        "buyer": {"name": f"Bench Buyer {n}", "email": f"buyer{n}@documents-bench.invalid"},
+        "address": ["Rruga e Kavajës 10", "1001 Tirana", "Albania"],
+        "lines": [{"description": "Rolex Submariner 126610LN", "detail": "Submariner Date, 2023, full set", "amount": f"{9000 + n}.00"}],
+        "currency": "EUR",
+        "total": f"{9000 + n}.00",
+        "reference": f"CAPTURE{n:010d}",
+        "refunded": False,
+    }
+
+
+def _certificate(n):
+    return {
+        "number": f"TT-A-{n:010d}",
+        "issued": "2026-10-19",
+        "watch": "Omega Speedmaster 310.30.42.50.01.001",
+        "verdict": "Authenticated",
+        "score": 93,
+        "checks": [
+            ["Dial", "Applied indices and printing are consistent with the reference; lume ages evenly."],
+            ["Typography", "Pass"],
+            ["Serial number", "Pass"],
+            ["Overall", f"Genuine with high confidence (bench document {n})."],
+        ],
+        "review_note": "",
+        "assessor": "automated review (stub)",
+        "verify_url": f"https://timetrader.invalid/authentication/{n}",
+        "photo": "",
+    }
+
+
+def _photo():
+    """A 3000 px JPEG, roughly what a phone uploads."""
+    image = Image.radial_gradient("L").resize((3000, 3000)).convert("RGB")
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many invoices and certificates one worker process renders per "
+        "second (layout and PDF encoding only; no database or storage)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500, help="Documents rendered per kind.")
+
+    def handle(self, *args, **opts):
+        photo = _photo()
+        kinds = [
+            ("invoice", lambda n: pdf.invoice(_invoice(n))),
+            ("certificate", lambda n: pdf.certificate(_certificate(n))),
+            # What a certificate job does with a photo: downscale it, then embed it.
+            ("certificate+photo", lambda n: pdf.certificate(
+                _certificate(n), photo=io.BytesIO(downscale(photo, CERTIFICATE_PHOTO_SIDE))
+            )),
+        ]
+        for label, render in kinds:
+            render(0)  # warm up fonts and imports
+            timings, size = [], 0
+            started = time.perf_counter()
+            for n in range(opts["count"]):
+                t = time.perf_counter()
+                size = len(render(n))
+                timings.append((time.perf_counter() - t) * 1000)
+            elapsed = time.perf_counter() - started
+            timings.sort()
+            self.stdout.write(
+                f"{label}: {opts['count'] / elapsed:,.0f} docs/s per worker, "
+                f"p50 {statistics.median(timings):.1f} ms, p95 {timings[int(len(timings) * 0.95)]:.1f} ms, "
+                f"{size / 1024:.1f} KiB each"
+            )
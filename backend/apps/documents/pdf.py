@@ -0,0 +1,175 @@
+"""
+PDF layouts for invoices and authentication certificates (reportlab).
+
+Pages are drawn straight onto a canvas rather than through platypus flowables:
+both layouts are fixed single pages, and drawing directly keeps a render in
+the low milliseconds. Canvases are created with ``invariant=1`` so the same
+data always yields byte-identical files, which is what lets service.py cache
+documents by content.
+
+Renderers take the plain dicts built in service.py and return PDF bytes.
+Bump TEMPLATE_VERSION whenever a layout changes, so cached files are redrawn.
+"""
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfgen import canvas
+
+TEMPLATE_VERSION = 1
+
+WIDTH, HEIGHT = A4
+MARGIN = 20 * mm
+INK = colors.HexColor("#1A1A1A")
+MUTED = colors.HexColor("#9E9585")
+ACCENT = colors.HexColor("#B8965A")
+RULE = colors.HexColor("#EDE9E3")
+
+
+def _canvas(out, title):
+    c = canvas.Canvas(out, pagesize=A4, invariant=1, pageCompression=1)
+    c.setTitle(title)
+    c.setAuthor("TimeTrader")
+    return c
+
+
+def _header(c, heading, number, issued):
+    c.setFillColor(INK)
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(MARGIN, HEIGHT - MARGIN - 6 * mm, "TimeTrader")
+    c.setFillColor(ACCENT)
+    c.setFont("Helvetica-Bold", 13)
+    c.drawRightString(WIDTH - MARGIN, HEIGHT - MARGIN - 6 * mm, heading.upper())
+    c.setFillColor(MUTED)
+    c.setFont("Helvetica", 9)
+    c.drawRightString(WIDTH - MARGIN, HEIGHT - MARGIN - 12 * mm, f"No. {number}")
+    c.drawRightString(WIDTH - MARGIN, HEIGHT - MARGIN - 16.5 * mm, f"Issued {issued}")
+    _rule(c, HEIGHT - MARGIN - 21 * mm)
+
+
+def _rule(c, y):
+    c.setStrokeColor(RULE)
+    c.setLineWidth(0.8)
+    c.line(MARGIN, y, WIDTH - MARGIN, y)
+
+
+def _block(c, x, y, label, lines, width=80 * mm):
+    """A small caps label over wrapped lines; returns the y below the block."""
+    c.setFillColor(MUTED)
+    c.setFont("Helvetica-Bold", 8)
+    c.drawString(x, y, label.upper())
+    y -= 5 * mm
+    c.setFillColor(INK)
+    c.setFont("Helvetica", 10)
+    for line in lines:
+        for part in simpleSplit(str(line), "Helvetica", 10, width):
+            c.drawString(x, y, part)
+            y -= 4.6 * mm
+    return y
+
+
+def _footer(c, text):
+    c.setFillColor(MUTED)
+    c.setFont("Helvetica", 8)
+    c.drawCentredString(WIDTH / 2, MARGIN - 6 * mm, text)
+
+
+def invoice(data):
+    """One-page invoice: seller and buyer, line items, total."""
+    out = io.BytesIO()
+    c = _canvas(out, f"Invoice {data['number']}")
+    _header(c, "Invoice", data["number"], data["issued"])
+
+    top = HEIGHT - MARGIN - 31 * mm
+    left = _block(c, MARGIN, top, "From", [data["seller"]["name"], data["seller"]["email"]])
+    right = _block(
+        c, WIDTH / 2, top, "Billed to",
+        [data["buyer"]["name"], data["buyer"]["email"], *data.get("address", [])],
+    )
+    y = min(left, right) - 8 * mm
+
+    c.setFillColor(MUTED)
+    c.setFont("Helvetica-Bold", 8)
+    c.drawString(MARGIN, y, "DESCRIPTION")
+    c.drawRightString(WIDTH - MARGIN, y, f"AMOUNT ({data['currency']})")
+    y -= 3 * mm
+    _rule(c, y)
+    y -= 6 * mm
+    for line in data["lines"]:
+        c.setFillColor(INK)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(MARGIN, y, line["description"])
+        c.drawRightString(WIDTH - MARGIN, y, line["amount"])
+        if line.get("detail"):
+            y -= 4.6 * mm
+            c.setFillColor(MUTED)
+            c.setFont("Helvetica", 9)
+            c.drawString(MARGIN, y, line["detail"])
+        y -= 8 * mm
+    _rule(c, y + 3 * mm)
+
+    c.setFillColor(INK)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(WIDTH / 2, y - 4 * mm, "Total")
+    c.drawRightString(WIDTH - MARGIN, y - 4 * mm, f"{data['total']} {data['currency']}")
+    if data.get("reference"):
+        c.setFillColor(MUTED)
+        c.setFont("Helvetica", 9)
+        c.drawString(MARGIN, y - 4 * mm, f"PayPal reference {data['reference']}")
+
+    if data.get("refunded"):
+        c.saveState()
+        c.setFillColor(colors.Color(0.8, 0.1, 0.1, alpha=0.25))
+        c.setFont("Helvetica-Bold", 72)
+        c.translate(WIDTH / 2, HEIGHT / 2)
+        c.rotate(30)
+        c.drawCentredString(0, 0, "REFUNDED")
+        c.restoreState()
+
+    _footer(c, "Thank you for trading on TimeTrader.")
+    c.showPage()
+    c.save()
+    return out.getvalue()
+
+
+def certificate(data, photo=None):
+    """One-page authentication certificate; ``photo`` is an optional image file object shown beside the verdict."""
+    out = io.BytesIO()
+    c = _canvas(out, f"Certificate {data['number']}")
+    _header(c, "Certificate of Authentication", data["number"], data["issued"])
+
+    top = HEIGHT - MARGIN - 33 * mm
+    text_width = WIDTH - 2 * MARGIN
+    if photo is not None:
+        side = 60 * mm
+        image = ImageReader(photo)
+        c.drawImage(image, WIDTH - MARGIN - side, top - side, side, side, preserveAspectRatio=True, anchor="ne")
+        text_width -= side + 8 * mm
+
+    y = top - 4 * mm
+    c.setFillColor(INK)
+    c.setFont("Helvetica-Bold", 16)
+    for part in simpleSplit(data["watch"] or "Watch", "Helvetica-Bold", 16, text_width):
+        c.drawString(MARGIN, y, part)
+        y -= 7 * mm
+    c.setFillColor(ACCENT)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(MARGIN, y - 1 * mm, f"{data['verdict']} — confidence {data['score']}%")
+
+    y -= 13 * mm
+    for label, value in data["checks"]:
+        y = _block(c, MARGIN, y, label, [value], width=text_width) - 3 * mm
+    if data.get("review_note"):
+        y = _block(c, MARGIN, y, "Reviewer's note", [data["review_note"]], width=text_width) - 3 * mm
+
+    _rule(c, MARGIN + 18 * mm)
+    c.setFillColor(MUTED)
+    c.setFont("Helvetica", 8)
+    c.drawString(MARGIN, MARGIN + 12 * mm, f"Assessed by {data['assessor']}.")
+    c.drawString(MARGIN, MARGIN + 7.5 * mm, f"Verify this certificate at {data['verify_url']}")
+    _footer(c, "This certificate reflects the photos submitted; it is not a guarantee of provenance.")
+    c.showPage()
+    c.save()
+    return out.getvalue()
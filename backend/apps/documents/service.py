@@ -0,0 +1,235 @@
+"""
+Invoices and certificates, rendered in the background and kept by content.
+
+Each document kind turns its object into a plain dict of exactly what gets
+printed. The SHA-256 of that dict and pdf.TEMPLATE_VERSION names the file in
+storage, so a document is drawn once per distinct content: asking again
+returns the stored file, and anything that changes the printout (a refund,
+a staff review, a new layout) yields a new name and a fresh render.
+
+respond() answers document endpoints: the file's URL when it exists,
+otherwise 202 while a Celery worker draws it (one queued render per name).
+Names carry the digest, so URLs cannot be guessed from an object's id.
+"""
+import hashlib
+import io
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.authentication.jobs import downscale
+from apps.authentication.models import AuthenticationImage, AuthenticationRequest
+from apps.transactions.models import Order, PromotionPayment
+from apps.transactions.payments import TARGETS
+from . import pdf
+
+logger = logging.getLogger(__name__)
+
+ORDER_INVOICE, PROMOTION_INVOICE, CERTIFICATE = "order_invoice", "promotion_invoice", "certificate"
+
+PREFIX = "documents"
+RENDER_LOCK = 300  # seconds; a render that has not finished by then may be queued again
+READY_TTL = 60 * 60 * 24
+CERTIFICATE_PHOTO_SIDE = 600
+
+INVOICED = (
+    Order.Status.PAID, Order.Status.SHIPPED, Order.Status.DELIVERED,
+    Order.Status.DISPUTED, Order.Status.REFUNDED,
+)
+
+
+def _party(user):
+    return {"name": f"{user.first_name} {user.last_name}".strip() or user.username, "email": user.email}
+
+
+def _watch(listing):
+    if listing is None:
+        return ""
+    return " ".join(filter(None, [listing.brand, listing.model, listing.reference_number]))
+
+
+def _order_invoice(order):
+    listing = order.listing
+    return {
+        "number": f"TT-{order.id.hex[:10].upper()}",
+        "issued": order.paid_at.date().isoformat(),
+        "seller": _party(order.seller),
+        "buyer": _party(order.buyer),
+        "address": [value for value in order.shipping_address.values() if value],
+        "lines": [{"description": _watch(listing), "detail": listing.title, "amount": str(order.amount)}],
+        "currency": order.currency,
+        "total": str(order.amount),
+        "reference": order.capture_id or order.paypal_order_id,
+        "refunded": order.status == Order.Status.REFUNDED,
+    }
+
+
+def _promotion_invoice(payment):
+    target_model, _, plans = TARGETS[payment.target_type]
+    target = target_model.objects.filter(pk=payment.target_id).first()
+    target_name = (getattr(target, "title", None) or getattr(target, "name", "")) if target else "Removed item"
+    plan = plans.get(payment.plan, {}).get("label", payment.plan)
+    return {
+        "number": f"TT-P-{payment.id.hex[:10].upper()}",
+        "issued": payment.completed_at.date().isoformat(),
+        "seller": {"name": "TimeTrader", "email": settings.DEFAULT_FROM_EMAIL},
+        "buyer": _party(payment.user),
+        "lines": [{
+            "description": f"{plan} {payment.get_target_type_display().lower()} promotion",
+            "detail": target_name,
+            "amount": str(payment.amount),
+        }],
+        "currency": "EUR",
+        "total": str(payment.amount),
+        "reference": payment.capture_id or payment.order_id,
+    }
+
+
+def _certificate_photo(auth_request):
+    images = list(auth_request.images.all())
+    dial = [img for img in images if img.angle == AuthenticationImage.Angle.DIAL]
+    return (dial or images or [None])[0]
+
+
+def _certificate_number(auth_request):
+    return f"TT-A-{auth_request.id.hex[:10].upper()}"
+
+
+def _certificate(auth_request):
+    report = auth_request.ai_report or {}
+    photo = _certificate_photo(auth_request)
+    checks = [
+        ("Dial", report.get("dial_analysis")),
+        ("Typography", report.get("font_check")),
+        ("Serial number", report.get("serial_check")),
+        ("Overall", report.get("overall")),
+    ]
+    return {
+        "number": _certificate_number(auth_request),
+        "issued": auth_request.completed_at.date().isoformat(),
+        "watch": _watch(auth_request.listing),
+        "verdict": auth_request.get_status_display(),
+        "score": round((auth_request.ai_score or 0) * 100),
+        "checks": [[label, str(value)] for label, value in checks if value],
+        "review_note": auth_request.review_note,
+        "assessor": "TimeTrader staff review" if auth_request.reviewed_by_id else f"automated review ({auth_request.ai_model})",
+        "verify_url": f"{settings.FRONTEND_URL}/verify/{auth_request.id}",
+        "photo": photo.image.name if photo else "",
+    }
+
+
+def _render_certificate(data, auth_request):
+    photo = _certificate_photo(auth_request) if data["photo"] else None
+    if photo is None:
+        return pdf.certificate(data)
+    with photo.image.open("rb") as f:
+        scaled = downscale(f.read(), CERTIFICATE_PHOTO_SIDE)
+    return pdf.certificate(data, photo=io.BytesIO(scaled))
+
+
+def verification(auth_request):
+    """
+    What the public page behind a certificate's verify URL shows: enough to
+    match the printout, nothing about the requester or the report. None once
+    the watch is no longer authenticated (e.g. after a staff re-review).
+    """
+    if auth_request.status != AuthenticationRequest.Status.AUTHENTICATED:
+        return None
+    return {
+        "number": _certificate_number(auth_request),
+        "watch": _watch(auth_request.listing),
+        "verdict": auth_request.get_status_display(),
+        "issued": auth_request.completed_at.date().isoformat(),
+    }
+
+
+# kind -> (queryset, whether an object has the document, error otherwise, data, renderer)
+KINDS = {
+    ORDER_INVOICE: (
+        lambda: Order.objects.select_related("listing", "buyer", "seller"),
+        lambda order: order.status in INVOICED,
+        "Invoices are available once the order is paid.",
+        _order_invoice,
+        lambda data, order: pdf.invoice(data),
+    ),
+    PROMOTION_INVOICE: (
+        lambda: PromotionPayment.objects.select_related("user"),
+        lambda payment: payment.status == PromotionPayment.Status.COMPLETED,
+        "Invoices are available once the payment has completed.",
+        _promotion_invoice,
+        lambda data, payment: pdf.invoice(data),
+    ),
+    CERTIFICATE: (
+        lambda: AuthenticationRequest.objects.select_related("listing").prefetch_related("images"),
+        lambda auth_request: auth_request.status == AuthenticationRequest.Status.AUTHENTICATED,
+        "Certificates are issued for authenticated watches only.",
+        _certificate,
+        _render_certificate,
+    ),
+}
+
+
+def name(kind, data):
+    """Storage name for ``kind`` with content ``data``."""
+    payload = json.dumps({"template": pdf.TEMPLATE_VERSION, "data": data}, sort_keys=True, separators=(",", ":"))
+    return f"{PREFIX}/{kind}/{hashlib.sha256(payload.encode()).hexdigest()}.pdf"
+
+
+def _ready_key(file_name):
+    return f"documents:ready:{file_name}"
+
+
+def _exists(file_name):
+    if cache.get(_ready_key(file_name)):
+        return True
+    if default_storage.exists(file_name):
+        cache.set(_ready_key(file_name), 1, timeout=READY_TTL)
+        return True
+    return False
+
+
+def render(kind, pk):
+    """Draw and store the current document of ``kind`` for ``pk``. Returns its name, or None if there is none."""
+    queryset, eligible, _, build, draw = KINDS[kind]
+    obj = queryset().filter(pk=pk).first()
+    if obj is None or not eligible(obj):
+        return None
+    data = build(obj)
+    file_name = name(kind, data)
+    try:
+        if not _exists(file_name):
+            saved = default_storage.save(file_name, ContentFile(draw(data, obj)))
+            if saved != file_name:
+                # Another worker stored the same document first; keep theirs.
+                default_storage.delete(saved)
+            cache.set(_ready_key(file_name), 1, timeout=READY_TTL)
+            logger.info("Rendered %s", file_name)
+    finally:
+        cache.delete(f"documents:rendering:{file_name}")
+    return file_name
+
+
+def _schedule(kind, pk, file_name):
+    from .tasks import render_document
+
+    if cache.add(f"documents:rendering:{file_name}", 1, timeout=RENDER_LOCK):
+        transaction.on_commit(lambda: render_document.delay(kind, str(pk)))
+
+
+def respond(request, kind, obj):
+    """Response for a document endpoint: ``{"url"}`` when stored, 202 while it renders, 409 if ``obj`` has none."""
+    _, eligible, error, build, _ = KINDS[kind]
+    if not eligible(obj):
+        return Response({"error": error}, status=status.HTTP_409_CONFLICT)
+    file_name = name(kind, build(obj))
+    if _exists(file_name):
+        return Response({"url": request.build_absolute_uri(default_storage.url(file_name))})
+    _schedule(kind, obj.pk, file_name)
+    return Response({"status": "rendering"}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from . import service
+
+
+@shared_task
+def render_document(kind, pk):
+    """Draw and store one invoice or certificate (see service.py)."""
+    return service.render(kind, pk)
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import DuplicateImageFlag, StoredImage
+
+
+@admin.register(StoredImage)
+class StoredImageAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "width", "height", "ref_count", "touched_at")
+    search_fields = ("digest", "name")
+    readonly_fields = ("digest", "name", "size", "width", "height", "phash", "phash_bands", "touched_at", "created_at")
+
+
+@admin.register(DuplicateImageFlag)
+class DuplicateImageFlagAdmin(admin.ModelAdmin):
+    list_display = ("image", "duplicate_of", "distance", "created_at")
+    list_filter = ("distance",)
+    raw_id_fields = ("image", "duplicate_of")
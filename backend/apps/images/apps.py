@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+class ImagesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.images'
+
+    def ready(self):
+        from . import refs
+
+        refs.connect_signals()
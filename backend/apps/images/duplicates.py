@@ -0,0 +1,37 @@
+"""
+Near-duplicate listing photos across sellers.
+
+A new listing photo's stored image is matched against every other stored
+image sharing a perceptual-hash band (GIN index on phash_bands); those within
+phash.MAX_DISTANCE bits are near-duplicates. Listing photos of other sellers
+that use them are recorded as DuplicateImageFlag rows for moderators.
+"""
+from apps.listings.models import ListingImage
+from . import phash
+from .models import DuplicateImageFlag, StoredImage
+
+MAX_CANDIDATES = 500
+
+
+def flag(listing_image_id):
+    """Flag other sellers' photos that look like ``listing_image_id``. Returns the number of flags written."""
+    image = ListingImage.objects.select_related("listing").filter(pk=listing_image_id).first()
+    if image is None:
+        return 0
+    stored = StoredImage.objects.filter(name=image.image.name).exclude(phash=None).first()
+    if stored is None:
+        return 0
+
+    close = {}
+    for name, value in StoredImage.objects.filter(phash_bands__overlap=stored.phash_bands).values_list("name", "phash")[:MAX_CANDIDATES]:
+        d = phash.distance(stored.phash, value)
+        if d <= phash.MAX_DISTANCE:
+            close[name] = d
+    others = (
+        ListingImage.objects.filter(image__in=list(close))
+        .exclude(listing__seller_id=image.listing.seller_id)
+        .values_list("pk", "image")
+    )
+    flags = [DuplicateImageFlag(image=image, duplicate_of_id=pk, distance=close[name]) for pk, name in others]
+    DuplicateImageFlag.objects.bulk_create(flags, ignore_conflicts=True)
+    return len(flags)
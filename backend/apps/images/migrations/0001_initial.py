@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:40
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('listings', '0006_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('phash', models.BigIntegerField(blank=True, null=True)),
+                ('phash_bands', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('touched_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'stored_images',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['phash_bands'], name='stored_images_phash_idx'), models.Index(condition=models.Q(('ref_count', 0)), fields=['touched_at'], name='stored_images_unused_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateImageFlag',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('distance', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('duplicate_of', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='listings.listingimage')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_flags', to='listings.listingimage')),
+            ],
+            options={
+                'db_table': 'duplicate_image_flags',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('image', 'duplicate_of'), name='duplicate_image_flags_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+import uuid
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+
+class StoredImage(models.Model):
+    """
+    One stored file per distinct image content (see storage.py). Rows that
+    upload the same bytes share the file; ref_count says how many model fields
+    point at it, and unreferenced files are collected after a grace period.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    digest = models.CharField(max_length=64, unique=True)  # SHA-256 of the bytes, hex
+    name = models.CharField(max_length=255, unique=True)  # storage key
+    size = models.PositiveBigIntegerField()
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # 64-bit difference hash (signed) and its four 16-bit bands tagged with
+    # their position; near-duplicates share at least one band (see phash.py).
+    phash = models.BigIntegerField(null=True, blank=True)
+    phash_bands = ArrayField(models.IntegerField(), default=list, blank=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    # Last upload or release; garbage collection waits IMAGE_GC_GRACE_HOURS after it.
+    touched_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "stored_images"
+        indexes = [
+            GinIndex(fields=["phash_bands"], name="stored_images_phash_idx"),
+            models.Index(fields=["touched_at"], condition=models.Q(ref_count=0), name="stored_images_unused_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class DuplicateImageFlag(models.Model):
+    """A listing photo that looks like another seller's, for moderators to review."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    image = models.ForeignKey("listings.ListingImage", on_delete=models.CASCADE, related_name="duplicate_flags")
+    duplicate_of = models.ForeignKey("listings.ListingImage", on_delete=models.CASCADE, related_name="+")
+    distance = models.PositiveSmallIntegerField()  # differing hash bits; 0 is visually identical
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "duplicate_image_flags"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["image", "duplicate_of"], name="duplicate_image_flags_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.image_id} ~ {self.duplicate_of_id} ({self.distance})"
@@ -0,0 +1,36 @@
+"""
+Perceptual hashing for near-duplicate detection.
+
+dhash() is a 64-bit difference hash: the image is shrunk to 9x8 grey pixels
+and each bit records whether a pixel is brighter than its right neighbour, so
+re-encoding, resizing and small edits flip only a few bits. Two hashes within
+MAX_DISTANCE bits of each other agree exactly on at least one of their four
+16-bit bands (pigeonhole), which is what the GIN index on
+StoredImage.phash_bands looks up.
+"""
+from PIL import Image
+
+BANDS = 4
+MAX_DISTANCE = BANDS - 1
+_MASK = (1 << 64) - 1
+
+
+def dhash(image):
+    """Signed 64-bit difference hash of a PIL image (fits a bigint column)."""
+    image.draft("L", (64, 64))  # JPEGs decode at a fraction of full size
+    pixels = list(image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = value << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def bands(value):
+    """The hash's 16-bit bands, each tagged with its position so equal bits in different places don't match."""
+    value &= _MASK
+    return [band << 16 | (value >> 16 * band) & 0xFFFF for band in range(BANDS)]
+
+
+def distance(a, b):
+    return ((a ^ b) & _MASK).bit_count()
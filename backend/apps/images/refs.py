@@ -0,0 +1,86 @@
+"""
+Reference counting for content-addressed images.
+
+Every tracked image field that points at a StoredImage holds one reference:
+saving a row with a new file takes one on the new file and drops the one on
+the file it replaced, deleting a row drops its references. Counts change with
+UPDATE ... SET ref_count = ref_count ± n in the saving transaction, so they
+roll back with it.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+from apps.authentication.models import AuthenticationImage
+from apps.listings.models import ListingImage
+from apps.repairs.models import RepairShowcase
+from apps.stores.models import StoreImage
+from .models import StoredImage
+from .storage import content_storage
+
+TRACKED = {
+    ListingImage: ("image",),
+    StoreImage: ("image",),
+    RepairShowcase: ("before_image", "after_image"),
+    AuthenticationImage: ("image",),
+}
+
+
+def _counts(names):
+    return Counter(name for name in names if content_storage().is_content_addressed(name))
+
+
+def acquire(names):
+    for name, n in _counts(names).items():
+        StoredImage.objects.filter(name=name).update(ref_count=F("ref_count") + n)
+
+
+def release(names):
+    now = timezone.now()
+    for name, n in _counts(names).items():
+        StoredImage.objects.filter(name=name, ref_count__gte=n).update(ref_count=F("ref_count") - n, touched_at=now)
+
+
+def _names(instance):
+    """Current file name per tracked field, skipping deferred fields so reading them costs no query."""
+    names = {}
+    for field in TRACKED[type(instance)]:
+        if field in instance.__dict__:
+            value = instance.__dict__[field]
+            names[field] = getattr(value, "name", value) or ""
+    return names
+
+
+def _remember(sender, instance, **kwargs):
+    instance._stored_image_names = _names(instance)
+
+
+def _saved(sender, instance, created, update_fields=None, **kwargs):
+    before, after = instance._stored_image_names, _names(instance)
+    changed = [
+        field for field in before
+        if after.get(field, "") != before[field] and (update_fields is None or field in update_fields)
+    ]
+    acquire(after[field] for field in changed)
+    release(before[field] for field in changed)
+    before.update((field, after[field]) for field in changed)
+    if sender is ListingImage and created and content_storage().is_content_addressed(after.get("image")):
+        from .tasks import flag_duplicate_image
+
+        transaction.on_commit(lambda: flag_duplicate_image.delay(str(instance.pk)))
+
+
+def _deleted(sender, instance, **kwargs):
+    # What the row held in the database; FieldFile.delete() may have cleared the field already.
+    release(instance._stored_image_names.values())
+
+
+def connect_signals():
+    for model in TRACKED:
+        label = model._meta.label
+        post_init.connect(_remember, sender=model, dispatch_uid=f"images.remember.{label}")
+        post_save.connect(_saved, sender=model, dispatch_uid=f"images.saved.{label}")
+        post_delete.connect(_deleted, sender=model, dispatch_uid=f"images.deleted.{label}")
@@ -0,0 +1,155 @@
+"""
+Content-addressed storage for uploaded images.
+
+Files are stored under the SHA-256 of their bytes, on top of the default
+storage: locally in sharded directories (cas/ab/cd/<digest>.jpg) so no
+directory grows without bound, on S3 and other object stores as
+cas/<digest>.jpg, where the hash right after the prefix spreads keys across
+partitions. Uploading bytes that are already stored only touches their
+StoredImage row; nothing is written unless the file has gone missing, and
+dimensions and the perceptual hash are not recomputed.
+
+delete() leaves content-addressed files alone because other rows may share
+them: refs.py counts references and collect_unused() removes files nobody
+has pointed at for IMAGE_GC_GRACE_HOURS. Names from before this storage (e.g.
+listings/2025/01/x.jpg) are passed through to the default storage untouched.
+"""
+import hashlib
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, Storage, storages
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+from PIL import Image
+
+from . import phash
+from .models import StoredImage
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}
+
+
+class ContentAddressedStorage(Storage):
+    @cached_property
+    def backend(self):
+        return storages["default"]
+
+    def is_content_addressed(self, name):
+        return bool(name) and name.startswith(settings.IMAGE_STORE_PREFIX + "/")
+
+    def key(self, digest, ext):
+        prefix = settings.IMAGE_STORE_PREFIX
+        if isinstance(self.backend, FileSystemStorage):
+            return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+        return f"{prefix}/{digest}{ext}"
+
+    # Names come from the content in _save(), so the upload's name never needs
+    # to be made unique (that would cost an exists() call per upload).
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        sha = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            sha.update(chunk)
+            size += len(chunk)
+        digest = sha.hexdigest()
+
+        now = timezone.now()
+        existing = StoredImage.objects.filter(digest=digest)
+        if existing.update(touched_at=now):
+            key = existing.values_list("name", flat=True).get()
+            # A row can outlive its file if collect_unused() deleted the file
+            # and then failed to delete the row; write the bytes back.
+            self._write(key, content)
+            return key
+
+        meta = _inspect(content)
+        key = self.key(digest, meta.pop("ext") or os.path.splitext(name)[1].lower())
+        self._write(key, content)
+        StoredImage.objects.bulk_create(
+            [StoredImage(digest=digest, name=key, size=size, touched_at=now, **meta)],
+            update_conflicts=True, unique_fields=["digest"], update_fields=["touched_at"],
+        )
+        return key
+
+    def _write(self, key, content):
+        if self.backend.exists(key):
+            return
+        content.seek(0)
+        saved = self.backend.save(key, content)
+        if saved != key:
+            # Lost a race with an identical upload; keep the first copy.
+            self.backend.delete(saved)
+
+    def delete(self, name):
+        if not self.is_content_addressed(name):
+            self.backend.delete(name)
+
+    def _open(self, name, mode="rb"):
+        return self.backend.open(name, mode)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+
+def _inspect(content):
+    """Format extension, dimensions and perceptual hash of an upload; empty values if Pillow can't read it."""
+    content.seek(0)
+    try:
+        with Image.open(content) as image:
+            ext, (width, height) = EXTENSIONS.get(image.format, ""), image.size
+            value = phash.dhash(image)
+    except Exception as exc:
+        logger.warning("Could not read uploaded image: %s", exc)
+        return {"ext": "", "width": None, "height": None, "phash": None, "phash_bands": []}
+    return {"ext": ext, "width": width, "height": height, "phash": value, "phash_bands": phash.bands(value)}
+
+
+_storage = ContentAddressedStorage()
+
+
+def content_storage():
+    """Storage for image fields; a callable so migrations don't capture the backend."""
+    return _storage
+
+
+def collect_unused(batch_size=None):
+    """Delete files no row has referenced for IMAGE_GC_GRACE_HOURS. Returns the number removed."""
+    batch_size = batch_size or settings.IMAGE_GC_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(hours=settings.IMAGE_GC_GRACE_HOURS)
+    removed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                StoredImage.objects.filter(ref_count=0, touched_at__lt=cutoff)
+                .select_for_update(skip_locked=True)[:batch_size]
+            )
+            # Files go while the rows are locked: an upload of the same bytes
+            # waits, finds no row and writes the file again. Should the DELETE
+            # below then fail, the next upload of those bytes finds the row,
+            # sees the file is gone and rewrites it.
+            for stored in batch:
+                _storage.backend.delete(stored.name)
+            StoredImage.objects.filter(id__in=[stored.id for stored in batch]).delete()
+        removed += len(batch)
+        if len(batch) < batch_size:
+            break
+    if removed:
+        logger.info("Removed %d unused images", removed)
+    return removed
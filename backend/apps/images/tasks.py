@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from . import duplicates, storage
+
+
+@shared_task
+def flag_duplicate_image(listing_image_id):
+    """Compare a new listing photo with other sellers' photos."""
+    return duplicates.flag(listing_image_id)
+
+
+@shared_task
+def collect_unused_images():
+    """Delete stored images that nothing has referenced for the grace period."""
+    return storage.collect_unused()
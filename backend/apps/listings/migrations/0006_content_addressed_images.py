@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:40
+
+import apps.images.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0005_promotion_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='listingimage',
+            name='image',
+            field=models.ImageField(storage=apps.images.storage.content_storage, upload_to='listings/%Y/%m/'),
+        ),
+        migrations.AddIndex(
+            model_name='listingimage',
+            index=models.Index(fields=['image'], name='listing_images_image_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_content_addressed_images'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='savedlisting',
+            index=models.Index(fields=['created_at'], name='saved_listings_created_idx'),
+        ),
+    ]
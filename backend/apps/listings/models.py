@@ -4,6 +4,8 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from apps.images.storage import content_storage
+
 
 class Listing(models.Model):
     class Condition(models.TextChoices):
@@ -72,7 +74,7 @@ class Listing(models.Model):
 class ListingImage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name="images")
-    image = models.ImageField(upload_to="listings/%Y/%m/")
+    image = models.ImageField(upload_to="listings/%Y/%m/", storage=content_storage)
     is_primary = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -80,6 +82,9 @@ class ListingImage(models.Model):
     class Meta:
         db_table = "listing_images"
         ordering = ["order", "created_at"]
+        indexes = [
+            models.Index(fields=["image"], name="listing_images_image_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         # Ensure only one primary image per listing
@@ -110,6 +115,13 @@ class ListingPromotion(models.Model):
 
     class Meta:
         db_table = "listing_promotions"
+        indexes = [
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(is_active=True),
+                name="listing_promo_expiring_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.listing} — {self.plan}"
@@ -118,6 +130,19 @@ class ListingPromotion(models.Model):
     def is_expired(self):
         return timezone.now() > self.expires_at
 
+    @classmethod
+    def activate(cls, listing, plan):
+        """Start or renew a paid ``plan`` on ``listing`` and mark it featured. Returns (promotion, created)."""
+        expires_at = timezone.now() + timedelta(days=PROMOTION_PLANS[plan]["days"])
+        promo, created = cls.objects.update_or_create(
+            listing=listing,
+            defaults={"plan": plan, "expires_at": expires_at, "is_active": True},
+        )
+        listing.is_featured = True
+        listing.featured_until = expires_at
+        listing.save(update_fields=["is_featured", "featured_until"])
+        return promo, created
+
 
 class SavedListing(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -130,3 +155,7 @@ class SavedListing(models.Model):
     class Meta:
         db_table = "saved_listings"
         unique_together = ("user", "listing")
+        indexes = [
+            # Incremental rollups read new saves by created_at (apps/analytics/rollups.py).
+            models.Index(fields=["created_at"], name="saved_listings_created_idx"),
+        ]
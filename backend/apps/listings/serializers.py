@@ -129,4 +129,6 @@ class UpdateListingSerializer(serializers.ModelSerializer):
     def validate_status(self, value):
         if value == Listing.Status.REMOVED:
             raise serializers.ValidationError("Use the delete endpoint to remove a listing.")
+        if value == Listing.Status.PENDING:
+            raise serializers.ValidationError("Listings are reserved by checkout.")
         return value
@@ -1,5 +1,5 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
@@ -7,10 +7,12 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
-from django.utils import timezone
-from datetime import timedelta
 from .models import Listing, ListingImage, ListingPromotion, SavedListing, PROMOTION_PLANS
-from config.paypal_utils import create_order as paypal_create_order, capture_order as paypal_capture_order
+from config.paypal_utils import create_order as paypal_create_order
+from apps.analytics import events
+from apps.transactions import featured, payments
+from apps.transactions.models import Order, PromotionPayment
+from apps.transactions.serializers import PromotionPaymentSerializer
 from .serializers import (
     ListingCardSerializer,
     ListingDetailSerializer,
@@ -70,6 +72,7 @@ def _list_listings(request):
 
     paginator = ListingPagination()
     page = paginator.paginate_queryset(qs, request)
+    events.record(events.IMPRESSION, featured.LISTING, [l.pk for l in page if l.is_featured])
     serializer = ListingCardSerializer(page, many=True, context={"request": request})
     return paginator.get_paginated_response(serializer.data)
 
@@ -84,6 +87,14 @@ def _create_listing(request):
     )
 
 
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def featured_listings(request):
+    """Homepage carousel of promoted listings, served from Redis."""
+    return featured.carousel_response(featured.LISTING, request)
+
+
 @api_view(["GET", "PATCH", "DELETE"])
 @permission_classes([AllowAny])
 def listing_detail(request, listing_id):
@@ -95,6 +106,9 @@ def listing_detail(request, listing_id):
     if request.method == "GET":
         # Increment view count
         Listing.objects.filter(id=listing_id).update(views_count=listing.views_count + 1)
+        events.record(events.VIEW, featured.LISTING, [listing.pk])
+        if listing.is_featured:
+            events.record(events.CLICK, featured.LISTING, [listing.pk])
         serializer = ListingDetailSerializer(listing, context={"request": request})
         return Response(serializer.data)
 
@@ -107,6 +121,10 @@ def listing_detail(request, listing_id):
     if not perm.has_object_permission(request, None, listing):
         return Response({"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
 
+    # A listing held by checkout or sold through it keeps the status the order gave it.
+    if (request.method == "DELETE" or "status" in request.data) and listing.orders.exclude(status__in=Order.CLOSED).exists():
+        return Response({"error": "This listing has an open order."}, status=status.HTTP_409_CONFLICT)
+
     if request.method == "PATCH":
         serializer = UpdateListingSerializer(listing, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -176,16 +194,7 @@ def promote_listing(request, listing_id):
     if plan not in PROMOTION_PLANS:
         return Response({"error": "Invalid plan. Choose: basic, featured, or premium."}, status=status.HTTP_400_BAD_REQUEST)
 
-    days = PROMOTION_PLANS[plan]["days"]
-    expires_at = timezone.now() + timedelta(days=days)
-
-    promo, created = ListingPromotion.objects.update_or_create(
-        listing=listing,
-        defaults={"plan": plan, "expires_at": expires_at, "is_active": True},
-    )
-    listing.is_featured = True
-    listing.featured_until = expires_at
-    listing.save(update_fields=["is_featured", "featured_until"])
+    promo, created = ListingPromotion.activate(listing, plan)
 
     return Response(
         ListingPromotionSerializer(promo).data,
@@ -229,28 +238,12 @@ def listing_promote_capture_order(request, listing_id):
     if not order_id or plan not in PROMOTION_PLANS:
         return Response({"error": "Missing order_id or invalid plan."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        capture = paypal_capture_order(order_id)
-        if capture.get("status") != "COMPLETED":
-            return Response({"error": "Payment not completed."}, status=status.HTTP_400_BAD_REQUEST)
-    except Exception:
-        return Response({"error": "Payment capture failed."}, status=status.HTTP_502_BAD_GATEWAY)
-
-    days = PROMOTION_PLANS[plan]["days"]
-    expires_at = timezone.now() + timedelta(days=days)
-
-    promo, created = ListingPromotion.objects.update_or_create(
-        listing=listing,
-        defaults={"plan": plan, "expires_at": expires_at, "is_active": True},
-    )
-    listing.is_featured = True
-    listing.featured_until = expires_at
-    listing.save(update_fields=["is_featured", "featured_until"])
-
-    return Response(
-        ListingPromotionSerializer(promo).data,
-        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
-    )
+    # Capturing can take PayPal many seconds; a worker does it and the client
+    # polls /api/v1/orders/payments/<order_id>/ for the outcome.
+    payment = payments.start_capture(request.user, PromotionPayment.Target.LISTING, listing, plan, order_id)
+    if payment is None:
+        return Response({"error": "Order belongs to another promotion."}, status=status.HTTP_409_CONFLICT)
+    return Response(PromotionPaymentSerializer(payment).data, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(["POST", "DELETE"])
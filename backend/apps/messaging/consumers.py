@@ -0,0 +1,39 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from . import unread
+from .realtime import user_group
+
+
+class MessagingConsumer(AsyncJsonWebsocketConsumer):
+    """
+    One socket per logged-in user for the whole inbox.
+
+    Server → client events: ``message.new``, ``message.read`` and
+    ``unread.count``. The current unread total is sent right after connecting,
+    so clients don't need to poll the REST endpoints.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        self.group_name = user_group(user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        total = await database_sync_to_async(unread.get_total)(user)
+        await self.send_json({"event": "unread.count", "data": {"unread": total}})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Push-only socket — writes still go through the REST API.
+        pass
+
+    async def messaging_event(self, event):
+        await self.send_json({"event": event["event"], "data": event["data"]})
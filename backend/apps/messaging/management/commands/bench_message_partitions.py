@@ -0,0 +1,127 @@
+import hashlib
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.messaging.partitions import add_months, month_start
+
+PLAIN = "bench_messages_plain"
+PARTITIONED = "bench_messages_partitioned"
+
+
+def _conversation_id(n):
+    # Matches md5(n::text)::uuid on the database side.
+    return uuid.UUID(hashlib.md5(str(n).encode()).hexdigest())
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark message inserts and recent-history reads on a monthly "
+        "range-partitioned table against an unpartitioned one (PostgreSQL only). "
+        "Uses scratch tables; the real messages table is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Historical rows preloaded into each table.")
+        parser.add_argument("--months", type=int, default=24, help="Months of history to spread them over.")
+        parser.add_argument("--conversations", type=int, default=20_000)
+        parser.add_argument("--inserts", type=int, default=50_000, help="Rows inserted during the timed insert phase.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--reads", type=int, default=5_000, help="Recent-history queries per table.")
+        parser.add_argument("--keep", action="store_true", help="Keep the scratch tables afterwards.")
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning benchmarks need PostgreSQL.")
+
+        today = datetime.now(dt_timezone.utc).date()
+        base = add_months(month_start(today), -opts["months"])
+        self.base = datetime(base.year, base.month, base.day, tzinfo=dt_timezone.utc)
+        self.opts = opts
+
+        try:
+            self._create_tables(base, add_months(month_start(today), 2))
+            self._preload()
+            for table in (PLAIN, PARTITIONED):
+                self._bench_inserts(table)
+            for table in (PLAIN, PARTITIONED):
+                self._bench_reads(table)
+        finally:
+            if not opts["keep"]:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED}")
+
+    def _conversation_start(self, n):
+        return self.base + timedelta(days=30 * (n % self.opts["months"]))
+
+    def _create_tables(self, first_month, end_month):
+        columns = "id uuid NOT NULL, conversation_id uuid NOT NULL, sender_id uuid NOT NULL, content text NOT NULL, created_at timestamptz NOT NULL"
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED}")
+            cursor.execute(f"CREATE TABLE {PLAIN} ({columns}, PRIMARY KEY (id))")
+            cursor.execute(f"CREATE TABLE {PARTITIONED} ({columns}, PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)")
+            month = first_month
+            while month < end_month:
+                cursor.execute(
+                    f"CREATE TABLE {PARTITIONED}_p{month:%Y%m} PARTITION OF {PARTITIONED} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                )
+                month = add_months(month, 1)
+            for table in (PLAIN, PARTITIONED):
+                cursor.execute(f"CREATE INDEX ON {table} (conversation_id, created_at)")
+
+    def _preload(self):
+        """Each conversation is active for ~30 days, staggered across the history window."""
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {PLAIN}
+                SELECT gen_random_uuid(), md5(c::text)::uuid, gen_random_uuid(), repeat('x', 120),
+                       %s::timestamptz + make_interval(days => 30 * (c %% %s)) + random() * interval '30 days'
+                FROM (SELECT (random() * (%s - 1))::int AS c FROM generate_series(1, %s)) AS rows
+                """,
+                [self.base, self.opts["months"], self.opts["conversations"], self.opts["rows"]],
+            )
+            cursor.execute(f"INSERT INTO {PARTITIONED} SELECT * FROM {PLAIN}")
+            cursor.execute(f"ANALYZE {PLAIN}")
+            cursor.execute(f"ANALYZE {PARTITIONED}")
+        self.stdout.write(f"Preloaded {self.opts['rows']:,} rows into each table in {time.perf_counter() - started:.1f}s")
+
+    def _bench_inserts(self, table):
+        total, batch_size = self.opts["inserts"], self.opts["batch_size"]
+        now = datetime.now(dt_timezone.utc)
+        placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * batch_size)
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            for offset in range(0, total, batch_size):
+                params = []
+                for i in range(batch_size):
+                    params += [uuid.uuid4(), _conversation_id((offset + i) % self.opts["conversations"]), uuid.uuid4(), "hello", now]
+                cursor.execute(f"INSERT INTO {table} VALUES {placeholders}", params)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{table}: {total / elapsed:,.0f} inserts/s ({total:,} rows, batches of {batch_size})")
+
+    def _bench_reads(self, table):
+        """Latest page of a thread, bounded below by the conversation start — the shape views.py issues."""
+        timings = []
+        with connection.cursor() as cursor:
+            for i in range(self.opts["reads"]):
+                n = (i * 7919) % self.opts["conversations"]
+                started = time.perf_counter()
+                cursor.execute(
+                    f"SELECT id, sender_id, content, created_at FROM {table} "
+                    f"WHERE conversation_id = %s AND created_at >= %s ORDER BY created_at DESC LIMIT 50",
+                    [_conversation_id(n), self._conversation_start(n) - timedelta(days=1)],
+                )
+                cursor.fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        self.stdout.write(
+            f"{table}: {len(timings) / (sum(timings) / 1000):,.0f} reads/s, "
+            f"p50 {statistics.median(timings):.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms"
+        )
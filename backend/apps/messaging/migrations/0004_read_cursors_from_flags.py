@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:31
+
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery
+
+
+def read_cursors_from_flags(apps, schema_editor):
+    """
+    Point each participant's cursor at the newest message from the other party
+    that was flagged read. Unread messages older than that cursor become read,
+    which matches what the participant has already seen in the thread.
+    """
+    Conversation = apps.get_model("messaging", "Conversation")
+    Message = apps.get_model("messaging", "Message")
+    for role in ("buyer", "seller"):
+        latest_read = (
+            Message.objects
+            .filter(conversation=OuterRef("pk"), is_read=True)
+            .exclude(sender=OuterRef(role))
+            .order_by("-created_at")
+        )
+        Conversation.objects.update(**{
+            f"{role}_last_read_message": Subquery(latest_read.values("id")[:1]),
+            f"{role}_last_read_at": Subquery(latest_read.values("created_at")[:1]),
+        })
+
+
+def flags_from_read_cursors(apps, schema_editor):
+    Message = apps.get_model("messaging", "Message")
+    for role, other in (("buyer", "seller"), ("seller", "buyer")):
+        Message.objects.filter(
+            sender=F(f"conversation__{other}"),
+            created_at__lte=F(f"conversation__{role}_last_read_at"),
+        ).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_read_cursors'),
+    ]
+
+    operations = [
+        migrations.RunPython(read_cursors_from_flags, flags_from_read_cursors),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return month.replace(year=month.year + years, month=index + 1, day=1)
+
+
+def _rebuild_messages(apps, schema_editor, partitioned):
+    """
+    Copy ``messages`` into a freshly created table (range-partitioned by month
+    on created_at, or plain when reversing) and swap it in, then recreate the
+    indexes and foreign keys Django expects.
+
+    ``messages`` is locked first and stays locked until the migration commits,
+    so rows written by live traffic cannot slip in between the copy and the
+    drop; senders wait for the swap instead.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Message = apps.get_model("messaging", "Message")
+    execute = schema_editor.execute
+
+    execute("LOCK TABLE messages IN ACCESS EXCLUSIVE MODE")
+
+    if partitioned:
+        execute("CREATE TABLE messages_rebuild (LIKE messages INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        execute("ALTER TABLE messages_rebuild ADD PRIMARY KEY (id, created_at)")
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT date_trunc('month', min(created_at))::date, date_trunc('month', now())::date FROM messages")
+            first, current = cursor.fetchone()
+        month, last = first or current, _add_months(current, MONTHS_AHEAD)
+        while month <= last:
+            execute(
+                f"CREATE TABLE messages_p{month:%Y%m} PARTITION OF messages_rebuild "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+    else:
+        execute("CREATE TABLE messages_rebuild (LIKE messages INCLUDING DEFAULTS)")
+        execute("ALTER TABLE messages_rebuild ADD PRIMARY KEY (id)")
+
+    execute("INSERT INTO messages_rebuild SELECT * FROM messages")
+    execute("DROP TABLE messages")
+    execute("ALTER TABLE messages_rebuild RENAME TO messages")
+    execute("ALTER TABLE messages RENAME CONSTRAINT messages_rebuild_pkey TO messages_pkey")
+
+    for sql in schema_editor._model_indexes_sql(Message):
+        execute(sql)
+    for name in ("conversation", "sender"):
+        execute(schema_editor._create_fk_sql(Message, Message._meta.get_field(name), "_fk_%(to_table)s_%(to_column)s"))
+
+
+def partition_messages(apps, schema_editor):
+    _rebuild_messages(apps, schema_editor, partitioned=True)
+
+
+def unpartition_messages(apps, schema_editor):
+    _rebuild_messages(apps, schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_remove_message_is_read'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conversation',
+            name='buyer_last_read_message',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.AlterField(
+            model_name='conversation',
+            name='seller_last_read_message',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.RunPython(partition_messages, unpartition_messages),
+    ]
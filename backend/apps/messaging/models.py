@@ -1,5 +1,8 @@
 import uuid
+from datetime import timedelta
 from django.db import models
+from django.db.models import Case, F, Min, Q, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
 
@@ -11,16 +14,103 @@ class Conversation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Read cursors: everything the other party sent up to and including
+    # *_last_read_message (at *_last_read_at) counts as read. No DB-level FK:
+    # messages is partitioned, and its primary key is (id, created_at).
+    buyer_last_read_at       = models.DateTimeField(null=True, blank=True)
+    buyer_last_read_message  = models.ForeignKey("Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+", db_constraint=False)
+    seller_last_read_at      = models.DateTimeField(null=True, blank=True)
+    seller_last_read_message = models.ForeignKey("Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+", db_constraint=False)
+
+    # Messages are never older than their conversation; bounding created_at
+    # from below lets PostgreSQL prune earlier monthly partitions. The slack
+    # absorbs clock skew between app servers.
+    HISTORY_SLACK = timedelta(days=1)
+
     class Meta:
         db_table = "conversations"
         unique_together = ("listing", "buyer")
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["buyer", "-updated_at"]),
+            models.Index(fields=["seller", "-updated_at"]),
+            # Incremental rollups read new conversations by created_at (apps/analytics/rollups.py).
+            models.Index(fields=["created_at"], name="conversations_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.buyer} → {self.seller} re: {self.listing}"
 
+    def other_participant_id(self, user_id):
+        return self.seller_id if user_id == self.buyer_id else self.buyer_id
+
+    def history(self):
+        """This conversation's messages, bounded so partition pruning applies."""
+        return self.messages.filter(created_at__gte=self.created_at - self.HISTORY_SLACK)
+
+    def _role_of(self, user_id):
+        return "buyer" if user_id == self.buyer_id else "seller"
+
+    def last_read_at_for(self, user_id):
+        return getattr(self, f"{self._role_of(user_id)}_last_read_at")
+
+    def unread_messages_for(self, user):
+        last_read_at = self.last_read_at_for(user.pk)
+        qs = self.messages.filter(created_at__gt=last_read_at) if last_read_at else self.history()
+        return qs.exclude(sender=user)
+
     def unread_count_for(self, user):
-        return self.messages.filter(is_read=False).exclude(sender=user).count()
+        return self.unread_messages_for(user).count()
+
+    def mark_read(self, user):
+        """
+        Move the user's read cursor to the newest message from the other party.
+
+        A single-row UPDATE on the conversation; the cursor only ever moves
+        forward. Returns the number of messages that became read.
+        """
+        unread = self.unread_messages_for(user)
+        latest = unread.order_by("-created_at").only("id", "created_at").first()
+        if latest is None:
+            return 0
+        newly_read = unread.filter(created_at__lte=latest.created_at).count()
+
+        role = self._role_of(user.pk)
+        cursor = {f"{role}_last_read_at": latest.created_at, f"{role}_last_read_message": latest}
+        advanced = (
+            Conversation.objects
+            .filter(pk=self.pk)
+            .filter(Q(**{f"{role}_last_read_at__isnull": True}) | Q(**{f"{role}_last_read_at__lt": latest.created_at}))
+            .update(**cursor)
+        )
+        for field, value in cursor.items():
+            setattr(self, field, value)
+        return newly_read if advanced else 0
+
+
+class MessageQuerySet(models.QuerySet):
+    def unread_for(self, user):
+        """
+        Messages in the user's conversations that the other party sent after the
+        user's read cursor. Bounded below by the earliest cursor (or conversation
+        start, less HISTORY_SLACK) among those conversations, so partition
+        pruning applies.
+        """
+        since = Conversation.objects.filter(Q(buyer=user) | Q(seller=user)).aggregate(since=Min(Case(
+            When(buyer=user, then=Coalesce("buyer_last_read_at", F("created_at") - Conversation.HISTORY_SLACK)),
+            default=Coalesce("seller_last_read_at", F("created_at") - Conversation.HISTORY_SLACK),
+        )))["since"]
+        if since is None:
+            return self.none()
+        as_buyer = Q(conversation__buyer=user) & (
+            Q(conversation__buyer_last_read_at__isnull=True)
+            | Q(created_at__gt=F("conversation__buyer_last_read_at"))
+        )
+        as_seller = Q(conversation__seller=user) & (
+            Q(conversation__seller_last_read_at__isnull=True)
+            | Q(created_at__gt=F("conversation__seller_last_read_at"))
+        )
+        return self.filter(as_buyer | as_seller, created_at__gte=since).exclude(sender=user)
 
 
 class Message(models.Model):
@@ -28,12 +118,23 @@ class Message(models.Model):
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="messages")
     sender       = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sent_messages")
     content      = models.TextField()
-    is_read      = models.BooleanField(default=False)
     created_at   = models.DateTimeField(auto_now_add=True)
 
+    objects = MessageQuerySet.as_manager()
+
     class Meta:
         db_table = "messages"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["conversation", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.sender}: {self.content[:50]}"
+
+    @property
+    def is_read(self):
+        """Read by the recipient — derived from their read cursor on the conversation."""
+        conversation = self.conversation
+        last_read_at = conversation.last_read_at_for(conversation.other_participant_id(self.sender_id))
+        return last_read_at is not None and self.created_at <= last_read_at
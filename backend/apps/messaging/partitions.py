@@ -0,0 +1,107 @@
+"""
+Monthly range partitions for the ``messages`` table.
+
+Migration 0006_partition_messages turns ``messages`` into a table partitioned by ``created_at``
+on PostgreSQL, with one partition per calendar month named
+``messages_pYYYYMM``. There is no default partition, so upcoming months are
+created ahead of time by ``ensure_partitions``. ``archive_partitions`` detaches
+months older than the retention window and moves them into the
+``messages_archive`` schema, where they stay queryable for support but no
+longer weigh on vacuum and index maintenance of the live table.
+
+Both run daily from ``tasks.maintain_message_partitions``.
+"""
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+PARENT_TABLE = "messages"
+ARCHIVE_SCHEMA = "messages_archive"
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def create_partition(cursor, month):
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{PARENT_TABLE}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def attached_partitions():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [PARENT_TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def ensure_partitions(months_ahead=None, today=None):
+    """Create partitions for the current month and ``months_ahead`` months after it."""
+    if months_ahead is None:
+        months_ahead = settings.MESSAGE_PARTITION_MONTHS_AHEAD
+    start = month_start(today or timezone.now().date())
+    existing = set(attached_partitions())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(start, offset)
+            if partition_name(month) not in existing:
+                create_partition(cursor, month)
+                created.append(partition_name(month))
+    return created
+
+
+def archive_partitions(keep_months=None, today=None):
+    """
+    Detach partitions that ended more than ``keep_months`` months ago and move
+    them to the archive schema. ``keep_months`` of 0 disables archiving.
+    """
+    if keep_months is None:
+        keep_months = settings.MESSAGE_PARTITION_KEEP_MONTHS
+    if not keep_months:
+        return []
+    cutoff = add_months(month_start(today or timezone.now().date()), -keep_months)
+    archived = []
+    for name in attached_partitions():
+        month = datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m").date()
+        if add_months(month, 1) > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"')
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+            cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{ARCHIVE_SCHEMA}"')
+        archived.append(name)
+    return archived
@@ -0,0 +1,72 @@
+"""
+Push messaging events to connected WebSocket clients.
+
+Every user has one channel-layer group (see ``user_group``) that all of their
+open sockets join. Views call the helpers below after writing to the database;
+the events are sent once the surrounding transaction commits, and a channel
+layer outage never fails the request that triggered it.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from . import unread
+
+logger = logging.getLogger(__name__)
+
+
+def user_group(user_id):
+    return f"messaging.user.{user_id}"
+
+
+def _push(user_ids, event, data):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    for user_id in user_ids:
+        try:
+            async_to_sync(layer.group_send)(
+                user_group(user_id),
+                {"type": "messaging.event", "event": event, "data": data},
+            )
+        except Exception:
+            logger.exception("Failed to push %s to user %s", event, user_id)
+
+
+def _push_unread(user):
+    _push([user.pk], "unread.count", {"unread": unread.get_total(user)})
+
+
+def message_created(message):
+    """Deliver a new message to both participants and refresh the recipient's badge."""
+    from .serializers import MessageSerializer
+
+    conversation = message.conversation
+    recipient = conversation.seller if message.sender_id == conversation.buyer_id else conversation.buyer
+    data = {"conversation_id": str(conversation.id), "message": MessageSerializer(message).data}
+
+    def send():
+        _push([conversation.buyer_id, conversation.seller_id], "message.new", data)
+        _push_unread(recipient)
+
+    transaction.on_commit(send)
+
+
+def messages_read(conversation, reader):
+    """Tell the other participant their messages were read and refresh the reader's badge."""
+    other_id = conversation.other_participant_id(reader.pk)
+    role = "buyer" if reader.pk == conversation.buyer_id else "seller"
+    data = {
+        "conversation_id": str(conversation.id),
+        "reader_id": str(reader.pk),
+        "last_read_message_id": str(getattr(conversation, f"{role}_last_read_message_id")),
+        "last_read_at": conversation.last_read_at_for(reader.pk).isoformat(),
+    }
+
+    def send():
+        _push([other_id], "message.read", data)
+        _push_unread(reader)
+
+    transaction.on_commit(send)
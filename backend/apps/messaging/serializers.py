@@ -29,7 +29,8 @@ class ConversationListSerializer(serializers.ModelSerializer):
         )
 
     def get_last_message(self, obj):
-        msg = obj.messages.last()
+        latest = getattr(obj, "latest_messages", None)
+        msg = latest[0] if latest else obj.messages.last()
         if not msg:
             return None
         return {"content": msg.content, "sender_id": str(msg.sender_id), "created_at": msg.created_at}
@@ -42,7 +43,21 @@ class ConversationListSerializer(serializers.ModelSerializer):
 
 
 class ConversationDetailSerializer(ConversationListSerializer):
-    messages = MessageSerializer(many=True, read_only=True)
+    """
+    Conversation header plus one page of its message history.
+
+    The page and its cursors are passed in through context by the view
+    (see ``views._message_page``), so a conversation is never serialized
+    with its full history.
+    """
+    messages = serializers.SerializerMethodField()
+    cursors  = serializers.SerializerMethodField()
 
     class Meta(ConversationListSerializer.Meta):
-        fields = ConversationListSerializer.Meta.fields + ("messages",)
+        fields = ConversationListSerializer.Meta.fields + ("messages", "cursors")
+
+    def get_messages(self, obj):
+        return MessageSerializer(self.context.get("messages", []), many=True, context=self.context).data
+
+    def get_cursors(self, obj):
+        return self.context.get("cursors", {"before": None, "after": None})
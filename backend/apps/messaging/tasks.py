@@ -0,0 +1,38 @@
+import logging
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from . import partitions, unread
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def repair_unread_counters(batch_size=500):
+    """Walk all users in primary-key batches and correct drifted unread counters."""
+    User = get_user_model()
+    repaired = 0
+    last_pk = None
+    while True:
+        qs = User.objects.order_by("pk")
+        if last_pk is not None:
+            qs = qs.filter(pk__gt=last_pk)
+        batch = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            break
+        repaired += unread.repair(batch)
+        last_pk = batch[-1]
+    logger.info("Repaired %d unread counters", repaired)
+    return repaired
+
+
+@shared_task
+def maintain_message_partitions():
+    """Pre-create upcoming monthly message partitions and archive expired ones."""
+    if not partitions.is_partitioned():
+        return {"created": [], "archived": []}
+    created = partitions.ensure_partitions()
+    archived = partitions.archive_partitions()
+    logger.info("Message partitions: created %s, archived %s", created, archived)
+    return {"created": created, "archived": archived}
@@ -0,0 +1,120 @@
+"""
+Per-user unread message totals kept in the cache (Redis in production).
+
+The navbar badge reads ``get_total`` on every page load, so the total is
+maintained incrementally: ``incr`` when a message is sent, ``decr`` when a
+conversation is marked read. A missing key is rebuilt from the database on the
+next read, and any cache error falls back to the database. Counters that drift
+(lost increments, cache evictions) are corrected by
+``tasks.repair_unread_counters``.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db.models import Count, DateTimeField, ExpressionWrapper, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Conversation, Message
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TTL = 60 * 60 * 24
+
+
+def _key(user_id):
+    return f"messaging:unread:{user_id}"
+
+
+def count_from_db(user):
+    return Message.objects.unread_for(user).count()
+
+
+def get_total(user):
+    key = _key(user.pk)
+    try:
+        total = cache.get(key)
+    except Exception:
+        logger.exception("Unread counter read failed for user %s", user.pk)
+        return count_from_db(user)
+    if total is None:
+        total = count_from_db(user)
+        try:
+            cache.add(key, total, COUNTER_TTL)
+        except Exception:
+            logger.exception("Unread counter seed failed for user %s", user.pk)
+    return total
+
+
+def incr(user_id, amount=1):
+    try:
+        cache.incr(_key(user_id), amount)
+    except ValueError:
+        pass  # not cached yet — seeded from the database on the next read
+    except Exception:
+        logger.exception("Unread counter increment failed for user %s", user_id)
+
+
+def decr(user_id, amount=1):
+    key = _key(user_id)
+    try:
+        if cache.decr(key, amount) < 0:
+            cache.delete(key)
+    except ValueError:
+        pass
+    except Exception:
+        logger.exception("Unread counter decrement failed for user %s", user_id)
+
+
+def _unread_count(role):
+    """Subquery: messages in the outer conversation that ``role`` has not read yet."""
+    since = Coalesce(
+        OuterRef(f"{role}_last_read_at"),
+        ExpressionWrapper(OuterRef("created_at") - Conversation.HISTORY_SLACK, output_field=DateTimeField()),
+    )
+    messages = (
+        Message.objects
+        .filter(conversation=OuterRef("pk"), created_at__gt=since)
+        .exclude(sender=OuterRef(role))
+        .order_by()
+        .values("conversation")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(messages), 0)
+
+
+def recount(user_ids):
+    """
+    Unread totals for a batch of users, in one query over their conversations.
+    Each conversation counts its messages past the reader's cursor (or over its
+    history when there is none), so the (conversation, created_at) index and
+    partition pruning serve every count.
+    """
+    rows = (
+        Conversation.objects
+        .filter(Q(buyer__in=user_ids) | Q(seller__in=user_ids))
+        .annotate(buyer_unread=_unread_count("buyer"), seller_unread=_unread_count("seller"))
+        .values_list("buyer_id", "buyer_unread", "seller_id", "seller_unread")
+    )
+    totals = {user_id: 0 for user_id in user_ids}
+    for buyer_id, buyer_unread, seller_id, seller_unread in rows:
+        if buyer_id in totals:
+            totals[buyer_id] += buyer_unread
+        if seller_id in totals:
+            totals[seller_id] += seller_unread
+    return totals
+
+
+def repair(user_ids):
+    """Overwrite cached counters that disagree with the database. Returns how many were fixed."""
+    cached = cache.get_many([_key(user_id) for user_id in user_ids])
+    if not cached:
+        return 0
+    fixed = {}
+    for user_id, total in recount(user_ids).items():
+        key = _key(user_id)
+        if key in cached and cached[key] != total:
+            fixed[key] = total
+    if fixed:
+        cache.set_many(fixed, COUNTER_TTL)
+    return len(fixed)
@@ -1,19 +1,94 @@
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch, Q, prefetch_related_objects
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.listings.models import Listing
+from apps.notifications.dispatch import notify
+from apps.notifications.models import Notification
+from . import realtime, unread
 from .models import Conversation, Message
 from .serializers import ConversationListSerializer, ConversationDetailSerializer, MessageSerializer
 
+MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
+
+
+class ConversationPagination(CursorPagination):
+    """Keyset pagination over the inbox, most recently active first."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-updated_at"
+
+
+def _cursor_anchor(conversation, message_id):
+    """Resolve a before/after cursor to the message it points at, or None."""
+    try:
+        return conversation.history().only("id", "created_at").get(id=message_id)
+    except (Message.DoesNotExist, ValidationError):
+        return None
+
+
+def _notify_recipient(conversation, message):
+    notify(
+        [conversation.other_participant_id(message.sender_id)],
+        Notification.Kind.MESSAGE,
+        f"New message from {message.sender.full_name}",
+        body=message.content[:200],
+        link=f"/messages/{conversation.id}",
+        data={"conversation_id": str(conversation.id), "message_id": str(message.id)},
+    )
+
+
+def _message_page(conversation, request, before=None, after=None):
+    """
+    One keyset page of a conversation's messages.
+
+    Without cursors (or with ``before``) the page is the newest ``limit``
+    messages older than the anchor; with ``after`` it is the next ``limit``
+    messages newer than the anchor. Either way the messages come back in
+    chronological order, with a ``before`` cursor when older history remains
+    and an ``after`` cursor to poll for anything newer.
+    """
+    try:
+        limit = int(request.GET.get("limit", MESSAGE_PAGE_SIZE))
+    except ValueError:
+        limit = MESSAGE_PAGE_SIZE
+    limit = max(1, min(limit, MAX_MESSAGE_PAGE_SIZE))
+
+    qs = conversation.history().select_related("sender")
+    if after is not None:
+        qs = qs.filter(
+            Q(created_at__gt=after.created_at) | Q(created_at=after.created_at, id__gt=after.id)
+        ).order_by("created_at", "id")
+        rows = list(qs[:limit])
+        has_older = True
+    else:
+        if before is not None:
+            qs = qs.filter(
+                Q(created_at__lt=before.created_at) | Q(created_at=before.created_at, id__lt=before.id)
+            )
+        rows = list(qs.order_by("-created_at", "-id")[:limit + 1])
+        has_older = len(rows) > limit
+        rows = rows[:limit][::-1]
+
+    cursors = {
+        "before": str(rows[0].id) if rows and has_older else None,
+        "after": str(rows[-1].id) if rows else (str(after.id) if after is not None else None),
+    }
+    return rows, cursors
+
 
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def conversations(request):
     """
-    GET  — list all conversations the current user is part of.
+    GET  — list the conversations the current user is part of, cursor-paginated
+           on updated_at (newest first).
     POST — start (or retrieve) a conversation as a buyer.
            Body: { listing_id, message }
     """
@@ -22,9 +97,21 @@ def conversations(request):
             Conversation.objects
             .filter(Q(buyer=request.user) | Q(seller=request.user))
             .select_related("listing", "buyer", "seller")
-            .prefetch_related("messages")
         )
-        return Response(ConversationListSerializer(qs, many=True, context={"request": request}).data)
+        paginator = ConversationPagination()
+        page = paginator.paginate_queryset(qs, request)
+        if page:
+            # Sending a message bumps updated_at, so each latest message is no
+            # older than the page's oldest updated_at; bounding on it lets
+            # PostgreSQL prune earlier monthly partitions.
+            since = min(conversation.updated_at for conversation in page) - Conversation.HISTORY_SLACK
+            prefetch_related_objects(page, Prefetch(
+                "messages",
+                queryset=Message.objects.filter(created_at__gte=since).order_by("-created_at")[:1],
+                to_attr="latest_messages",
+            ))
+        serializer = ConversationListSerializer(page, many=True, context={"request": request})
+        return paginator.get_paginated_response(serializer.data)
 
     # POST — buyer starts conversation
     listing_id = request.data.get("listing_id")
@@ -49,11 +136,17 @@ def conversations(request):
         defaults={"seller": listing.seller},
     )
 
-    Message.objects.create(conversation=conversation, sender=request.user, content=message_text)
+    message = Message.objects.create(conversation=conversation, sender=request.user, content=message_text)
     conversation.save()  # bump updated_at
+    unread.incr(conversation.other_participant_id(request.user.pk))
+    realtime.message_created(message)
+    _notify_recipient(conversation, message)
 
+    messages, cursors = _message_page(conversation, request)
     return Response(
-        ConversationDetailSerializer(conversation, context={"request": request}).data,
+        ConversationDetailSerializer(
+            conversation, context={"request": request, "messages": messages, "cursors": cursors}
+        ).data,
         status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
     )
 
@@ -61,21 +154,39 @@ def conversations(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def conversation_detail(request, conversation_id):
-    """GET — fetch conversation with all messages; marks received messages as read."""
+    """
+    GET — fetch a conversation with one page of messages; marks received messages as read.
+          Query: ?before=<message_id> for older history, ?after=<message_id> for newer
+                 messages, ?limit=<n> (default 50, max 200).
+    """
     try:
-        conversation = Conversation.objects.select_related("listing", "buyer", "seller").prefetch_related("messages__sender").get(
-            id=conversation_id
-        )
+        conversation = Conversation.objects.select_related("listing", "buyer", "seller").get(id=conversation_id)
     except Conversation.DoesNotExist:
         return Response({"error": "Conversation not found."}, status=status.HTTP_404_NOT_FOUND)
 
     if request.user not in (conversation.buyer, conversation.seller):
         return Response({"error": "Access denied."}, status=status.HTTP_403_FORBIDDEN)
 
-    # Mark all messages from the other party as read
-    conversation.messages.filter(is_read=False).exclude(sender=request.user).update(is_read=True)
+    before = after = None
+    if request.GET.get("before"):
+        before = _cursor_anchor(conversation, request.GET["before"])
+        if before is None:
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+    elif request.GET.get("after"):
+        after = _cursor_anchor(conversation, request.GET["after"])
+        if after is None:
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Advance the reader's cursor past everything the other party has sent
+    marked = conversation.mark_read(request.user)
+    if marked:
+        unread.decr(request.user.pk, marked)
+        realtime.messages_read(conversation, request.user)
 
-    return Response(ConversationDetailSerializer(conversation, context={"request": request}).data)
+    messages, cursors = _message_page(conversation, request, before=before, after=after)
+    return Response(ConversationDetailSerializer(
+        conversation, context={"request": request, "messages": messages, "cursors": cursors}
+    ).data)
 
 
 @api_view(["POST"])
@@ -96,6 +207,9 @@ def send_message(request, conversation_id):
 
     message = Message.objects.create(conversation=conversation, sender=request.user, content=content)
     conversation.save()  # bump updated_at
+    unread.incr(conversation.other_participant_id(request.user.pk))
+    realtime.message_created(message)
+    _notify_recipient(conversation, message)
 
     return Response(MessageSerializer(message).data, status=status.HTTP_201_CREATED)
 
@@ -104,14 +218,4 @@ def send_message(request, conversation_id):
 @permission_classes([IsAuthenticated])
 def unread_count(request):
     """GET — total unread message count for the current user (for navbar badge)."""
-    from django.db.models import Count
-    total = (
-        Message.objects
-        .filter(
-            Q(conversation__buyer=request.user) | Q(conversation__seller=request.user)
-        )
-        .exclude(sender=request.user)
-        .filter(is_read=False)
-        .count()
-    )
-    return Response({"unread": total})
+    return Response({"unread": unread.get_total(request.user)})
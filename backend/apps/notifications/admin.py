@@ -1,3 +1,20 @@
 from django.contrib import admin
+from .models import Notification, OutboundEmail
 
-# Register your models here.
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("recipient", "kind", "title", "read_at", "emailed_at", "created_at")
+    list_filter = ("kind",)
+    search_fields = ("recipient__email", "title")
+    ordering = ("-created_at",)
+    readonly_fields = ("id", "created_at")
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("to_email", "subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status",)
+    search_fields = ("to_email", "subject")
+    ordering = ("-created_at",)
+    readonly_fields = ("id", "created_at", "sent_at", "last_error")
@@ -0,0 +1,77 @@
+"""
+Email digests. The first notification a user gets opens a digest window;
+everything raised for them until it closes goes out in a single email.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+MAX_DIGEST_ITEMS = 20
+# The digest runs a little after its window key expires, so an event that
+# arrives once the digest has claimed its rows always opens a fresh window.
+DIGEST_GRACE_SECONDS = 5
+
+
+def _window_key(user_id):
+    return f"notifications:digest:{user_id}"
+
+
+def schedule(user_ids):
+    """Open a digest window for each user that does not already have one."""
+    from .tasks import send_digest
+
+    window = settings.NOTIFICATION_DIGEST_WINDOW
+    for user_id in user_ids:
+        try:
+            opened = cache.add(_window_key(user_id), 1, timeout=window)
+        except Exception:
+            # Without the cache every event schedules a digest; the claim in
+            # send() still makes sure each notification is emailed once.
+            logger.exception("Could not open digest window for user %s", user_id)
+            opened = True
+        if opened:
+            send_digest.apply_async((str(user_id),), countdown=window + DIGEST_GRACE_SECONDS)
+
+
+def pending_for(user_id):
+    return Notification.objects.filter(
+        recipient_id=user_id, read_at__isnull=True, emailed_at__isnull=True
+    )
+
+
+def send(user_id):
+    """
+    Email everything still unread and not yet emailed to ``user_id``.
+
+    Rows are claimed with a single UPDATE in the same transaction that queues
+    the email, so overlapping digest tasks cannot mail the same notification
+    twice. Returns the number of notifications included.
+    """
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    if user is None or not user.email:
+        return 0
+
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        if not pending_for(user_id).update(emailed_at=claimed_at):
+            return 0
+        claimed = Notification.objects.filter(recipient_id=user_id, emailed_at=claimed_at)
+        items = list(claimed.order_by("-created_at").values_list("title", flat=True)[:MAX_DIGEST_ITEMS])
+        total = claimed.count()
+
+        lines = [f"- {title}" for title in items]
+        if total > len(items):
+            lines.append(f"...and {total - len(items)} more.")
+        subject = "You have a new notification on TimeTrader" if total == 1 else f"You have {total} new notifications on TimeTrader"
+        body = f"Hi {user.full_name},\n\n" + "\n".join(lines) + "\n\nSee them all in your TimeTrader account."
+        outbox.enqueue(user.email, subject, body)
+    return total
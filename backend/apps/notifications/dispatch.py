@@ -0,0 +1,18 @@
+from django.db import transaction
+
+
+def notify(recipient_ids, kind, title, body="", link="", data=None):
+    """
+    Queue one notification per recipient.
+
+    Rows are written by a Celery task once the caller's transaction commits,
+    so raising a notification never adds fan-out work to the request.
+    """
+    from .tasks import fan_out
+
+    recipient_ids = [str(pk) for pk in recipient_ids if pk is not None]
+    if not recipient_ids:
+        return
+    transaction.on_commit(
+        lambda: fan_out.delay(recipient_ids, kind, title, body, link, data or {})
+    )
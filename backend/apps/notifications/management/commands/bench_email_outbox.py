@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from apps.notifications import outbox
+from apps.notifications.models import OutboundEmail
+
+BENCH_DOMAIN = "outbox-bench.invalid"
+
+
+class SMTPSink:
+    """Minimal SMTP server that accepts and discards everything, run on a background thread."""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = 0
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.ready.wait()
+        return self.port
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self._session, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 sink ready\r\n")
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                writer.write(b"354 end with .\r\n")
+                await writer.drain()
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                self.messages += 1
+                writer.write(b"250 queued\r\n")
+            elif command == b"QUIT":
+                writer.write(b"221 bye\r\n")
+                break
+            else:
+                writer.write(b"250 ok\r\n")
+            await writer.drain()
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue synthetic emails and drain the outbox, reporting throughput. "
+        "By default mail goes to a built-in local SMTP sink; --use-settings sends "
+        "through the configured EMAIL_BACKEND instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=2000)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--use-settings", action="store_true")
+
+    def handle(self, *args, **opts):
+        sink = None
+        connection = None
+        if not opts["use_settings"]:
+            sink = SMTPSink()
+            port = sink.start()
+            connection = get_connection(
+                "django.core.mail.backends.smtp.EmailBackend",
+                host="127.0.0.1", port=port, use_tls=False, use_ssl=False, username="", password="",
+            )
+
+        try:
+            started = time.perf_counter()
+            OutboundEmail.objects.bulk_create([
+                OutboundEmail(to_email=f"user{i}@{BENCH_DOMAIN}", subject=f"Bench {i}", body="Outbox benchmark.")
+                for i in range(opts["count"])
+            ])
+            queued = time.perf_counter() - started
+
+            started = time.perf_counter()
+            sent, failed = outbox.drain(opts["batch_size"], connection=connection)
+            elapsed = time.perf_counter() - started
+        finally:
+            OutboundEmail.objects.filter(to_email__endswith=f"@{BENCH_DOMAIN}").delete()
+            if sink:
+                sink.stop()
+
+        self.stdout.write(f"Queued {opts['count']:,} emails in {queued:.2f}s")
+        self.stdout.write(f"Sent {sent:,}, failed {failed:,} in {elapsed:.2f}s ({sent / elapsed:,.0f} emails/s)")
+        if sink:
+            self.stdout.write(f"SMTP sink: {sink.messages:,} messages over {sink.connections:,} connections")
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_outbound_emails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('message', 'New message'), ('appointment', 'Appointment update'), ('promotion_expired', 'Promotion expired'), ('authentication', 'Authentication result')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_authentication_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('message', 'New message'), ('appointment', 'Appointment update'), ('promotion_expired', 'Promotion expired'), ('authentication', 'Authentication result'), ('order', 'Order update')], max_length=30),
+        ),
+    ]
@@ -1,3 +1,83 @@
+import uuid
 from django.db import models
+from django.conf import settings
+from django.utils import timezone
 
-# Create your models here.
+
+class Notification(models.Model):
+    class Kind(models.TextChoices):
+        MESSAGE = "message", "New message"
+        APPOINTMENT = "appointment", "Appointment update"
+        PROMOTION_EXPIRED = "promotion_expired", "Promotion expired"
+        AUTHENTICATION = "authentication", "Authentication result"
+        ORDER = "order", "Order update"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications"
+    )
+    kind = models.CharField(max_length=30, choices=Kind.choices)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    link = models.CharField(max_length=500, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+    # Set once the notification has gone out in an email digest.
+    emailed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "notifications"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "-created_at"]),
+            models.Index(
+                fields=["recipient", "created_at"],
+                condition=models.Q(read_at__isnull=True, emailed_at__isnull=True),
+                name="notifications_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} — {self.title}"
+
+    @property
+    def is_read(self):
+        return self.read_at is not None
+
+
+class OutboundEmail(models.Model):
+    """An email waiting in (or delivered from) the outbox. See outbox.py."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Earliest time a worker may pick the email up; doubles as a claim lease.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "outbound_emails"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="outbound_emails_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} — {self.subject}"
@@ -0,0 +1,122 @@
+"""
+Email outbox. Callers enqueue rows; Celery workers claim due rows in batches
+and send each batch over a single SMTP connection. Failed sends are retried
+with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS is reached.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch stays invisible to other workers. A worker that
+# dies mid-batch leaves its rows pending, so they are picked up again after this.
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_BACKOFF = timedelta(hours=6)
+
+
+def enqueue(to_email, subject, body, html_body="", from_email=""):
+    """Queue an email and wake a worker once the current transaction commits."""
+    from .tasks import send_outbox
+
+    email = OutboundEmail.objects.create(
+        to_email=to_email, subject=subject, body=body, html_body=html_body, from_email=from_email
+    )
+    transaction.on_commit(send_outbox.delay)
+    return email
+
+
+def claim(batch_size=None):
+    """Lease up to ``batch_size`` due emails to this worker."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(id__in=[e.id for e in batch]).update(next_attempt_at=now + CLAIM_LEASE)
+    return batch
+
+
+def backoff(attempts):
+    return min(timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)), MAX_BACKOFF)
+
+
+def _record_failure(email, exc):
+    email.attempts += 1
+    email.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboundEmail.Status.FAILED
+        logger.error("Giving up on email %s to %s: %s", email.id, email.to_email, email.last_error)
+    else:
+        email.next_attempt_at = timezone.now() + backoff(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def deliver(batch, connection=None):
+    """
+    Send a claimed batch over one connection. Returns (sent, failed).
+
+    If the server drops the connection mid-batch it is reopened once per
+    failure so the rest of the batch still goes out.
+    """
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in batch:
+            _record_failure(email, exc)
+        return 0, len(batch)
+
+    sent_ids, failed = [], 0
+    try:
+        for email in batch:
+            message = EmailMultiAlternatives(
+                email.subject,
+                email.body,
+                email.from_email or settings.DEFAULT_FROM_EMAIL,
+                [email.to_email],
+                connection=connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, "text/html")
+            try:
+                message.send()
+            except Exception as exc:
+                _record_failure(email, exc)
+                failed += 1
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+            else:
+                sent_ids.append(email.id)
+    finally:
+        connection.close()
+
+    OutboundEmail.objects.filter(id__in=sent_ids).update(
+        status=OutboundEmail.Status.SENT, sent_at=timezone.now(), last_error=""
+    )
+    return len(sent_ids), failed
+
+
+def drain(batch_size=None, connection=None):
+    """Claim and deliver batches until nothing is due. Returns (sent, failed)."""
+    sent = failed = 0
+    while True:
+        batch = claim(batch_size)
+        if not batch:
+            return sent, failed
+        s, f = deliver(batch, connection=connection)
+        sent += s
+        failed += f
@@ -0,0 +1,43 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from . import digest, outbox
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def fan_out(recipient_ids, kind, title, body="", link="", data=None):
+    """Write one notification per recipient in bulk_create chunks, then open digest windows."""
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    for start in range(0, len(recipient_ids), batch_size):
+        Notification.objects.bulk_create([
+            Notification(recipient_id=pk, kind=kind, title=title, body=body, link=link, data=data or {})
+            for pk in recipient_ids[start:start + batch_size]
+        ])
+    digest.schedule(recipient_ids)
+    return len(recipient_ids)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_digest(self, user_id):
+    try:
+        sent = digest.send(user_id)
+    except Exception as exc:
+        logger.warning("Digest for user %s failed: %s", user_id, exc)
+        raise self.retry(exc=exc)
+    if sent:
+        logger.info("Queued digest of %d notifications for user %s", sent, user_id)
+    return sent
+
+
+@shared_task
+def send_outbox(batch_size=None):
+    """Deliver every due outbox email; scheduled as a sweeper and kicked on enqueue."""
+    sent, failed = outbox.drain(batch_size)
+    if sent or failed:
+        logger.info("Outbox: sent %d, failed %d", sent, failed)
+    return {"sent": sent, "failed": failed}
@@ -1,3 +1,8 @@
 from django.urls import path
-urlpatterns = []
+from . import views
 
+urlpatterns = [
+    path("", views.notifications, name="notifications"),
+    path("read/", views.mark_read, name="notifications-mark-read"),
+    path("unread/", views.unread_count, name="notifications-unread-count"),
+]
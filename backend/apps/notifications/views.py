@@ -1,3 +1,57 @@
-from django.shortcuts import render
+import uuid
 
-# Create your views here.
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .models import Notification
+from .serializers import NotificationSerializer
+
+
+class NotificationPagination(CursorPagination):
+    """Keyset pagination over the inbox, newest first."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def notifications(request):
+    qs = Notification.objects.filter(recipient=request.user)
+    if request.query_params.get("unread") in ("1", "true"):
+        qs = qs.filter(read_at__isnull=True)
+    paginator = NotificationPagination()
+    page = paginator.paginate_queryset(qs, request)
+    return paginator.get_paginated_response(NotificationSerializer(page, many=True).data)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def mark_read(request):
+    """Mark the given ``ids`` as read, or every unread notification with ``all``."""
+    qs = Notification.objects.filter(recipient=request.user, read_at__isnull=True)
+    ids = request.data.get("ids")
+    if ids is not None:
+        if not isinstance(ids, list):
+            return Response({"error": "ids must be a list."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [uuid.UUID(str(pk)) for pk in ids]
+        except ValueError:
+            return Response({"error": "Invalid notification id."}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(id__in=ids)
+    elif not request.data.get("all"):
+        return Response({"error": "Provide ids or all."}, status=status.HTTP_400_BAD_REQUEST)
+    marked = qs.update(read_at=timezone.now())
+    return Response({"marked": marked})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def unread_count(request):
+    count = Notification.objects.filter(recipient=request.user, read_at__isnull=True).count()
+    return Response({"unread": count})
@@ -18,7 +18,7 @@ class RepairShopAdmin(admin.ModelAdmin):
 
 @admin.register(Appointment)
 class AppointmentAdmin(admin.ModelAdmin):
-    list_display = ("shop", "customer", "service", "scheduled_at", "status", "created_at")
+    list_display = ("shop", "customer", "service", "scheduled_at", "status", "reminder_sent_at", "created_at")
     list_filter = ("status",)
     search_fields = ("shop__name", "customer__email")
 
@@ -0,0 +1,129 @@
+"""
+Free appointment slots for repair shops.
+
+A shop's bookable slots are its opening_hours ({"mon": "9:00–18:00", ...},
+read in the project time zone) cut into APPOINTMENT_SLOT_MINUTES slots. A
+day's free slots are that grid minus the merged intervals of its
+non-cancelled appointments, found with one query and a linear sweep.
+
+Free slots are cached per shop-day. Keys include the shop's updated_at, so
+editing the opening hours starts from fresh entries; bookings and status
+changes drop the day they touch. The appointments_no_overlap exclusion
+constraint is what actually prevents double booking; the cache only decides
+what is offered.
+"""
+import re
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Appointment
+
+CACHE_TTL = 600  # seconds
+MAX_DAYS = 31
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_RANGE = re.compile(r"(\d{1,2})(?:[:.](\d{2}))?\s*[-–—]\s*(\d{1,2})(?:[:.](\d{2}))?")
+
+
+def slot_length():
+    return timedelta(minutes=settings.APPOINTMENT_SLOT_MINUTES)
+
+
+def parse_hours(text):
+    """'9:00–12:30, 14:00-18:00' -> [(540, 750), (840, 1080)] in minutes; anything else (e.g. 'Closed') -> []."""
+    ranges = []
+    for h1, m1, h2, m2 in _RANGE.findall(text or ""):
+        start, end = int(h1) * 60 + int(m1 or 0), int(h2) * 60 + int(m2 or 0)
+        if end == 0:
+            end = 24 * 60
+        if 0 <= start < end <= 24 * 60:
+            ranges.append((start, end))
+    return sorted(ranges)
+
+
+def has_hours(shop):
+    return any(parse_hours(shop.opening_hours.get(day, "")) for day in WEEKDAYS)
+
+
+def _grid(shop, day):
+    """Slot start times for ``day`` as epoch seconds, ascending."""
+    tz = timezone.get_default_timezone()
+    step = settings.APPOINTMENT_SLOT_MINUTES
+    starts = []
+    for start, end in parse_hours(shop.opening_hours.get(WEEKDAYS[day.weekday()], "")):
+        for minute in range(start, end - step + 1, step):
+            at = datetime.combine(day, time(minute // 60, minute % 60), tzinfo=tz)
+            starts.append(int(at.timestamp()))
+    return starts
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _subtract(grid, busy, step):
+    """Grid slots that overlap none of the merged, sorted ``busy`` intervals."""
+    free, i = [], 0
+    for start in grid:
+        while i < len(busy) and busy[i][1] <= start:
+            i += 1
+        if i == len(busy) or busy[i][0] >= start + step:
+            free.append(start)
+    return free
+
+
+def _key(shop, day):
+    return f"repairs:slots:{shop.pk}:{int(shop.updated_at.timestamp())}:{day.isoformat()}"
+
+
+def _day_bounds(day):
+    tz = timezone.get_default_timezone()
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    return start, datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+
+
+def free_slots(shop, first_day, last_day):
+    """{day: [slot start datetimes]} for each day from ``first_day`` to ``last_day``, past slots excluded."""
+    days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+    keys = {day: _key(shop, day) for day in days}
+    cached = cache.get_many(list(keys.values()))
+    missing = [day for day in days if keys[day] not in cached]
+
+    if missing:
+        window_start, window_end = _day_bounds(missing[0])[0], _day_bounds(missing[-1])[1]
+        step = settings.APPOINTMENT_SLOT_MINUTES * 60
+        busy = _merge(
+            (int(start.timestamp()), int(end.timestamp()))
+            for start, end in Appointment.objects.filter(
+                shop=shop, scheduled_at__lt=window_end, ends_at__gt=window_start
+            ).exclude(status=Appointment.Status.CANCELLED).order_by("scheduled_at").values_list("scheduled_at", "ends_at")
+        )
+        fresh = {keys[day]: _subtract(_grid(shop, day), busy, step) for day in missing}
+        cache.set_many(fresh, timeout=CACHE_TTL)
+        cached.update(fresh)
+
+    now = timezone.now().timestamp()
+    tz = timezone.get_default_timezone()
+    return {
+        day: [datetime.fromtimestamp(ts, tz) for ts in cached[keys[day]] if ts > now]
+        for day in days
+    }
+
+
+def is_free(shop, scheduled_at):
+    day = timezone.localtime(scheduled_at, timezone.get_default_timezone()).date()
+    return scheduled_at in free_slots(shop, day, day)[day]
+
+
+def invalidate(shop, scheduled_at):
+    day = timezone.localtime(scheduled_at, timezone.get_default_timezone()).date()
+    cache.delete(_key(shop, day))
@@ -0,0 +1,105 @@
+"""
+iCalendar (RFC 5545) feed of a repair shop's appointments.
+
+Calendar clients poll the feed URL, which carries the shop's secret
+calendar_token instead of a login. The ETag is built from one aggregate over
+the feed window, so an unchanged calendar answers 304 without reading any
+appointment rows; otherwise events are streamed straight from a server-side
+cursor.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Appointment
+
+PAST_DAYS = 30
+FUTURE_DAYS = 365
+PRODID = "-//TimeTrader//Repair appointments//EN"
+
+STATUS = {
+    Appointment.Status.PENDING: "TENTATIVE",
+    Appointment.Status.CONFIRMED: "CONFIRMED",
+    Appointment.Status.COMPLETED: "CONFIRMED",
+    Appointment.Status.CANCELLED: "CANCELLED",
+}
+
+
+def window_queryset(shop):
+    now = timezone.now()
+    return Appointment.objects.filter(
+        shop=shop,
+        scheduled_at__gte=now - timedelta(days=PAST_DAYS),
+        scheduled_at__lt=now + timedelta(days=FUTURE_DAYS),
+    )
+
+
+def etag(shop):
+    """Changes whenever an appointment in the window is added, edited, removed or the window moves a day."""
+    stats = window_queryset(shop).aggregate(count=Count("id"), changed=Max("updated_at"))
+    changed = stats["changed"].isoformat() if stats["changed"] else ""
+    raw = f"{shop.pk}:{timezone.localdate()}:{stats['count']}:{changed}:{shop.name}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _escape(text):
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Split content lines longer than 75 octets, continuing with a leading space."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1  # don't split a UTF-8 sequence
+        parts.append(data[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event(appt, now):
+    summary = appt.service.name if appt.service else "Appointment"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{appt.id}@timetrader",
+        f"DTSTAMP:{now}",
+        f"DTSTART:{_stamp(appt.scheduled_at)}",
+        f"DTEND:{_stamp(appt.ends_at)}",
+        f"SUMMARY:{_escape(f'{summary} — {appt.customer.full_name}')}",
+        f"STATUS:{STATUS.get(appt.status, 'TENTATIVE')}",
+        f"LAST-MODIFIED:{_stamp(appt.updated_at)}",
+    ]
+    if appt.notes:
+        lines.append(f"DESCRIPTION:{_escape(appt.notes)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def stream(shop):
+    """Yield the feed for ``shop`` piece by piece."""
+    now = _stamp(timezone.now())
+    yield "".join(_fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(shop.name)} appointments",
+    ))
+    qs = window_queryset(shop).select_related("customer", "service").order_by("scheduled_at")
+    for appt in qs.iterator(chunk_size=500):
+        yield _event(appt, now)
+    yield "END:VCALENDAR\r\n"
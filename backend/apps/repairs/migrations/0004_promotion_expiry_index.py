@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repairs', '0003_add_repair_promotion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='repairpromotion',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['expires_at'], name='repair_promo_expiring_idx'),
+        ),
+    ]
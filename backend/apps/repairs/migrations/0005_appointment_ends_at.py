@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repairs', '0004_promotion_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='ends_at',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
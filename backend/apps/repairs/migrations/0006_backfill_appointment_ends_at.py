@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:21
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_ends_at(apps, schema_editor):
+    """
+    Give every appointment a slot-long end. Live appointments that already
+    overlap an earlier one at the same shop get an empty range instead, so the
+    exclusion constraint can be added without cancelling anyone's booking.
+    """
+    Appointment = apps.get_model("repairs", "Appointment")
+    slot = timedelta(minutes=settings.APPOINTMENT_SLOT_MINUTES)
+    batch = []
+    shop_id, busy_until = None, None
+    for appt in Appointment.objects.order_by("shop_id", "scheduled_at", "created_at").iterator(chunk_size=2000):
+        if appt.shop_id != shop_id:
+            shop_id, busy_until = appt.shop_id, None
+        if appt.status == "cancelled":
+            appt.ends_at = appt.scheduled_at + slot
+        elif busy_until is not None and appt.scheduled_at < busy_until:
+            appt.ends_at = appt.scheduled_at
+        else:
+            appt.ends_at = busy_until = appt.scheduled_at + slot
+        batch.append(appt)
+        if len(batch) >= 2000:
+            Appointment.objects.bulk_update(batch, ["ends_at"])
+            batch = []
+    Appointment.objects.bulk_update(batch, ["ends_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repairs', '0005_appointment_ends_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+    ]
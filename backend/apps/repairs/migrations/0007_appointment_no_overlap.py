@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:22
+
+import apps.repairs.models
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repairs', '0006_backfill_appointment_ends_at'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AlterField(
+            model_name='appointment',
+            name='ends_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status', 'cancelled'), _negated=True), expressions=[('shop', '='), (apps.repairs.models.TsTzRange('scheduled_at', 'ends_at'), '&&')], name='appointments_no_overlap'),
+        ),
+    ]
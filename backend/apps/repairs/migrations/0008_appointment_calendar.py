@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:20
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # appointments is live; build its index without locking out writes.
+    atomic = False
+
+    dependencies = [
+        ('repairs', '0007_appointment_no_overlap'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='repairshop',
+            name='calendar_token',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        AddIndexConcurrently(
+            model_name='appointment',
+            index=models.Index(fields=['shop', 'scheduled_at'], name='appointments_shop_sched_idx'),
+        ),
+    ]
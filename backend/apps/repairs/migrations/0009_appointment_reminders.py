@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:05
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # appointments is live; build its index without locking out writes.
+    atomic = False
+
+    dependencies = [
+        ('repairs', '0008_appointment_calendar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='appointment',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status', 'confirmed')), fields=['scheduled_at'], name='appointments_remind_due_idx'),
+        ),
+    ]
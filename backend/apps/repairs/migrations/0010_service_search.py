@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:50
+
+import apps.repairs.models
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Both tables are live; build the indexes without locking out writes.
+    atomic = False
+
+    dependencies = [
+        ('repairs', '0009_appointment_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='repairservice',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', 'description', config='english'), name='repair_services_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='repairservice',
+            index=django.contrib.postgres.indexes.GistIndex(apps.repairs.models.NumRange(django.db.models.functions.comparison.Least('price_from', 'price_to'), django.db.models.functions.comparison.Greatest('price_from', 'price_to'), models.Value('[]')), name='repair_services_price_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='repairshop',
+            index=models.Index(django.db.models.functions.text.Lower('city'), name='repair_shops_city_lower_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='repairshop',
+            index=models.Index(django.db.models.functions.text.Lower('country'), name='repair_shops_country_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:40
+
+import apps.images.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repairs', '0010_service_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='repairshowcase',
+            name='after_image',
+            field=models.ImageField(blank=True, null=True, storage=apps.images.storage.content_storage, upload_to='repairs/showcase/'),
+        ),
+        migrations.AlterField(
+            model_name='repairshowcase',
+            name='before_image',
+            field=models.ImageField(storage=apps.images.storage.content_storage, upload_to='repairs/showcase/'),
+        ),
+    ]
@@ -1,9 +1,18 @@
+import secrets
 import uuid
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, DecimalRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models.functions import Greatest, Least, Lower
 from django.conf import settings
 from django.utils import timezone
+from datetime import timedelta
 from django.utils.text import slugify
 
+from apps.images.storage import content_storage
+
 
 REPAIR_PROMOTION_PLANS = {
     "1m": {"label": "1 Month",  "days": 30,  "price": "10"},
@@ -31,12 +40,18 @@ class RepairShop(models.Model):
     opening_hours = models.JSONField(default=dict, blank=True)
     is_featured = models.BooleanField(default=False)
     is_verified = models.BooleanField(default=False)
+    # Secret for the owner's appointments iCalendar feed; issued on first request, rotatable.
+    calendar_token = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "repair_shops"
         ordering = ["-is_featured", "-created_at"]
+        indexes = [
+            models.Index(Lower("city"), name="repair_shops_city_lower_idx"),
+            models.Index(Lower("country"), name="repair_shops_country_lower_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -52,6 +67,11 @@ class RepairShop(models.Model):
     def __str__(self):
         return self.name
 
+    def rotate_calendar_token(self):
+        self.calendar_token = secrets.token_urlsafe(32)
+        self.save(update_fields=["calendar_token"])
+        return self.calendar_token
+
     @property
     def average_rating(self):
         agg = self.reviews.aggregate(models.Avg("rating"))
@@ -62,6 +82,25 @@ class RepairShop(models.Model):
         return self.reviews.count()
 
 
+class NumRange(models.Func):
+    function = "NUMRANGE"
+    output_field = DecimalRangeField()
+
+
+# Service search (apps/repairs/search.py) filters on exactly these expressions so
+# the planner can use the indexes declared on RepairService.
+SERVICE_SEARCH_CONFIG = "english"
+
+
+def service_search_vector():
+    return SearchVector("name", "description", config=SERVICE_SEARCH_CONFIG)
+
+
+def service_price_range():
+    """[price_from, price_to] with either bound standing in for a missing one; LEAST/GREATEST skip NULLs."""
+    return NumRange(Least("price_from", "price_to"), Greatest("price_from", "price_to"), models.Value("[]"))
+
+
 class RepairService(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     shop = models.ForeignKey(RepairShop, on_delete=models.CASCADE, related_name="services")
@@ -75,11 +114,20 @@ class RepairService(models.Model):
     class Meta:
         db_table = "repair_services"
         ordering = ["name"]
+        indexes = [
+            GinIndex(service_search_vector(), name="repair_services_search_idx"),
+            GistIndex(service_price_range(), name="repair_services_price_idx"),
+        ]
 
     def __str__(self):
         return f"{self.shop.name} — {self.name}"
 
 
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
 class Appointment(models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", "Pending"
@@ -94,26 +142,54 @@ class Appointment(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="appointments"
     )
     scheduled_at = models.DateTimeField()
+    # End of the booked slot; set from APPOINTMENT_SLOT_MINUTES when the appointment is created.
+    ends_at = models.DateTimeField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     notes = models.TextField(blank=True)
+    # Set when the reminder is queued (apps/repairs/reminders.py); never cleared, so it goes out once.
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "appointments"
         ordering = ["-scheduled_at"]
+        indexes = [
+            models.Index(fields=["shop", "scheduled_at"], name="appointments_shop_sched_idx"),
+            models.Index(
+                fields=["scheduled_at"],
+                condition=models.Q(status="confirmed", reminder_sent_at__isnull=True),
+                name="appointments_remind_due_idx",
+            ),
+        ]
+        constraints = [
+            # Two live appointments at one shop can never overlap, however the rows are written.
+            ExclusionConstraint(
+                name="appointments_no_overlap",
+                expressions=[
+                    ("shop", RangeOperators.EQUAL),
+                    (TsTzRange("scheduled_at", "ends_at"), RangeOperators.OVERLAPS),
+                ],
+                condition=~models.Q(status="cancelled"),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.customer} @ {self.shop.name} — {self.scheduled_at:%Y-%m-%d}"
 
+    def save(self, *args, **kwargs):
+        if self.ends_at is None and self.scheduled_at is not None:
+            self.ends_at = self.scheduled_at + timedelta(minutes=settings.APPOINTMENT_SLOT_MINUTES)
+        super().save(*args, **kwargs)
+
 
 class RepairShowcase(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     shop = models.ForeignKey(RepairShop, on_delete=models.CASCADE, related_name="showcase_items")
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    before_image = models.ImageField(upload_to="repairs/showcase/")
-    after_image = models.ImageField(upload_to="repairs/showcase/", null=True, blank=True)
+    before_image = models.ImageField(upload_to="repairs/showcase/", storage=content_storage)
+    after_image = models.ImageField(upload_to="repairs/showcase/", storage=content_storage, null=True, blank=True)
     watch_brand = models.CharField(max_length=100, blank=True)
     watch_model = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -141,6 +217,13 @@ class RepairPromotion(models.Model):
 
     class Meta:
         db_table = "repair_promotions"
+        indexes = [
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(is_active=True),
+                name="repair_promo_expiring_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.shop} — {self.plan}"
@@ -149,6 +232,18 @@ class RepairPromotion(models.Model):
     def is_expired(self):
         return timezone.now() > self.expires_at
 
+    @classmethod
+    def activate(cls, shop, plan):
+        """Start or renew a paid ``plan`` on ``shop`` and mark it featured. Returns (promotion, created)."""
+        expires_at = timezone.now() + timedelta(days=REPAIR_PROMOTION_PLANS[plan]["days"])
+        promo, created = cls.objects.update_or_create(
+            shop=shop,
+            defaults={"plan": plan, "expires_at": expires_at, "is_active": True},
+        )
+        shop.is_featured = True
+        shop.save(update_fields=["is_featured"])
+        return promo, created
+
 
 class RepairReview(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
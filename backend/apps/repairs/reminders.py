@@ -0,0 +1,82 @@
+"""
+Reminders for confirmed repair appointments (PostgreSQL).
+
+A beat task claims, per batch and in one statement, the confirmed
+appointments that have entered the reminder window (starting within
+APPOINTMENT_REMINDER_LEAD) and have no reminder yet: it stamps
+reminder_sent_at and returns what the reminder needs. The rows are found
+through the partial appointments_remind_due_idx index, which only holds
+confirmed appointments still waiting for a reminder.
+
+Each batch becomes a single Celery message once the claim commits, so the
+broker sees a handful of messages per tick rather than one scheduled task per
+appointment. Stamping before enqueueing makes delivery at most once: a
+restart or an overlapping tick can never send the same reminder twice.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Appointment, RepairShop
+
+logger = logging.getLogger(__name__)
+
+
+def _claim_sql():
+    appointments, shops = Appointment._meta.db_table, RepairShop._meta.db_table
+    return f"""
+        WITH due AS (
+            SELECT id FROM {appointments}
+            WHERE status = %s AND reminder_sent_at IS NULL
+              AND scheduled_at > %s AND scheduled_at <= %s
+            ORDER BY scheduled_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ), claimed AS (
+            UPDATE {appointments} AS a SET reminder_sent_at = %s
+            FROM due WHERE a.id = due.id
+            RETURNING a.id, a.customer_id, a.shop_id, a.scheduled_at
+        )
+        SELECT claimed.id, claimed.customer_id, s.name, s.slug, claimed.scheduled_at
+        FROM claimed JOIN {shops} AS s ON s.id = claimed.shop_id
+    """
+
+
+def claim_batch(now=None, batch_size=None):
+    """Mark one batch of due reminders as sent and queue their delivery. Returns the number claimed."""
+    from .tasks import deliver_reminders
+
+    now = now or timezone.now()
+    lead = timedelta(minutes=settings.APPOINTMENT_REMINDER_LEAD_MINUTES)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_claim_sql(), [
+                Appointment.Status.CONFIRMED, now, now + lead,
+                batch_size or settings.APPOINTMENT_REMINDER_BATCH_SIZE, now,
+            ])
+            rows = cursor.fetchall()
+        reminders = [
+            [str(appt_id), str(customer_id), shop_name, shop_slug, scheduled_at.isoformat()]
+            for appt_id, customer_id, shop_name, shop_slug, scheduled_at in rows
+        ]
+        if reminders:
+            transaction.on_commit(lambda: deliver_reminders.delay(reminders))
+    return len(rows)
+
+
+def claim_due(now=None, batch_size=None):
+    """Claim every due reminder batch by batch. Returns the number claimed."""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.APPOINTMENT_REMINDER_BATCH_SIZE
+    claimed = 0
+    while True:
+        count = claim_batch(now, batch_size)
+        claimed += count
+        if count < batch_size:
+            break
+    if claimed:
+        logger.info("Queued %d appointment reminders", claimed)
+    return claimed
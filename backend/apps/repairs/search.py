@@ -0,0 +1,95 @@
+"""
+Repair service search across shops (PostgreSQL).
+
+Services match on full-text search over name and description
+(repair_services_search_idx), on overlap between their price span and the
+requested one (repair_services_price_idx, a GiST index over
+service_price_range()), and on the shop's city/country compared
+case-insensitively (repair_shops_*_lower_idx). Results are shop cards, each
+carrying its best-matching services, produced by one statement: matched
+services, rating and counts are correlated subqueries on the shop rows.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.db.models import Avg, CharField, Count, Exists, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Cast, Coalesce, JSONObject, Least, Lower
+
+from .models import RepairReview, RepairService, RepairShop, SERVICE_SEARCH_CONFIG, service_price_range, service_search_vector
+
+MATCHES_PER_SHOP = 5
+
+
+def parse_price(value):
+    """'49.90' -> Decimal; '' -> None; raises ValueError on anything else."""
+    if not value:
+        return None
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(value)
+    if not price.is_finite() or price < 0:
+        raise ValueError(value)
+    return price
+
+
+def matching_services(text="", min_price=None, max_price=None):
+    qs = RepairService.objects.all()
+    if text:
+        query = SearchQuery(text, search_type="websearch", config=SERVICE_SEARCH_CONFIG)
+        qs = qs.annotate(search=service_search_vector()).filter(search=query).annotate(
+            rank=SearchRank(service_search_vector(), query)
+        )
+    if min_price is not None or max_price is not None:
+        qs = qs.annotate(price_range=service_price_range()).filter(
+            Q(price_from__isnull=False) | Q(price_to__isnull=False),
+            price_range__overlap=NumericRange(min_price, max_price, "[]"),
+        )
+    return qs
+
+
+def search_shops(text="", min_price=None, max_price=None, city="", country=""):
+    """Shops with at least one matching service, best match first, each with ``matched_services``."""
+    services = matching_services(text, min_price, max_price)
+    in_shop = services.filter(shop=OuterRef("pk"))
+    match_order = ("-rank", "price_from", "name") if text else ("price_from", "name")
+
+    qs = RepairShop.objects.filter(Exists(in_shop))
+    if city:
+        qs = qs.alias(city_lower=Lower("city")).filter(city_lower=city.strip().lower())
+    if country:
+        qs = qs.alias(country_lower=Lower("country")).filter(country_lower=country.strip().lower())
+
+    qs = qs.annotate(
+        matched_services=ArraySubquery(
+            in_shop.order_by(*match_order).values(json=JSONObject(
+                id=Cast("id", CharField()),
+                name="name",
+                description="description",
+                price_from=Cast("price_from", CharField()),
+                price_to=Cast("price_to", CharField()),
+                duration_days="duration_days",
+            ))[:MATCHES_PER_SHOP]
+        ),
+        lowest_price=Subquery(
+            in_shop.order_by().values("shop").annotate(low=Min(Least("price_from", "price_to"))).values("low")
+        ),
+        rating_avg=Coalesce(
+            Subquery(RepairReview.objects.filter(shop=OuterRef("pk")).order_by().values("shop").annotate(avg=Avg("rating")).values("avg")),
+            0.0,
+        ),
+        reviews_total=Coalesce(
+            Subquery(RepairReview.objects.filter(shop=OuterRef("pk")).order_by().values("shop").annotate(n=Count("id")).values("n")),
+            0,
+        ),
+        services_total=Coalesce(
+            Subquery(RepairService.objects.filter(shop=OuterRef("pk")).order_by().values("shop").annotate(n=Count("id")).values("n")),
+            0,
+        ),
+    )
+    if text:
+        qs = qs.annotate(best_rank=Subquery(in_shop.order_by("-rank").values("rank")[:1]))
+        return qs.order_by("-best_rank", "-is_featured", "lowest_price", "name")
+    return qs.order_by("-is_featured", "lowest_price", "name")
@@ -1,4 +1,6 @@
+from django.utils import timezone
 from rest_framework import serializers
+from . import availability
 from .models import RepairShop, RepairService, Appointment, RepairReview, RepairShowcase, RepairPromotion, REPAIR_PROMOTION_PLANS
 from apps.users.serializers import UserPublicSerializer
 
@@ -53,6 +55,20 @@ class RepairShopCardSerializer(serializers.ModelSerializer):
         return obj.services.count()
 
 
+class RepairShopSearchSerializer(RepairShopCardSerializer):
+    """Shop card from apps.repairs.search.search_shops(); ratings and counts come from its annotations."""
+    average_rating = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(source="reviews_total", read_only=True)
+    service_count = serializers.IntegerField(source="services_total", read_only=True)
+    matched_services = serializers.ListField(read_only=True)
+
+    class Meta(RepairShopCardSerializer.Meta):
+        fields = RepairShopCardSerializer.Meta.fields + ("matched_services",)
+
+    def get_average_rating(self, obj):
+        return round(obj.rating_avg, 1)
+
+
 class RepairShopDetailSerializer(serializers.ModelSerializer):
     owner = UserPublicSerializer(read_only=True)
     services = RepairServiceSerializer(many=True, read_only=True)
@@ -151,3 +167,16 @@ class CreateAppointmentSerializer(serializers.ModelSerializer):
         if service and service.shop.slug != shop_slug:
             raise serializers.ValidationError("Service does not belong to this shop.")
         return service
+
+    def validate_scheduled_at(self, value):
+        if value <= timezone.now():
+            raise serializers.ValidationError("Appointments must be in the future.")
+        return value
+
+    def validate(self, attrs):
+        # Shops that publish opening hours are booked by slot; the exclusion
+        # constraint still guards every shop against overlaps.
+        shop = self.context.get("shop")
+        if shop is not None and availability.has_hours(shop) and not availability.is_free(shop, attrs["scheduled_at"]):
+            raise serializers.ValidationError({"scheduled_at": "This time is not available."})
+        return attrs
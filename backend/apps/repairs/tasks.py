@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from celery import shared_task
+
+from apps.notifications import digest
+from apps.notifications.models import Notification
+from . import reminders
+
+
+@shared_task
+def send_appointment_reminders():
+    """Queue reminders for confirmed appointments entering the reminder window."""
+    return reminders.claim_due()
+
+
+@shared_task
+def deliver_reminders(batch):
+    """Write one reminder notification per [appointment, customer, shop name, shop slug, scheduled_at] entry."""
+    Notification.objects.bulk_create([
+        Notification(
+            recipient_id=customer_id,
+            kind=Notification.Kind.APPOINTMENT,
+            title=f"Reminder: your appointment at {shop_name}",
+            body=f"Scheduled for {datetime.fromisoformat(scheduled_at):%Y-%m-%d %H:%M} UTC.",
+            link=f"/repairs/{shop_slug}",
+            data={"appointment_id": appt_id, "reminder": True},
+        )
+        for appt_id, customer_id, shop_name, shop_slug, scheduled_at in batch
+    ])
+    digest.schedule({customer_id for _, customer_id, *_ in batch})
+    return len(batch)
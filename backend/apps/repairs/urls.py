@@ -4,11 +4,16 @@ from . import views
 urlpatterns = [
     path("mine/", views.my_repair_shop, name="my-repair-shop"),
     path("mine/logo/", views.upload_repair_logo, name="upload-repair-logo"),
+    path("mine/calendar/", views.my_repair_calendar, name="my-repair-calendar"),
+    path("calendar/<slug:token>.ics", views.appointment_calendar, name="repair-appointment-calendar"),
+    path("featured/", views.featured_repair_shops, name="repair-shops-featured"),
+    path("services/search/", views.search_repair_services, name="repair-services-search"),
     path("", views.repair_shops, name="repair-shops"),
     path("<slug:slug>/", views.repair_shop_detail, name="repair-shop-detail"),
     path("<slug:slug>/services/", views.repair_services, name="repair-services"),
     path("<slug:slug>/services/<uuid:service_id>/", views.repair_service_detail, name="repair-service-detail"),
     path("<slug:slug>/appointments/", views.appointments, name="repair-appointments"),
+    path("<slug:slug>/appointments/availability/", views.appointment_availability, name="repair-appointment-availability"),
     path("<slug:slug>/appointments/<uuid:appt_id>/", views.appointment_detail, name="repair-appointment-detail"),
     path("<slug:slug>/showcase/", views.repair_showcase, name="repair-showcase"),
     path("<slug:slug>/showcase/<uuid:item_id>/", views.repair_showcase_detail, name="repair-showcase-detail"),
@@ -1,17 +1,31 @@
+import uuid
+from datetime import date, datetime, time, timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import condition, require_GET
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Q
-from django.utils import timezone
-from datetime import timedelta
 
+from . import availability, calendar, search
 from .models import RepairShop, RepairService, Appointment, RepairReview, RepairShowcase, RepairPromotion, REPAIR_PROMOTION_PLANS
-from config.paypal_utils import create_order as paypal_create_order, capture_order as paypal_capture_order
+from config.paypal_utils import create_order as paypal_create_order
+from apps.analytics import events
+from apps.transactions import featured, payments
+from apps.transactions.models import PromotionPayment
+from apps.transactions.serializers import PromotionPaymentSerializer
 from .serializers import (
-    RepairShopCardSerializer, RepairShopDetailSerializer,
+    RepairShopCardSerializer, RepairShopDetailSerializer, RepairShopSearchSerializer,
     CreateUpdateRepairShopSerializer, RepairServiceSerializer,
     AppointmentSerializer, CreateAppointmentSerializer,
     RepairReviewSerializer, CreateRepairReviewSerializer,
@@ -20,6 +34,8 @@ from .serializers import (
 )
 from apps.users.models import User
 from apps.users.permissions import IsOwnerOrAdmin
+from apps.notifications.dispatch import notify
+from apps.notifications.models import Notification
 
 
 class RepairPagination(PageNumberPagination):
@@ -27,6 +43,34 @@ class RepairPagination(PageNumberPagination):
     page_size_query_param = "page_size"
 
 
+class AppointmentPagination(CursorPagination):
+    """Keyset pagination over (shop, scheduled_at); newest first unless ?order=asc."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-scheduled_at"
+
+
+def _window_bound(value, end=False):
+    """
+    Parse a ``from``/``to`` query value. A bare date covers that whole day, so
+    ``to=2026-10-31`` ends at midnight after the 31st.
+    """
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        if end:
+            day += timedelta(days=1)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
 @api_view(["GET", "POST"])
 @permission_classes([AllowAny])
 def repair_shops(request):
@@ -43,6 +87,7 @@ def repair_shops(request):
             qs = qs.filter(is_featured=True)
         paginator = RepairPagination()
         page = paginator.paginate_queryset(qs, request)
+        events.record(events.IMPRESSION, featured.REPAIR_SHOP, [obj.pk for obj in page if obj.is_featured])
         return paginator.get_paginated_response(
             RepairShopCardSerializer(page, many=True, context={"request": request}).data
         )
@@ -60,6 +105,14 @@ def repair_shops(request):
     return Response(RepairShopDetailSerializer(shop, context={"request": request}).data, status=status.HTTP_201_CREATED)
 
 
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def featured_repair_shops(request):
+    """Homepage carousel of promoted repair shops, served from Redis."""
+    return featured.carousel_response(featured.REPAIR_SHOP, request)
+
+
 @api_view(["GET", "PATCH", "DELETE"])
 @permission_classes([AllowAny])
 def repair_shop_detail(request, slug):
@@ -69,6 +122,8 @@ def repair_shop_detail(request, slug):
         return Response({"error": "Repair shop not found."}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
+        if shop.is_featured:
+            events.record(events.CLICK, featured.REPAIR_SHOP, [shop.pk])
         return Response(RepairShopDetailSerializer(shop, context={"request": request}).data)
 
     if not request.user.is_authenticated:
@@ -87,6 +142,39 @@ def repair_shop_detail(request, slug):
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def search_repair_services(request):
+    """
+    GET — shops offering a matching service, e.g.
+    ``?q=battery replacement&max_price=50&city=Rome``. ``q`` is full-text
+    (websearch syntax), the price bounds keep services whose price span
+    overlaps them, city/country match exactly ignoring case. Each card lists
+    up to five matched services.
+    """
+    text = request.GET.get("q", "").strip()
+    try:
+        min_price = search.parse_price(request.GET.get("min_price"))
+        max_price = search.parse_price(request.GET.get("max_price"))
+    except ValueError:
+        return Response({"error": "min_price and max_price must be non-negative numbers."}, status=status.HTTP_400_BAD_REQUEST)
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return Response({"error": "min_price must not exceed max_price."}, status=status.HTTP_400_BAD_REQUEST)
+    if not (text or min_price is not None or max_price is not None):
+        return Response({"error": "Give a search term or a price range."}, status=status.HTTP_400_BAD_REQUEST)
+
+    qs = search.search_shops(
+        text, min_price, max_price,
+        city=request.GET.get("city", ""), country=request.GET.get("country", ""),
+    )
+    paginator = RepairPagination()
+    page = paginator.paginate_queryset(qs, request)
+    events.record(events.IMPRESSION, featured.REPAIR_SHOP, [obj.pk for obj in page if obj.is_featured])
+    return paginator.get_paginated_response(
+        RepairShopSearchSerializer(page, many=True, context={"request": request}).data
+    )
+
+
 @api_view(["GET", "POST"])
 @permission_classes([AllowAny])
 def repair_services(request, slug):
@@ -142,17 +230,92 @@ def appointments(request, slug):
             qs = shop.appointments.select_related("customer", "service").all()
         else:
             qs = shop.appointments.filter(customer=request.user).select_related("service")
-        paginator = RepairPagination()
+        try:
+            start = _window_bound(request.GET.get("from"))
+            end = _window_bound(request.GET.get("to"), end=True)
+        except ValueError:
+            return Response({"error": "from and to must be dates or ISO 8601 datetimes."}, status=status.HTTP_400_BAD_REQUEST)
+        if start:
+            qs = qs.filter(scheduled_at__gte=start)
+        if end:
+            qs = qs.filter(scheduled_at__lt=end)
+        if request.GET.get("status"):
+            qs = qs.filter(status=request.GET["status"])
+        paginator = AppointmentPagination()
+        if request.GET.get("order") == "asc":
+            paginator.ordering = "scheduled_at"
         page = paginator.paginate_queryset(qs, request)
         return paginator.get_paginated_response(AppointmentSerializer(page, many=True).data)
 
     # POST — book appointment
-    serializer = CreateAppointmentSerializer(data=request.data, context={"shop_slug": slug})
+    serializer = CreateAppointmentSerializer(data=request.data, context={"shop_slug": slug, "shop": shop})
     serializer.is_valid(raise_exception=True)
-    appt = serializer.save(shop=shop, customer=request.user)
+    try:
+        with transaction.atomic():
+            appt = serializer.save(shop=shop, customer=request.user)
+    except IntegrityError:
+        # Lost the race for this slot to a concurrent booking (appointments_no_overlap).
+        availability.invalidate(shop, serializer.validated_data["scheduled_at"])
+        return Response({"error": "This time was just booked. Please pick another slot."}, status=status.HTTP_409_CONFLICT)
+    availability.invalidate(shop, appt.scheduled_at)
     return Response(AppointmentSerializer(appt).data, status=status.HTTP_201_CREATED)
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def appointment_availability(request, slug):
+    """
+    GET — free appointment slots per day, ``?start=YYYY-MM-DD&end=YYYY-MM-DD``
+    (default: the next 7 days, at most 31). With ``?service=<id>`` each day
+    also carries the service's expected ready date.
+    """
+    try:
+        shop = RepairShop.objects.get(slug=slug)
+    except RepairShop.DoesNotExist:
+        return Response({"error": "Repair shop not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    today = timezone.localdate()
+    try:
+        start = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else today
+        end = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else start + timedelta(days=6)
+    except ValueError:
+        return Response({"error": "start and end must be dates (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+    start = max(start, today)
+    if end < start:
+        return Response({"error": "end must not be before start."}, status=status.HTTP_400_BAD_REQUEST)
+    if (end - start).days >= availability.MAX_DAYS:
+        return Response({"error": f"At most {availability.MAX_DAYS} days at a time."}, status=status.HTTP_400_BAD_REQUEST)
+
+    duration_days = None
+    if request.GET.get("service"):
+        service = shop.services.filter(id=request.GET["service"]).first() if _is_uuid(request.GET["service"]) else None
+        if service is None:
+            return Response({"error": "Service not found."}, status=status.HTTP_404_NOT_FOUND)
+        duration_days = service.duration_days
+
+    slots = availability.free_slots(shop, start, end)
+    return Response({
+        "slot_minutes": settings.APPOINTMENT_SLOT_MINUTES,
+        "time_zone": settings.TIME_ZONE,
+        "days": [
+            {
+                "date": day,
+                "slots": times,
+                "ready_by": day + timedelta(days=duration_days) if duration_days is not None else None,
+            }
+            for day, times in slots.items()
+        ],
+    })
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def appointment_detail(request, slug, appt_id):
@@ -165,8 +328,24 @@ def appointment_detail(request, slug, appt_id):
     new_status = request.data.get("status")
     if new_status not in [c[0] for c in Appointment.Status.choices]:
         return Response({"error": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
+    changed = appt.status != new_status
     appt.status = new_status
-    appt.save(update_fields=["status"])
+    try:
+        with transaction.atomic():
+            appt.save(update_fields=["status", "updated_at"])
+    except IntegrityError:
+        # Re-opening a cancelled appointment whose slot has since been taken.
+        return Response({"error": "This time has been booked by someone else."}, status=status.HTTP_409_CONFLICT)
+    if changed:
+        availability.invalidate(shop, appt.scheduled_at)
+        notify(
+            [appt.customer_id],
+            Notification.Kind.APPOINTMENT,
+            f"Your appointment at {shop.name} is {appt.get_status_display().lower()}",
+            body=f"Scheduled for {appt.scheduled_at:%Y-%m-%d %H:%M} UTC.",
+            link=f"/repairs/{shop.slug}",
+            data={"appointment_id": str(appt.id), "status": new_status},
+        )
     return Response(AppointmentSerializer(appt).data)
 
 
@@ -196,6 +375,41 @@ def upload_repair_logo(request):
     return Response(RepairShopDetailSerializer(shop, context={"request": request}).data)
 
 
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def my_repair_calendar(request):
+    """
+    GET  — URL of the shop's appointments iCalendar feed, issued on first use.
+    POST — replace the feed URL; the old one stops working.
+    """
+    try:
+        shop = RepairShop.objects.get(owner=request.user)
+    except RepairShop.DoesNotExist:
+        return Response({"error": "No repair shop found."}, status=status.HTTP_404_NOT_FOUND)
+    token = shop.calendar_token
+    if request.method == "POST" or not token:
+        token = shop.rotate_calendar_token()
+    url = urljoin(settings.BACKEND_URL, reverse("repair-appointment-calendar", args=[token]))
+    return Response({"url": url})
+
+
+def _calendar_etag(request, token):
+    request.calendar_shop = RepairShop.objects.filter(calendar_token=token).first()
+    return calendar.etag(request.calendar_shop) if request.calendar_shop else None
+
+
+@require_GET
+@condition(etag_func=_calendar_etag)
+def appointment_calendar(request, token):
+    """Streaming iCalendar feed of a shop's appointments; polls with If-None-Match get a 304 while nothing changed."""
+    if request.calendar_shop is None:
+        raise Http404("Unknown calendar.")
+    response = StreamingHttpResponse(calendar.stream(request.calendar_shop), content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = 'inline; filename="appointments.ics"'
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @api_view(["GET", "POST"])
 @permission_classes([AllowAny])
 @parser_classes([MultiPartParser, FormParser])
@@ -255,15 +469,7 @@ def repair_promote(request, slug):
     if plan not in REPAIR_PROMOTION_PLANS:
         return Response({"error": "Invalid plan."}, status=status.HTTP_400_BAD_REQUEST)
 
-    days = REPAIR_PROMOTION_PLANS[plan]["days"]
-    expires = timezone.now() + timedelta(days=days)
-
-    promo, _ = RepairPromotion.objects.update_or_create(
-        shop=shop,
-        defaults={"plan": plan, "expires_at": expires, "is_active": True},
-    )
-    shop.is_featured = True
-    shop.save(update_fields=["is_featured"])
+    promo, _ = RepairPromotion.activate(shop, plan)
 
     return Response(RepairPromotionSerializer(promo).data, status=status.HTTP_201_CREATED)
 
@@ -304,24 +510,12 @@ def repair_promote_capture_order(request, slug):
     if not order_id or plan not in REPAIR_PROMOTION_PLANS:
         return Response({"error": "Missing order_id or invalid plan."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        capture = paypal_capture_order(order_id)
-        if capture.get("status") != "COMPLETED":
-            return Response({"error": "Payment not completed."}, status=status.HTTP_400_BAD_REQUEST)
-    except Exception:
-        return Response({"error": "Payment capture failed."}, status=status.HTTP_502_BAD_GATEWAY)
-
-    days = REPAIR_PROMOTION_PLANS[plan]["days"]
-    expires = timezone.now() + timedelta(days=days)
-
-    promo, _ = RepairPromotion.objects.update_or_create(
-        shop=shop,
-        defaults={"plan": plan, "expires_at": expires, "is_active": True},
-    )
-    shop.is_featured = True
-    shop.save(update_fields=["is_featured"])
-
-    return Response(RepairPromotionSerializer(promo).data, status=status.HTTP_200_OK)
+    # Capturing can take PayPal many seconds; a worker does it and the client
+    # polls /api/v1/orders/payments/<order_id>/ for the outcome.
+    payment = payments.start_capture(request.user, PromotionPayment.Target.REPAIR_SHOP, shop, plan, order_id)
+    if payment is None:
+        return Response({"error": "Order belongs to another promotion."}, status=status.HTTP_409_CONFLICT)
+    return Response(PromotionPaymentSerializer(payment).data, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(["GET", "POST"])
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:40
+
+import apps.images.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0004_promotion_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='storeimage',
+            name='image',
+            field=models.ImageField(storage=apps.images.storage.content_storage, upload_to='stores/images/'),
+        ),
+    ]
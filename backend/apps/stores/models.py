@@ -2,8 +2,11 @@ import uuid
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from datetime import timedelta
 from django.utils.text import slugify
 
+from apps.images.storage import content_storage
+
 
 STORE_PROMOTION_PLANS = {
     "spotlight": {"label": "1 Month",  "days": 30,  "price": "20"},
@@ -66,7 +69,7 @@ class Store(models.Model):
 class StoreImage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name="images")
-    image = models.ImageField(upload_to="stores/images/")
+    image = models.ImageField(upload_to="stores/images/", storage=content_storage)
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -90,6 +93,13 @@ class StorePromotion(models.Model):
 
     class Meta:
         db_table = "store_promotions"
+        indexes = [
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(is_active=True),
+                name="store_promo_expiring_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.store} — {self.plan}"
@@ -98,6 +108,18 @@ class StorePromotion(models.Model):
     def is_expired(self):
         return timezone.now() > self.expires_at
 
+    @classmethod
+    def activate(cls, store, plan):
+        """Start or renew a paid ``plan`` on ``store`` and mark it featured. Returns (promotion, created)."""
+        expires_at = timezone.now() + timedelta(days=STORE_PROMOTION_PLANS[plan]["days"])
+        promo, created = cls.objects.update_or_create(
+            store=store,
+            defaults={"plan": plan, "expires_at": expires_at, "is_active": True},
+        )
+        store.is_featured = True
+        store.save(update_fields=["is_featured"])
+        return promo, created
+
 
 class Review(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
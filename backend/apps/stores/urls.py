@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path("", views.stores, name="stores"),
+    path("featured/", views.featured_stores, name="stores-featured"),
     path("mine/", views.my_store, name="my-store"),
     path("<slug:slug>/", views.store_detail, name="store-detail"),
     path("<slug:slug>/logo/", views.upload_store_logo, name="store-logo"),
@@ -1,16 +1,18 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Q
 
-from django.utils import timezone
-from datetime import timedelta
 
 from .models import Store, StoreImage, StorePromotion, Review, STORE_PROMOTION_PLANS
-from config.paypal_utils import create_order as paypal_create_order, capture_order as paypal_capture_order
+from config.paypal_utils import create_order as paypal_create_order
+from apps.analytics import events
+from apps.transactions import featured, payments
+from apps.transactions.models import PromotionPayment
+from apps.transactions.serializers import PromotionPaymentSerializer
 from .serializers import (
     StoreCardSerializer, StoreDetailSerializer, StorePromotionSerializer,
     CreateUpdateStoreSerializer, ReviewSerializer, CreateReviewSerializer,
@@ -44,6 +46,7 @@ def stores(request):
             qs = qs.filter(is_featured=True)
         paginator = StorePagination()
         page = paginator.paginate_queryset(qs, request)
+        events.record(events.IMPRESSION, featured.STORE, [obj.pk for obj in page if obj.is_featured])
         return paginator.get_paginated_response(
             StoreCardSerializer(page, many=True, context={"request": request}).data
         )
@@ -61,6 +64,14 @@ def stores(request):
     return Response(StoreDetailSerializer(store, context={"request": request}).data, status=status.HTTP_201_CREATED)
 
 
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def featured_stores(request):
+    """Homepage carousel of promoted stores, served from Redis."""
+    return featured.carousel_response(featured.STORE, request)
+
+
 @api_view(["GET", "PATCH", "DELETE"])
 @permission_classes([AllowAny])
 def store_detail(request, slug):
@@ -70,6 +81,8 @@ def store_detail(request, slug):
         return Response({"error": "Store not found."}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
+        if store.is_featured:
+            events.record(events.CLICK, featured.STORE, [store.pk])
         return Response(StoreDetailSerializer(store, context={"request": request}).data)
 
     if not request.user.is_authenticated:
@@ -153,15 +166,7 @@ def store_promote(request, slug):
     if plan not in STORE_PROMOTION_PLANS:
         return Response({"error": "Invalid plan."}, status=status.HTTP_400_BAD_REQUEST)
 
-    days = STORE_PROMOTION_PLANS[plan]["days"]
-    expires = timezone.now() + timedelta(days=days)
-
-    promo, _ = StorePromotion.objects.update_or_create(
-        store=store,
-        defaults={"plan": plan, "expires_at": expires, "is_active": True},
-    )
-    store.is_featured = True
-    store.save(update_fields=["is_featured"])
+    promo, _ = StorePromotion.activate(store, plan)
 
     return Response(StorePromotionSerializer(promo).data, status=status.HTTP_201_CREATED)
 
@@ -202,24 +207,12 @@ def store_promote_capture_order(request, slug):
     if not order_id or plan not in STORE_PROMOTION_PLANS:
         return Response({"error": "Missing order_id or invalid plan."}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        capture = paypal_capture_order(order_id)
-        if capture.get("status") != "COMPLETED":
-            return Response({"error": "Payment not completed."}, status=status.HTTP_400_BAD_REQUEST)
-    except Exception:
-        return Response({"error": "Payment capture failed."}, status=status.HTTP_502_BAD_GATEWAY)
-
-    days = STORE_PROMOTION_PLANS[plan]["days"]
-    expires = timezone.now() + timedelta(days=days)
-
-    promo, _ = StorePromotion.objects.update_or_create(
-        store=store,
-        defaults={"plan": plan, "expires_at": expires, "is_active": True},
-    )
-    store.is_featured = True
-    store.save(update_fields=["is_featured"])
-
-    return Response(StorePromotionSerializer(promo).data, status=status.HTTP_200_OK)
+    # Capturing can take PayPal many seconds; a worker does it and the client
+    # polls /api/v1/orders/payments/<order_id>/ for the outcome.
+    payment = payments.start_capture(request.user, PromotionPayment.Target.STORE, store, plan, order_id)
+    if payment is None:
+        return Response({"error": "Order belongs to another promotion."}, status=status.HTTP_409_CONFLICT)
+    return Response(PromotionPaymentSerializer(payment).data, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(["GET", "POST"])
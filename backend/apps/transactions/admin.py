@@ -1,3 +1,41 @@
 from django.contrib import admin
+from .models import Order, OrderEvent, PromotionPayment
 
-# Register your models here.
+
+@admin.register(PromotionPayment)
+class PromotionPaymentAdmin(admin.ModelAdmin):
+    list_display = ("order_id", "user", "target_type", "plan", "amount", "status", "created_at", "completed_at")
+    list_filter = ("status", "target_type")
+    search_fields = ("order_id", "capture_id", "user__email")
+    ordering = ("-created_at",)
+    readonly_fields = ("id", "created_at", "updated_at", "completed_at")
+
+
+class OrderEventInline(admin.TabularInline):
+    model = OrderEvent
+    extra = 0
+    can_delete = False
+    readonly_fields = ("from_status", "to_status", "actor", "data", "created_at")
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    """Read-only: status changes go through apps/transactions/checkout.py so the ledger stays complete."""
+
+    list_display = ("id", "listing", "buyer", "seller", "amount", "currency", "status", "created_at", "paid_at")
+    list_filter = ("status",)
+    search_fields = ("id", "paypal_order_id", "buyer__email", "seller__email")
+    ordering = ("-created_at",)
+    inlines = [OrderEventInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,8 @@ class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.transactions'
 
+    def ready(self):
+        from . import featured
+
+        featured.connect_signals()
+
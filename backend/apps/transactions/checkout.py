@@ -0,0 +1,311 @@
+"""
+Listing checkout: reserve, pay, fulfil (PostgreSQL).
+
+reserve() takes the listing with one statement: the row is locked with
+FOR UPDATE SKIP LOCKED and flipped from active to pending, so of many
+simultaneous buyers exactly one gets it and the others are turned away at
+once instead of queueing behind the lock. The order is created in the same
+transaction; the orders_one_live_per_listing constraint backs this up should
+a listing ever be put back on sale while an order still holds it.
+
+Unpaid orders expire ORDER_RESERVATION_MINUTES after checkout. expire_batch()
+expires them, puts their listings back on sale and writes their ledger rows
+in one statement per batch, skipping orders a capture currently holds.
+
+Every status change goes through _transition() or the expiry statement and
+appends an OrderEvent; the ledger table itself refuses updates and deletes.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from apps.listings.models import Listing
+from apps.notifications.dispatch import notify
+from apps.notifications.models import Notification
+from apps.users.models import User
+from config.paypal_utils import get_client
+from .models import Order, OrderEvent
+from .payments import captured_money
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidTransition(Exception):
+    """The order is not in a state that allows the requested action."""
+
+
+# action -> (party allowed to take it, statuses it applies to, resulting status)
+ACTIONS = {
+    "cancel": ("buyer", (Order.Status.PENDING,), Order.Status.CANCELLED),
+    "ship": ("seller", (Order.Status.PAID,), Order.Status.SHIPPED),
+    "confirm": ("buyer", (Order.Status.SHIPPED,), Order.Status.DELIVERED),
+    "dispute": ("buyer", (Order.Status.PAID, Order.Status.SHIPPED, Order.Status.DELIVERED), Order.Status.DISPUTED),
+}
+
+_RESERVE_SQL = f"""
+    UPDATE {Listing._meta.db_table} SET status = %s, updated_at = %s
+    WHERE id = (
+        SELECT id FROM {Listing._meta.db_table}
+        WHERE id = %s AND status = %s AND seller_id <> %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING seller_id, price, currency
+"""
+
+
+def reserve(buyer, listing_id, shipping_address=None, now=None):
+    """Reserve an active listing for ``buyer`` and open its order. Returns None if someone else has it."""
+    now = now or timezone.now()
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    _RESERVE_SQL,
+                    [Listing.Status.PENDING, now, listing_id, Listing.Status.ACTIVE, buyer.pk],
+                )
+                row = cursor.fetchone()
+            if row is None:
+                return None
+            seller_id, price, currency = row
+            order = Order.objects.create(
+                buyer=buyer,
+                seller_id=seller_id,
+                listing_id=listing_id,
+                amount=price,
+                currency=currency,
+                shipping_address=shipping_address or {},
+                expires_at=now + timedelta(minutes=settings.ORDER_RESERVATION_MINUTES),
+            )
+            OrderEvent.objects.create(order=order, to_status=order.status, actor=buyer, data={"amount": str(price)})
+    except IntegrityError:
+        logger.warning("Listing %s was on sale while another order held it", listing_id)
+        return None
+    return order
+
+
+def create_payment(order):
+    """Open the PayPal order the buyer approves. Retrying for the same order returns the same PayPal order."""
+    result = get_client().create_order(
+        str(order.amount),
+        f"Order {order.id}",
+        request_id=f"order-{order.id}",
+        currency=order.currency,
+    )
+    order.paypal_order_id = result["id"]
+    order.save(update_fields=["paypal_order_id", "updated_at"])
+    return order
+
+
+def begin_capture(order_id, buyer):
+    """
+    Queue the capture of a pending order's payment. The reservation is extended
+    by ORDER_CAPTURE_GRACE_MINUTES so expiry does not release the listing while
+    PayPal is being asked, and from then on the buyer can no longer cancel.
+    Returns None if the order is not the buyer's.
+    """
+    from .tasks import capture_order
+
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(pk=order_id, buyer=buyer).first()
+        if order is None:
+            return None
+        if order.status != Order.Status.PENDING or not order.paypal_order_id:
+            raise InvalidTransition("This order is not awaiting payment.")
+        now = timezone.now()
+        if order.expires_at <= now:
+            raise InvalidTransition("This reservation has expired.")
+        order.expires_at = max(order.expires_at, now + timedelta(minutes=settings.ORDER_CAPTURE_GRACE_MINUTES))
+        order.capture_requested_at = now
+        order.save(update_fields=["expires_at", "capture_requested_at", "updated_at"])
+        transaction.on_commit(lambda: capture_order.delay(str(order.pk)))
+    return order
+
+
+def _transition(order, to_status, actor=None, data=None, **fields):
+    from_status = order.status
+    order.status = to_status
+    for name, value in fields.items():
+        setattr(order, name, value)
+    order.save(update_fields=["status", *fields, "updated_at"])
+    OrderEvent.objects.create(order=order, from_status=from_status, to_status=to_status, actor=actor, data=data or {})
+    if to_status in Order.CLOSED:
+        Listing.objects.filter(pk=order.listing_id, status=Listing.Status.PENDING).update(
+            status=Listing.Status.ACTIVE, updated_at=timezone.now()
+        )
+
+
+def act(order_id, user, action, data=None, **fields):
+    """
+    Apply ``action`` (see ACTIONS) to an order as ``user``. Returns None if
+    ``user`` is not the party allowed to take it; raises InvalidTransition if
+    the order's status does not allow it.
+    """
+    party, allowed, to_status = ACTIONS[action]
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(pk=order_id, **{party: user}).first()
+        if order is None:
+            return None
+        if order.status not in allowed:
+            raise InvalidTransition(f"Cannot {action} an order that is {order.get_status_display().lower()}.")
+        if action == "cancel" and order.capture_requested_at:
+            raise InvalidTransition("Payment is already being captured; this order can no longer be cancelled.")
+        _transition(order, to_status, user, data, **fields)
+    other = order.seller_id if party == "buyer" else order.buyer_id
+    _notify([other], order, f"Order {order.get_status_display().lower()}")
+    return order
+
+
+def _capture_id(resource):
+    if "purchase_units" not in resource:
+        return resource.get("id", "")
+    captures = (resource["purchase_units"][0].get("payments") or {}).get("captures") or []
+    return captures[0].get("id", "") if captures else ""
+
+
+def complete(paypal_order_id, resource):
+    """Mark the order for ``paypal_order_id`` paid and its listing sold, once. Returns the order or None."""
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(paypal_order_id=paypal_order_id).first()
+        if order is None:
+            return None
+        capture_id = _capture_id(resource)
+        if order.status != Order.Status.PENDING:
+            if order.status in Order.CLOSED and capture_id and order.capture_id != capture_id:
+                # Paid after the reservation ended: keep the money on record so it can be refunded.
+                logger.warning("Order %s captured while %s; refund due", order.pk, order.status)
+                order.capture_id = capture_id
+                order.save(update_fields=["capture_id", "updated_at"])
+                OrderEvent.objects.create(
+                    order=order, from_status=order.status, to_status=order.status,
+                    data={"capture_id": capture_id, "refund_due": True},
+                )
+                _notify_refund_due(order)
+            return order
+
+        amount, currency = captured_money(resource)
+        if amount is None or (amount, currency) != (order.amount, order.currency):
+            # Money moved but not what the listing costs: never sell on it, refund it.
+            captured = f"{amount} {currency}" if amount is not None else "no amount"
+            logger.warning("Order %s captured %s, expected %s %s; refund due", order.pk, captured, order.amount, order.currency)
+            _transition(
+                order, Order.Status.CANCELLED,
+                data={"reason": f"Captured {captured}, expected {order.amount} {order.currency}.",
+                      "capture_id": capture_id, "refund_due": True},
+                capture_id=capture_id,
+            )
+            _notify_refund_due(order)
+            return order
+
+        _transition(
+            order, Order.Status.PAID, data={"capture_id": capture_id},
+            capture_id=capture_id, paid_at=timezone.now(),
+        )
+        Listing.objects.filter(pk=order.listing_id).update(status=Listing.Status.SOLD, updated_at=timezone.now())
+    logger.info("Order %s paid", order.pk)
+    _notify([order.seller_id], order, "Your watch has sold")
+    return order
+
+
+def _notify_refund_due(order):
+    """Tell the buyer a payment the order could not take will be returned, and staff that a refund is owed."""
+    notify(
+        [order.buyer_id],
+        Notification.Kind.ORDER,
+        "Your payment will be refunded",
+        body="Your payment could not be applied to this order, so it will be returned to you.",
+        link=f"/orders/{order.id}",
+        data={"order_id": str(order.id), "status": order.status, "refund_due": True},
+    )
+    staff_ids = User.objects.filter(is_staff=True, is_active=True).values_list("pk", flat=True)
+    notify(
+        list(staff_ids),
+        Notification.Kind.ORDER,
+        f"Refund due on {order.get_status_display().lower()} order",
+        body=f"PayPal capture {order.capture_id} for {order.amount} {order.currency} must be refunded.",
+        link=f"/admin/transactions/order/{order.id}/change/",
+        data={"order_id": str(order.id), "capture_id": order.capture_id, "refund_due": True},
+    )
+
+
+def fail(paypal_order_id, reason):
+    """Cancel a pending order whose payment failed and put its listing back on sale."""
+    with transaction.atomic():
+        order = Order.objects.select_for_update().filter(paypal_order_id=paypal_order_id).first()
+        if order is None or order.status != Order.Status.PENDING:
+            return order
+        _transition(order, Order.Status.CANCELLED, data={"reason": reason[:255]})
+    logger.warning("Order %s payment failed: %s", order.pk, reason)
+    _notify([order.buyer_id], order, "Your payment did not go through")
+    return order
+
+
+def _expire_sql():
+    orders, events, listings = Order._meta.db_table, OrderEvent._meta.db_table, Listing._meta.db_table
+    return f"""
+        WITH due AS (
+            SELECT id FROM {orders}
+            WHERE status = 'pending' AND expires_at <= %(now)s
+            ORDER BY expires_at
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        ), expired AS (
+            UPDATE {orders} AS o SET status = 'expired', updated_at = %(now)s
+            FROM due WHERE o.id = due.id
+            RETURNING o.id, o.listing_id, o.buyer_id
+        ), released AS (
+            UPDATE {listings} AS l SET status = 'active', updated_at = %(now)s
+            FROM expired WHERE l.id = expired.listing_id AND l.status = 'pending'
+        ), ledger AS (
+            INSERT INTO {events} (order_id, from_status, to_status, data, created_at)
+            SELECT id, 'pending', 'expired', '{{}}'::jsonb, %(now)s FROM expired
+        )
+        SELECT id, buyer_id FROM expired
+    """
+
+
+def expire_batch(now=None, batch_size=None):
+    """Expire one batch of unpaid orders. Returns (order id, buyer id) pairs."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_expire_sql(), {
+                "now": now or timezone.now(),
+                "limit": batch_size or settings.ORDER_EXPIRY_BATCH_SIZE,
+            })
+            return cursor.fetchall()
+
+
+def expire_all(now=None, batch_size=None):
+    """Expire every unpaid order past its reservation, batch by batch. Returns the number expired."""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.ORDER_EXPIRY_BATCH_SIZE
+    expired = 0
+    while True:
+        batch = expire_batch(now, batch_size)
+        expired += len(batch)
+        for order_id, buyer_id in batch:
+            notify(
+                [buyer_id],
+                Notification.Kind.ORDER,
+                "Your reservation has expired",
+                body="The watch is available to other buyers again.",
+                link=f"/orders/{order_id}",
+                data={"order_id": str(order_id), "status": Order.Status.EXPIRED},
+            )
+        if len(batch) < batch_size:
+            break
+    if expired:
+        logger.info("Expired %d unpaid orders", expired)
+    return expired
+
+
+def _notify(recipient_ids, order, title):
+    notify(
+        recipient_ids,
+        Notification.Kind.ORDER,
+        title,
+        link=f"/orders/{order.id}",
+        data={"order_id": str(order.id), "status": order.status},
+    )
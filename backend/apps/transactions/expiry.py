@@ -0,0 +1,122 @@
+"""
+Bulk expiry of listing, store and repair shop promotions (PostgreSQL).
+
+Each batch is a single statement per kind: lock up to ``batch_size`` active
+promotions past their expires_at (found through the partial *_expiring_idx
+indexes), deactivate them and clear the featured flag on the promoted rows
+with UPDATE ... FROM, returning the rows to drop from the featured carousels
+and the owners to notify. SKIP LOCKED lets an overlapping run or a renewal in
+flight take its rows instead of waiting.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.listings.models import ListingPromotion
+from apps.notifications.dispatch import notify
+from apps.notifications.models import Notification
+from apps.repairs.models import RepairPromotion
+from apps.stores.models import StorePromotion
+from . import featured
+
+logger = logging.getLogger(__name__)
+
+# kind -> (promotion model, target field, owner field, columns reset on the target, dashboard link)
+KINDS = {
+    "listing": (ListingPromotion, "listing", "seller", {"is_featured": "false", "featured_until": "NULL"}, "/dashboard/ads"),
+    "store": (StorePromotion, "store", "owner", {"is_featured": "false"}, "/dashboard/store"),
+    "repair_shop": (RepairPromotion, "shop", "owner", {"is_featured": "false"}, "/dashboard/repairs"),
+}
+
+TITLES = {
+    "listing": "Your listing promotion has ended",
+    "store": "Your store promotion has ended",
+    "repair_shop": "Your repair shop promotion has ended",
+}
+
+
+def _expire_sql(kind):
+    promotion_model, target_field, owner_field, reset, _ = KINDS[kind]
+    fk = promotion_model._meta.get_field(target_field)
+    target_model = fk.related_model
+    assignments = ", ".join(f"{column} = {value}" for column, value in reset.items())
+    return f"""
+        WITH due AS (
+            SELECT id FROM {promotion_model._meta.db_table}
+            WHERE is_active AND expires_at <= %s
+            ORDER BY expires_at
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        ), expired AS (
+            UPDATE {promotion_model._meta.db_table} AS p SET is_active = false
+            FROM due WHERE p.id = due.id
+            RETURNING p.{fk.column}
+        )
+        UPDATE {target_model._meta.db_table} AS t SET {assignments}
+        FROM expired WHERE t.{target_model._meta.pk.column} = expired.{fk.column}
+        RETURNING t.{target_model._meta.pk.column}, t.{target_model._meta.get_field(owner_field).column}
+    """
+
+
+def expire_batch(kind, now=None, batch_size=None):
+    """Expire one batch of ``kind`` promotions. Returns the owner id of each promoted row."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(_expire_sql(kind), [now or timezone.now(), batch_size or settings.PROMOTION_EXPIRY_BATCH_SIZE])
+            rows = cursor.fetchall()
+        target_ids = [row[0] for row in rows]
+        transaction.on_commit(lambda: featured.remove(kind, target_ids))
+    return [row[1] for row in rows]
+
+
+def expire_all(now=None, batch_size=None):
+    """Expire every due promotion batch by batch and notify each owner once per kind. Returns counts per kind."""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.PROMOTION_EXPIRY_BATCH_SIZE
+    counts = {}
+    for kind in KINDS:
+        owner_ids = []
+        while True:
+            batch = expire_batch(kind, now, batch_size)
+            owner_ids += batch
+            if len(batch) < batch_size:
+                break
+        counts[kind] = len(owner_ids)
+        notify(
+            set(owner_ids),
+            Notification.Kind.PROMOTION_EXPIRED,
+            TITLES[kind],
+            body="Renew it to keep appearing in the featured sections.",
+            link=KINDS[kind][4],
+            data={"target_type": kind},
+        )
+    _record(counts)
+    logger.info(
+        "Expired promotions: %s",
+        ", ".join(f"{kind}={count}" for kind, count in counts.items()),
+        extra={"promotions_expired": counts},
+    )
+    return counts
+
+
+def _stats_key(kind):
+    return f"promotions:expired:{kind}"
+
+
+def _record(counts):
+    try:
+        for kind, count in counts.items():
+            if count:
+                cache.add(_stats_key(kind), 0, timeout=None)
+                cache.incr(_stats_key(kind), count)
+    except Exception:
+        logger.exception("Could not record promotion expiry counts")
+
+
+def stats():
+    """Promotions expired per kind since the counters were last cleared."""
+    stored = cache.get_many([_stats_key(kind) for kind in KINDS])
+    return {kind: stored.get(_stats_key(kind), 0) for kind in KINDS}
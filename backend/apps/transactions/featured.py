@@ -0,0 +1,272 @@
+"""
+Featured carousels for listings, stores and repair shops, served from Redis.
+
+Per kind, a sorted set ranks the featured ids by plan tier, then by when the
+plan was last bought, and a hash holds each item's rendered card JSON. One Lua
+call reads the top ids and their cards, so the carousel endpoints answer
+without touching the database. Each card served counts as an impression.
+
+Cards are written whenever a promoted row is saved (promotion activation
+saves it too) and dropped when it stops being featured or its promotion
+expires. rebuild() reloads a kind from the database into fresh keys and swaps
+them in; until a kind has been built, reads fall back to the database and
+queue a rebuild.
+
+One rebuild per kind runs at a time, under a token lock renewed every batch,
+and each run loads into its own temporary keys. Cards written or dropped
+while a rebuild runs still go to the live keys, and their ids are noted in a
+dirty set; once the rebuild has swapped its keys in, it refreshes those ids
+again, so the swap cannot undo a change made during the rebuild.
+"""
+import json
+import logging
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from apps.analytics import events
+from apps.listings.models import Listing, ListingImage, ListingPromotion, PROMOTION_PLANS
+from apps.listings.serializers import ListingCardSerializer
+from apps.repairs.models import RepairShop, RepairPromotion, REPAIR_PROMOTION_PLANS
+from apps.repairs.serializers import RepairShopCardSerializer
+from apps.stores.models import Store, StorePromotion, STORE_PROMOTION_PLANS
+from apps.stores.serializers import StoreCardSerializer
+from config.redis_utils import acquire_lock, get_redis, release_lock, renew_lock
+
+logger = logging.getLogger(__name__)
+
+LISTING, STORE, REPAIR_SHOP = "listing", "store", "repair_shop"
+
+# kind -> (model, promotion model, plans, card serializer)
+KINDS = {
+    LISTING: (Listing, ListingPromotion, PROMOTION_PLANS, ListingCardSerializer),
+    STORE: (Store, StorePromotion, STORE_PROMOTION_PLANS, StoreCardSerializer),
+    REPAIR_SHOP: (RepairShop, RepairPromotion, REPAIR_PROMOTION_PLANS, RepairShopCardSerializer),
+}
+MODEL_KINDS = {model: kind for kind, (model, *_) in KINDS.items()}
+
+DEFAULT_LIMIT = 12
+MAX_LIMIT = 50
+TIER_WEIGHT = 10 ** 10  # larger than any epoch timestamp we will see
+REBUILD_LOCK_SECONDS = 300  # renewed every batch; only a stalled rebuild loses it
+
+_TOP_CARDS = """
+if redis.call('EXISTS', KEYS[3]) == 0 then return false end
+local ids = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #ids == 0 then return {ids, ids} end
+return {ids, redis.call('HMGET', KEYS[2], unpack(ids))}
+"""
+_top_cards = None
+
+
+class _CardRequest:
+    """Stands in for a request while rendering cards outside one: absolute URLs, anonymous viewer."""
+
+    user = AnonymousUser()
+
+    def build_absolute_uri(self, location):
+        return urljoin(settings.BACKEND_URL, location)
+
+
+def _keys(kind):
+    return (
+        cache.make_key(f"featured:{kind}:rank"),
+        cache.make_key(f"featured:{kind}:cards"),
+        cache.make_key(f"featured:{kind}:built"),
+    )
+
+
+def _rebuild_lock(kind):
+    return f"featured:{kind}:rebuild_lock"
+
+
+def _mark_dirty(client, kind, pks):
+    """Note ``pks`` for the running rebuild of ``kind``, if there is one, to refresh after its swap."""
+    if client.exists(cache.make_key(_rebuild_lock(kind))):
+        client.sadd(cache.make_key(f"featured:{kind}:dirty"), *pks)
+
+
+def _queryset(kind):
+    model = KINDS[kind][0]
+    qs = model.objects.filter(is_featured=True, promotion__is_active=True).select_related("promotion")
+    if kind == LISTING:
+        qs = qs.filter(status=Listing.Status.ACTIVE).select_related("seller").prefetch_related("images")
+    return qs
+
+
+def _score(kind, promotion):
+    plans = KINDS[kind][2]
+    tier = list(plans).index(promotion.plan) + 1 if promotion.plan in plans else 0
+    bought_at = promotion.expires_at - timedelta(days=plans.get(promotion.plan, {}).get("days", 0))
+    return tier * TIER_WEIGHT + bought_at.timestamp()
+
+
+def _card(kind, obj):
+    return json.dumps(KINDS[kind][3](obj, context={"request": _CardRequest()}).data, separators=(",", ":"))
+
+
+def refresh(kind, pk):
+    """Write the card for ``pk`` if it is featured, otherwise drop it from the carousel."""
+    obj = _queryset(kind).filter(pk=pk).first()
+    if obj is None:
+        return remove(kind, [pk])
+    rank_key, cards_key, _ = _keys(kind)
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        pipe.hset(cards_key, str(pk), _card(kind, obj))
+        pipe.zadd(rank_key, {str(pk): _score(kind, obj.promotion)})
+        pipe.execute()
+        _mark_dirty(client, kind, [str(pk)])
+    except Exception:
+        logger.exception("Could not update featured %s %s", kind, pk)
+
+
+def remove(kind, pks):
+    pks = [str(pk) for pk in pks]
+    if not pks:
+        return
+    rank_key, cards_key, _ = _keys(kind)
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        pipe.zrem(rank_key, *pks)
+        pipe.hdel(cards_key, *pks)
+        pipe.execute()
+        _mark_dirty(client, kind, pks)
+    except Exception:
+        logger.exception("Could not remove featured %s items", kind)
+
+
+def rebuild(kind, batch_size=500):
+    """
+    Load every featured item of ``kind`` into new keys and swap them in.
+    Returns the number loaded, or None if another rebuild of ``kind`` is running.
+    """
+    lock = _rebuild_lock(kind)
+    token = acquire_lock(lock, REBUILD_LOCK_SECONDS)
+    if token is None:
+        return None
+    rank_key, cards_key, built_key = _keys(kind)
+    dirty_key = cache.make_key(f"featured:{kind}:dirty")
+    tmp_rank, tmp_cards = f"{rank_key}:rebuild:{token}", f"{cards_key}:rebuild:{token}"
+    client = get_redis()
+    try:
+        loaded = 0
+        batch = []
+        for obj in _queryset(kind).iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) == batch_size:
+                loaded += _load(client, kind, batch, tmp_rank, tmp_cards)
+                batch = []
+                if not renew_lock(lock, token, REBUILD_LOCK_SECONDS):
+                    logger.warning("Featured %s rebuild lost its lock; abandoning it", kind)
+                    return None
+        loaded += _load(client, kind, batch, tmp_rank, tmp_cards)
+
+        pipe = client.pipeline()  # MULTI/EXEC: readers see the old carousel or the new one
+        if loaded:
+            pipe.rename(tmp_rank, rank_key)
+            pipe.rename(tmp_cards, cards_key)
+        else:
+            pipe.delete(rank_key, cards_key)
+        pipe.set(built_key, 1)
+        pipe.execute()
+    finally:
+        client.delete(tmp_rank, tmp_cards)
+        release_lock(lock, token)
+
+    # Replay changes made while loading; refreshes from here on go straight to the live keys.
+    pipe = client.pipeline()
+    pipe.smembers(dirty_key)
+    pipe.delete(dirty_key)
+    dirty, _ = pipe.execute()
+    for pk in dirty:
+        refresh(kind, pk.decode())
+    return loaded
+
+
+def _load(client, kind, objs, rank_key, cards_key):
+    if not objs:
+        return 0
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(cards_key, mapping={str(obj.pk): _card(kind, obj) for obj in objs})
+    pipe.zadd(rank_key, {str(obj.pk): _score(kind, obj.promotion) for obj in objs})
+    pipe.execute()
+    return len(objs)
+
+
+def schedule_rebuild(kind):
+    from .tasks import rebuild_featured
+
+    try:
+        if cache.add(f"featured:{kind}:rebuilding", 1, timeout=300):
+            transaction.on_commit(lambda: rebuild_featured.delay(kind))
+    except Exception:
+        logger.exception("Could not schedule featured %s rebuild", kind)
+
+
+def top_cards(kind, limit=DEFAULT_LIMIT):
+    """
+    (ids, card JSON) for the top ``limit`` items in one round trip, or None if
+    the carousel has not been built.
+    """
+    global _top_cards
+    client = get_redis()
+    if _top_cards is None:
+        _top_cards = client.register_script(_TOP_CARDS)
+    found = _top_cards(keys=list(_keys(kind)), args=[limit], client=client)
+    if found is None:
+        return None
+    pairs = [(pk.decode(), card) for pk, card in zip(*found) if card is not None]
+    return [pk for pk, _ in pairs], [card for _, card in pairs]
+
+
+def carousel_response(kind, request):
+    """Ready-to-render ``{"results": [card, ...]}`` for a featured carousel endpoint."""
+    try:
+        limit = min(max(int(request.GET.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    try:
+        found = top_cards(kind, limit)
+    except Exception:
+        logger.exception("Featured %s carousel unavailable, reading database", kind)
+        found = None
+    if found is None:
+        schedule_rebuild(kind)
+        objs = sorted(_queryset(kind), key=lambda obj: _score(kind, obj.promotion), reverse=True)[:limit]
+        found = [obj.pk for obj in objs], [_card(kind, obj).encode() for obj in objs]
+    ids, cards = found
+    events.record(events.IMPRESSION, kind, ids)
+    return HttpResponse(b'{"results":[' + b",".join(cards) + b"]}", content_type="application/json")
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    def item_saved(sender, instance, **kwargs):
+        kind = MODEL_KINDS[sender]
+        if instance.is_featured:
+            transaction.on_commit(lambda: refresh(kind, instance.pk))
+        else:
+            transaction.on_commit(lambda: remove(kind, [instance.pk]))
+
+    def item_deleted(sender, instance, **kwargs):
+        kind = MODEL_KINDS[sender]
+        transaction.on_commit(lambda: remove(kind, [instance.pk]))
+
+    def image_changed(sender, instance, **kwargs):
+        listing_id = instance.listing_id
+        transaction.on_commit(lambda: refresh(LISTING, listing_id))
+
+    for model in MODEL_KINDS:
+        post_save.connect(item_saved, sender=model, dispatch_uid=f"featured.saved.{model._meta.label}")
+        post_delete.connect(item_deleted, sender=model, dispatch_uid=f"featured.deleted.{model._meta.label}")
+    post_save.connect(image_changed, sender=ListingImage, dispatch_uid="featured.listing_image.saved")
+    post_delete.connect(image_changed, sender=ListingImage, dispatch_uid="featured.listing_image.deleted")
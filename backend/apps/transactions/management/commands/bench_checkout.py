@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.listings.models import Listing
+from apps.transactions import checkout
+from apps.transactions.models import Order, OrderEvent
+from apps.users.models import User
+
+BENCH_DOMAIN = "checkout-bench.invalid"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test checkout: many threads, each with its own database connection, "
+        "race to buy a small set of listings; then the reservations expire and the "
+        "race repeats. Fails if any listing ever has more than one live order or "
+        "the ledger disagrees with the orders (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=20, help="Listings contended for each round.")
+        parser.add_argument("--buyers", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--attempts", type=int, default=2000, help="Buy attempts per round.")
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        if connection.vendor != "postgresql":
+            raise CommandError("The checkout benchmark needs PostgreSQL.")
+        seller, buyers, listing_ids = self._create(opts)
+        try:
+            for n in range(1, opts["rounds"] + 1):
+                self._round(n, buyers, listing_ids, opts)
+                self._verify(listing_ids)
+                self._expire(listing_ids)
+        finally:
+            self._cleanup()
+
+    def _create(self, opts):
+        password = make_password(None)
+        seller = User.objects.create(email=f"seller@{BENCH_DOMAIN}", username="checkout_bench_seller", password=password)
+        buyers = User.objects.bulk_create(
+            [
+                User(email=f"buyer{i}@{BENCH_DOMAIN}", username=f"checkout_bench_buyer_{i}", password=password)
+                for i in range(opts["buyers"])
+            ],
+            batch_size=1000,
+        )
+        listings = Listing.objects.bulk_create(
+            [
+                Listing(seller=seller, title=f"Bench watch {i}", brand="Bench", model=str(i), condition="excellent", price=1000 + i)
+                for i in range(opts["listings"])
+            ]
+        )
+        return seller, buyers, [listing.pk for listing in listings]
+
+    def _round(self, n, buyers, listing_ids, opts):
+        attempts = [(random.choice(buyers), random.choice(listing_ids)) for _ in range(opts["attempts"])]
+        won, lost, errors = Counter(), Counter(), []
+        lock = threading.Lock()
+
+        def buy(attempt):
+            buyer, listing_id = attempt
+            try:
+                order = checkout.reserve(buyer, listing_id)
+            except Exception as exc:
+                with lock:
+                    errors.append(exc)
+                return
+            with lock:
+                (won if order else lost)[listing_id] += 1
+
+        def worker(chunk):
+            try:
+                for attempt in chunk:
+                    buy(attempt)
+            finally:
+                connections.close_all()
+
+        chunks = [attempts[i::opts["threads"]] for i in range(opts["threads"])]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+            list(pool.map(worker, chunks))
+        elapsed = time.perf_counter() - started
+        if errors:
+            raise CommandError(f"{len(errors)} attempts raised, first: {errors[0]!r}")
+        doubled = [pk for pk, count in won.items() if count > 1]
+        if doubled:
+            raise CommandError(f"Round {n}: {len(doubled)} listings were reserved more than once")
+        self.stdout.write(
+            f"Round {n}: {len(attempts):,} attempts on {len(listing_ids)} listings from {opts['threads']} threads "
+            f"in {elapsed:.2f}s ({len(attempts) / elapsed:,.0f}/s): {sum(won.values())} reserved, "
+            f"{sum(lost.values()):,} turned away"
+        )
+
+    def _verify(self, listing_ids):
+        live = (
+            Order.objects.filter(listing_id__in=listing_ids).exclude(status__in=Order.CLOSED)
+            .values("listing_id").annotate(n=Count("id")).filter(n__gt=1)
+        )
+        if live.exists():
+            raise CommandError("A listing has more than one live order")
+        held = Listing.objects.filter(pk__in=listing_ids, status=Listing.Status.PENDING).count()
+        pending = Order.objects.filter(listing_id__in=listing_ids, status=Order.Status.PENDING).count()
+        if held != pending:
+            raise CommandError(f"{held} listings are reserved but {pending} orders are pending")
+        orders = Order.objects.filter(listing_id__in=listing_ids).count()
+        events = OrderEvent.objects.filter(order__listing_id__in=listing_ids).count()
+        closed = Order.objects.filter(listing_id__in=listing_ids, status__in=Order.CLOSED).count()
+        if events != orders + closed:
+            raise CommandError(f"Ledger has {events} rows for {orders} orders ({closed} closed)")
+
+    def _expire(self, listing_ids):
+        Order.objects.filter(listing_id__in=listing_ids, status=Order.Status.PENDING).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        started = time.perf_counter()
+        expired = checkout.expire_all()
+        elapsed = time.perf_counter() - started
+        still_held = Listing.objects.filter(pk__in=listing_ids).exclude(status=Listing.Status.ACTIVE).count()
+        if still_held:
+            raise CommandError(f"{still_held} listings were not released by expiry")
+        self._verify(listing_ids)
+        self.stdout.write(f"  expired {expired} reservations in {elapsed * 1000:.1f} ms; all listings back on sale")
+
+    def _cleanup(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL orders.ledger_maintenance = 'on'")
+            bench_users = User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}")
+            OrderEvent.objects.filter(order__buyer__in=bench_users).delete()
+            Order.objects.filter(buyer__in=bench_users).delete()
+            Listing.objects.filter(seller__in=bench_users).delete()
+            bench_users.delete()
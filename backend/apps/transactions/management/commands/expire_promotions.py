@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.transactions import expiry
+
+
+class Command(BaseCommand):
+    help = "Expire due listing, store and repair shop promotions now and show the running totals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **opts):
+        counts = expiry.expire_all(batch_size=opts["batch_size"])
+        totals = expiry.stats()
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: expired {count:,} (total {totals[kind]:,})")
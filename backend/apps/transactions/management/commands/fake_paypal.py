@@ -0,0 +1,117 @@
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+ORDER_PATH = re.compile(r"^/v2/checkout/orders/(?P<order_id>[\w-]+)(?P<capture>/capture)?$")
+
+
+class FakePayPal:
+    """
+    In-memory stand-in for the parts of the PayPal REST API we use: OAuth
+    tokens, order create/get/capture, PayPal-Request-Id replay, and webhook
+    verification (which always succeeds).
+    """
+
+    def __init__(self, latency=0.0, fail_rate=0.0, token_ttl=32400):
+        self.latency, self.fail_rate, self.token_ttl = latency, fail_rate, token_ttl
+        self.orders = {}
+        self.replies = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def handle(self, method, path, request_id, body):
+        """Return (status, payload) for one API call."""
+        with self.lock:
+            self.calls += 1
+            failing = self.fail_rate and (self.calls % round(1 / self.fail_rate) == 0)
+        if self.latency:
+            time.sleep(self.latency)
+        if failing:
+            return 503, {"name": "SERVICE_UNAVAILABLE"}
+        if method == "POST" and path == "/v1/oauth2/token":
+            return 200, {"access_token": uuid.uuid4().hex, "token_type": "Bearer", "expires_in": self.token_ttl}
+        if method == "POST" and path == "/v1/notifications/verify-webhook-signature":
+            return 200, {"verification_status": "SUCCESS"}
+
+        with self.lock:
+            if request_id and (method, path, request_id) in self.replies:
+                return self.replies[(method, path, request_id)]
+            reply = self._dispatch(method, path, body)
+            if request_id:
+                self.replies[(method, path, request_id)] = reply
+            return reply
+
+    def _dispatch(self, method, path, body):
+        if method == "POST" and path == "/v2/checkout/orders":
+            order_id = uuid.uuid4().hex[:17].upper()
+            self.orders[order_id] = {
+                "id": order_id,
+                "status": "APPROVED",  # skip the buyer-approval redirect
+                "purchase_units": body.get("purchase_units", []),
+            }
+            return 201, self.orders[order_id]
+        match = ORDER_PATH.match(path)
+        if not match or match["order_id"] not in self.orders:
+            return 404, {"name": "RESOURCE_NOT_FOUND"}
+        order = self.orders[match["order_id"]]
+        if method == "GET" and not match["capture"]:
+            return 200, order
+        if method == "POST" and match["capture"]:
+            if order["status"] == "COMPLETED":
+                return 422, {"name": "UNPROCESSABLE_ENTITY", "details": [{"issue": "ORDER_ALREADY_CAPTURED"}]}
+            order["status"] = "COMPLETED"
+            return 201, order
+        return 405, {"name": "METHOD_NOT_SUPPORTED"}
+
+    def serve(self, host="127.0.0.1", port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw and self.headers.get("Content-Type", "").startswith("application/json") else {}
+                except ValueError:
+                    body = {}
+                status, payload = fake.handle(self.command, self.path, self.headers.get("PayPal-Request-Id"), body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+
+class Command(BaseCommand):
+    help = "Run a local fake PayPal API. Point PAYPAL_BASE_URL at it to exercise payments offline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8089)
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep before every response.")
+        parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of calls answered with 503.")
+
+    def handle(self, *args, **opts):
+        server = FakePayPal(latency=opts["latency"], fail_rate=opts["fail_rate"]).serve(port=opts["port"])
+        self.stdout.write(f"Fake PayPal listening on http://127.0.0.1:{opts['port']}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
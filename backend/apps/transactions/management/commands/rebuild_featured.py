@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.transactions import featured
+
+
+class Command(BaseCommand):
+    help = "Load the featured listing, store and repair shop carousels into Redis from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=list(featured.KINDS), help="Rebuild only this carousel.")
+
+    def handle(self, *args, **opts):
+        kinds = [opts["kind"]] if opts["kind"] else list(featured.KINDS)
+        for kind in kinds:
+            self.stdout.write(f"{kind}: {featured.rebuild(kind):,} featured")
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:20
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromotionPayment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('order_id', models.CharField(max_length=64, unique=True)),
+                ('target_type', models.CharField(choices=[('listing', 'Listing'), ('store', 'Store'), ('repair_shop', 'Repair shop')], max_length=20)),
+                ('target_id', models.UUIDField()),
+                ('plan', models.CharField(max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('capture_id', models.CharField(blank=True, max_length=64)),
+                ('failure_reason', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promotion_payments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'promotion_payments',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='promotion_payments_pending_idx')],
+            },
+        ),
+    ]
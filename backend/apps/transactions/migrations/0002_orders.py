@@ -0,0 +1,98 @@
+# Generated by Django 6.0.2 on 2026-10-19 17:10
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+# order_events is a ledger: rows are only ever inserted. Maintenance that must
+# remove rows (e.g. deleting benchmark data) sets orders.ledger_maintenance = 'on'
+# for its transaction.
+APPEND_ONLY = """
+CREATE FUNCTION order_events_append_only() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('orders.ledger_maintenance', true) = 'on' THEN
+        RETURN CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END;
+    END IF;
+    RAISE EXCEPTION 'order_events is append-only (% rejected)', TG_OP;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER order_events_append_only
+    BEFORE UPDATE OR DELETE ON order_events
+    FOR EACH ROW EXECUTE FUNCTION order_events_append_only();
+"""
+
+DROP_APPEND_ONLY = """
+DROP TRIGGER IF EXISTS order_events_append_only ON order_events;
+DROP FUNCTION IF EXISTS order_events_append_only();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0006_content_addressed_images'),
+        ('transactions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('currency', models.CharField(max_length=3)),
+                ('status', models.CharField(choices=[('pending', 'Pending payment'), ('paid', 'Paid'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('disputed', 'Disputed'), ('refunded', 'Refunded'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], default='pending', max_length=20)),
+                ('paypal_order_id', models.CharField(blank=True, max_length=64, null=True, unique=True)),
+                ('capture_id', models.CharField(blank=True, max_length=64)),
+                ('shipping_address', models.JSONField(blank=True, default=dict)),
+                ('tracking_number', models.CharField(blank=True, max_length=100)),
+                ('expires_at', models.DateTimeField()),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('buyer', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='purchases', to=settings.AUTH_USER_MODEL)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='listings.listing')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='sales', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'orders',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'Pending payment'), ('paid', 'Paid'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('disputed', 'Disputed'), ('refunded', 'Refunded'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pending payment'), ('paid', 'Paid'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('disputed', 'Disputed'), ('refunded', 'Refunded'), ('cancelled', 'Cancelled'), ('expired', 'Expired')], max_length=20)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='events', to='transactions.order')),
+            ],
+            options={
+                'db_table': 'order_events',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['buyer', '-created_at'], name='orders_buyer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['seller', '-created_at'], name='orders_seller_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at'], name='orders_pending_expiry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['refunded', 'cancelled', 'expired']), _negated=True), fields=('listing',), name='orders_one_live_per_listing'),
+        ),
+        migrations.RunSQL(APPEND_ONLY, DROP_APPEND_ONLY),
+    ]
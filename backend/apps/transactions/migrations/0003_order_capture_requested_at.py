@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0002_orders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='capture_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,3 +1,142 @@
+import uuid
 from django.db import models
+from django.conf import settings
 
-# Create your models here.
+
+class PromotionPayment(models.Model):
+    """
+    A PayPal order paid to promote a listing, store or repair shop.
+
+    The row is created as pending when the client asks us to capture the
+    order. A Celery task or a PayPal webhook completes it exactly once and
+    applies the promotion; order_id is the idempotency key for both paths.
+    """
+
+    class Target(models.TextChoices):
+        LISTING = "listing", "Listing"
+        STORE = "store", "Store"
+        REPAIR_SHOP = "repair_shop", "Repair shop"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order_id = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="promotion_payments"
+    )
+    target_type = models.CharField(max_length=20, choices=Target.choices)
+    target_id = models.UUIDField()
+    plan = models.CharField(max_length=20)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    capture_id = models.CharField(max_length=64, blank=True)
+    failure_reason = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "promotion_payments"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(status="pending"),
+                name="promotion_payments_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id} — {self.status}"
+
+
+class Order(models.Model):
+    """
+    A buyer's purchase of one listing, paid through PayPal.
+
+    Checkout reserves the listing by moving it from active to pending in the
+    same transaction that creates the order (see checkout.py); the partial
+    unique constraint below allows one live order per listing, so no listing
+    can be sold twice. Unpaid orders expire after ORDER_RESERVATION_MINUTES and
+    release their listing. Every status change is appended to OrderEvent.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending payment"
+        PAID = "paid", "Paid"
+        SHIPPED = "shipped", "Shipped"
+        DELIVERED = "delivered", "Delivered"
+        DISPUTED = "disputed", "Disputed"
+        REFUNDED = "refunded", "Refunded"
+        CANCELLED = "cancelled", "Cancelled"
+        EXPIRED = "expired", "Expired"
+
+    # Orders in these states no longer hold their listing.
+    CLOSED = (Status.REFUNDED, Status.CANCELLED, Status.EXPIRED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    buyer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="purchases")
+    seller = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="sales")
+    listing = models.ForeignKey("listings.Listing", on_delete=models.PROTECT, related_name="orders")
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    currency = models.CharField(max_length=3)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    paypal_order_id = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    capture_id = models.CharField(max_length=64, blank=True)
+    shipping_address = models.JSONField(default=dict, blank=True)
+    tracking_number = models.CharField(max_length=100, blank=True)
+    expires_at = models.DateTimeField()
+    capture_requested_at = models.DateTimeField(null=True, blank=True)  # set once the buyer approves payment
+    paid_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "orders"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["listing"],
+                condition=~models.Q(status__in=["refunded", "cancelled", "expired"]),
+                name="orders_one_live_per_listing",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["buyer", "-created_at"], name="orders_buyer_idx"),
+            models.Index(fields=["seller", "-created_at"], name="orders_seller_idx"),
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(status="pending"),
+                name="orders_pending_expiry_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Order {self.id} — {self.status}"
+
+
+class OrderEvent(models.Model):
+    """
+    Append-only ledger of order status changes. A database trigger rejects
+    UPDATE and DELETE on the table (migration 0002_orders).
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    order = models.ForeignKey(Order, on_delete=models.PROTECT, related_name="events")
+    from_status = models.CharField(max_length=20, choices=Order.Status.choices, blank=True)
+    to_status = models.CharField(max_length=20, choices=Order.Status.choices)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.PROTECT, null=True, blank=True, related_name="+"
+    )
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "order_events"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.order_id}: {self.from_status or '—'} → {self.to_status}"
@@ -0,0 +1,117 @@
+"""
+Promotion payment lifecycle: start a capture, then complete or fail it.
+
+complete() and fail() lock the payment row and act only on pending payments,
+so the capture task, the webhook and the reconciliation sweep can all report
+the same order without applying a promotion twice.
+"""
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.listings.models import Listing, ListingPromotion, PROMOTION_PLANS
+from apps.repairs.models import RepairShop, RepairPromotion, REPAIR_PROMOTION_PLANS
+from apps.stores.models import Store, StorePromotion, STORE_PROMOTION_PLANS
+from .models import PromotionPayment
+
+logger = logging.getLogger(__name__)
+
+# target_type -> (target model, promotion model, plans)
+TARGETS = {
+    PromotionPayment.Target.LISTING: (Listing, ListingPromotion, PROMOTION_PLANS),
+    PromotionPayment.Target.STORE: (Store, StorePromotion, STORE_PROMOTION_PLANS),
+    PromotionPayment.Target.REPAIR_SHOP: (RepairShop, RepairPromotion, REPAIR_PROMOTION_PLANS),
+}
+
+
+def start_capture(user, target_type, target, plan, order_id):
+    """
+    Record a pending payment for ``order_id`` and queue its capture.
+
+    Repeating the call for the same order returns the existing payment. Returns
+    None if the order is already attached to another user or target.
+    """
+    from .tasks import capture_payment
+
+    plans = TARGETS[target_type][2]
+    payment, _ = PromotionPayment.objects.get_or_create(
+        order_id=order_id,
+        defaults={
+            "user": user,
+            "target_type": target_type,
+            "target_id": target.pk,
+            "plan": plan,
+            "amount": Decimal(plans[plan]["price"]),
+        },
+    )
+    if (payment.user_id, payment.target_type, payment.target_id) != (user.pk, target_type, target.pk):
+        return None
+    if payment.status == PromotionPayment.Status.PENDING:
+        transaction.on_commit(lambda: capture_payment.delay(str(payment.pk)))
+    return payment
+
+
+def captured_money(resource):
+    """(amount, currency code) from a capture resource or an order's first purchase unit; (None, "") if absent."""
+    amount = resource.get("amount")
+    if amount is None:
+        units = resource.get("purchase_units") or [{}]
+        captures = (units[0].get("payments") or {}).get("captures") or []
+        amount = captures[0].get("amount") if captures else units[0].get("amount")
+    try:
+        return Decimal(amount["value"]), amount.get("currency_code", "")
+    except (TypeError, KeyError, InvalidOperation):
+        return None, ""
+
+
+def _capture_id(resource):
+    if "purchase_units" not in resource:
+        return resource.get("id", "")
+    captures = (resource["purchase_units"][0].get("payments") or {}).get("captures") or []
+    return captures[0].get("id", "") if captures else ""
+
+
+def complete(order_id, resource):
+    """Mark the payment for ``order_id`` completed and apply its promotion, once."""
+    with transaction.atomic():
+        payment = PromotionPayment.objects.select_for_update().filter(order_id=order_id).first()
+        if payment is None or payment.status != PromotionPayment.Status.PENDING:
+            return payment
+
+        # Promotions are priced in EUR; anything else, or no amount at all, is not applied.
+        amount, currency = captured_money(resource)
+        if amount is None:
+            return _mark_failed(payment, "Capture did not report an amount.")
+        if (amount, currency) != (payment.amount, "EUR"):
+            return _mark_failed(payment, f"Captured {amount} {currency}, expected {payment.amount} EUR.")
+
+        target_model, promotion_model, _ = TARGETS[payment.target_type]
+        target = target_model.objects.filter(pk=payment.target_id).first()
+        if target is None:
+            return _mark_failed(payment, "Promoted item no longer exists.")
+        promotion_model.activate(target, payment.plan)
+
+        payment.status = PromotionPayment.Status.COMPLETED
+        payment.capture_id = _capture_id(resource)
+        payment.completed_at = timezone.now()
+        payment.save(update_fields=["status", "capture_id", "completed_at", "updated_at"])
+    logger.info("Payment %s completed", order_id)
+    return payment
+
+
+def _mark_failed(payment, reason):
+    payment.status = PromotionPayment.Status.FAILED
+    payment.failure_reason = reason[:255]
+    payment.save(update_fields=["status", "failure_reason", "updated_at"])
+    logger.warning("Payment %s failed: %s", payment.order_id, reason)
+    return payment
+
+
+def fail(order_id, reason):
+    with transaction.atomic():
+        payment = PromotionPayment.objects.select_for_update().filter(order_id=order_id).first()
+        if payment is None or payment.status != PromotionPayment.Status.PENDING:
+            return payment
+        return _mark_failed(payment, reason)
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+from .models import Order, OrderEvent, PromotionPayment
+
+
+class PromotionPaymentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PromotionPayment
+        fields = (
+            "id", "order_id", "target_type", "target_id", "plan", "amount",
+            "status", "failure_reason", "created_at", "completed_at",
+        )
+
+
+class OrderEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderEvent
+        fields = ("id", "from_status", "to_status", "data", "created_at")
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    listing_title = serializers.CharField(source="listing.title", read_only=True)
+
+    class Meta:
+        model = Order
+        fields = (
+            "id", "listing", "listing_title", "buyer", "seller", "amount", "currency", "status",
+            "paypal_order_id", "shipping_address", "tracking_number", "expires_at", "capture_requested_at",
+            "paid_at", "created_at", "updated_at",
+        )
+
+
+class OrderDetailSerializer(OrderSerializer):
+    events = OrderEventSerializer(many=True, read_only=True)
+
+    class Meta(OrderSerializer.Meta):
+        fields = OrderSerializer.Meta.fields + ("events",)
+
+
+class CreateOrderSerializer(serializers.Serializer):
+    listing_id = serializers.UUIDField()
+    shipping_address = serializers.DictField(child=serializers.CharField(allow_blank=True), required=False)
+
+
+class ShipOrderSerializer(serializers.Serializer):
+    tracking_number = serializers.CharField(max_length=100)
+
+
+class DisputeOrderSerializer(serializers.Serializer):
+    reason = serializers.CharField(max_length=1000)
@@ -0,0 +1,108 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from config.paypal_utils import PayPalError, PayPalUnavailable, get_client
+from . import checkout, expiry, featured, payments
+from .models import Order, PromotionPayment
+
+logger = logging.getLogger(__name__)
+
+# Pending payments older than this are captured again by the sweep.
+STALE_AFTER = timedelta(minutes=5)
+GIVE_UP_AFTER = timedelta(days=3)
+
+
+@shared_task(bind=True, max_retries=6)
+def capture_payment(self, payment_id):
+    """Capture a pending payment's PayPal order and complete or fail it."""
+    payment = PromotionPayment.objects.filter(pk=payment_id).first()
+    if payment is None or payment.status != PromotionPayment.Status.PENDING:
+        return payment and payment.status
+
+    client = get_client()
+    try:
+        try:
+            result = client.capture_order(payment.order_id)
+        except PayPalUnavailable:
+            raise
+        except PayPalError:
+            # Typically ORDER_ALREADY_CAPTURED from an earlier attempt whose reply
+            # we lost; the order itself says whether the money arrived.
+            result = client.get_order(payment.order_id)
+    except PayPalUnavailable as exc:
+        raise self.retry(exc=exc, countdown=min(30 * 2 ** self.request.retries, 900))
+    except PayPalError as exc:
+        return payments.fail(payment.order_id, str(exc)).status
+
+    if result.get("status") == "COMPLETED":
+        return payments.complete(payment.order_id, result).status
+    return payments.fail(payment.order_id, f"Order status is {result.get('status')}.").status
+
+
+@shared_task(bind=True, max_retries=6)
+def capture_order(self, order_id):
+    """Capture a pending listing order's PayPal payment and mark it paid or cancel it."""
+    order = Order.objects.filter(pk=order_id).first()
+    if order is None or order.status != Order.Status.PENDING:
+        return order and order.status
+
+    client = get_client()
+    try:
+        try:
+            result = client.capture_order(order.paypal_order_id)
+        except PayPalUnavailable:
+            raise
+        except PayPalError:
+            result = client.get_order(order.paypal_order_id)
+    except PayPalUnavailable as exc:
+        raise self.retry(exc=exc, countdown=min(30 * 2 ** self.request.retries, 900))
+    except PayPalError as exc:
+        return checkout.fail(order.paypal_order_id, str(exc)).status
+
+    if result.get("status") == "COMPLETED":
+        return checkout.complete(order.paypal_order_id, result).status
+    return checkout.fail(order.paypal_order_id, f"Order status is {result.get('status')}.").status
+
+
+@shared_task
+def expire_orders():
+    """Expire unpaid listing orders past their reservation and put the listings back on sale."""
+    return checkout.expire_all()
+
+
+@shared_task
+def reconcile_pending_payments():
+    """Re-queue captures that neither the task nor a webhook has settled."""
+    now = timezone.now()
+    expired = PromotionPayment.objects.filter(
+        status=PromotionPayment.Status.PENDING, created_at__lt=now - GIVE_UP_AFTER
+    ).values_list("order_id", flat=True)
+    for order_id in list(expired):
+        payments.fail(order_id, "Payment was not settled in time.")
+
+    stale = list(
+        PromotionPayment.objects.filter(
+            status=PromotionPayment.Status.PENDING, updated_at__lt=now - STALE_AFTER
+        ).values_list("pk", flat=True)
+    )
+    for pk in stale:
+        capture_payment.delay(str(pk))
+    if stale:
+        logger.info("Re-queued %d pending payments", len(stale))
+    return len(stale)
+
+
+@shared_task
+def expire_promotions():
+    """Deactivate promotions past their expiry and clear the featured flags they set."""
+    return expiry.expire_all()
+
+
+@shared_task
+def rebuild_featured(kind=None):
+    """Reload featured carousels from the database; all kinds unless ``kind`` is given."""
+    kinds = [kind] if kind else list(featured.KINDS)
+    return {kind: featured.rebuild(kind) for kind in kinds}
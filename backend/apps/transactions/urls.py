@@ -1,3 +1,16 @@
 from django.urls import path
-urlpatterns = []
+from . import views
 
+urlpatterns = [
+    path("", views.orders, name="orders"),
+    path("<uuid:pk>/", views.order_detail, name="order-detail"),
+    path("<uuid:pk>/capture/", views.order_capture, name="order-capture"),
+    path("<uuid:pk>/cancel/", views.order_cancel, name="order-cancel"),
+    path("<uuid:pk>/ship/", views.order_ship, name="order-ship"),
+    path("<uuid:pk>/confirm/", views.order_confirm, name="order-confirm"),
+    path("<uuid:pk>/dispute/", views.order_dispute, name="order-dispute"),
+    path("<uuid:pk>/invoice/", views.order_invoice, name="order-invoice"),
+    path("payments/<str:order_id>/", views.payment_status, name="payment-status"),
+    path("payments/<str:order_id>/invoice/", views.payment_invoice, name="payment-invoice"),
+    path("paypal/webhook/", views.paypal_webhook, name="paypal-webhook"),
+]
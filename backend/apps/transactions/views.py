@@ -1,3 +1,211 @@
-from django.shortcuts import render
+import logging
 
-# Create your views here.
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+
+from apps.documents import service as documents
+from config.paypal_utils import PayPalError, get_client
+from . import checkout, payments
+from .models import Order, PromotionPayment
+from .serializers import (
+    CreateOrderSerializer, DisputeOrderSerializer, OrderDetailSerializer, OrderSerializer,
+    PromotionPaymentSerializer, ShipOrderSerializer,
+)
+from .tasks import capture_payment
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def payment_status(request, order_id):
+    """GET — poll the outcome of a promotion payment after capture-order returned 202."""
+    try:
+        payment = PromotionPayment.objects.get(order_id=order_id, user=request.user)
+    except PromotionPayment.DoesNotExist:
+        return Response({"error": "Payment not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(PromotionPaymentSerializer(payment).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def payment_invoice(request, order_id):
+    """GET — invoice PDF for a completed promotion payment: ``{"url"}``, or 202 while it is drawn."""
+    payment = PromotionPayment.objects.select_related("user").filter(order_id=order_id, user=request.user).first()
+    if payment is None:
+        return Response({"error": "Payment not found."}, status=status.HTTP_404_NOT_FOUND)
+    return documents.respond(request, documents.PROMOTION_INVOICE, payment)
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def paypal_webhook(request):
+    """
+    POST — PayPal webhook. The signature is checked with PayPal before the
+    event is trusted; completed or denied captures settle the matching payment.
+    """
+    try:
+        verified = get_client().verify_webhook_signature(request.headers, request.data)
+    except PayPalError:
+        logger.exception("PayPal webhook verification failed")
+        return Response({"error": "Could not verify webhook."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    if not verified:
+        return Response({"error": "Invalid webhook signature."}, status=status.HTTP_400_BAD_REQUEST)
+
+    event_type = request.data.get("event_type", "")
+    resource = request.data.get("resource") or {}
+    if event_type.startswith("PAYMENT.CAPTURE."):
+        order_id = ((resource.get("supplementary_data") or {}).get("related_ids") or {}).get("order_id")
+    else:
+        order_id = resource.get("id")
+
+    if order_id:
+        # A PayPal order pays either for a promotion or for a listing order.
+        is_promotion = PromotionPayment.objects.filter(order_id=order_id).exists()
+        if event_type == "PAYMENT.CAPTURE.COMPLETED":
+            if is_promotion:
+                payments.complete(order_id, resource)
+            else:
+                checkout.complete(order_id, resource)
+        elif event_type in ("PAYMENT.CAPTURE.DENIED", "PAYMENT.CAPTURE.DECLINED"):
+            if is_promotion:
+                payments.fail(order_id, f"PayPal reported {event_type}.")
+            else:
+                checkout.fail(order_id, f"PayPal reported {event_type}.")
+        elif event_type == "CHECKOUT.ORDER.APPROVED":
+            # Capture is still outstanding; settle it now instead of waiting for the sweep.
+            payment = PromotionPayment.objects.filter(order_id=order_id, status=PromotionPayment.Status.PENDING).first()
+            if payment:
+                capture_payment.delay(str(payment.pk))
+    return Response({"received": True})
+
+
+class OrderPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+
+
+def _get_order(request, pk):
+    qs = Order.objects.select_related("listing", "buyer", "seller").prefetch_related("events")
+    if not request.user.is_staff:
+        qs = qs.filter(Q(buyer=request.user) | Q(seller=request.user))
+    return qs.filter(pk=pk).first()
+
+
+def _order_response(request, pk, status_code=status.HTTP_200_OK):
+    return Response(OrderDetailSerializer(_get_order(request, pk)).data, status=status_code)
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def orders(request):
+    """
+    GET  — your purchases, or your sales with ``?role=seller``; ``?status=`` to filter.
+    POST — buy a listing: reserves it for ORDER_RESERVATION_MINUTES and opens
+           the PayPal order to approve, then POST .../capture/.
+    """
+    if request.method == "GET":
+        role = "seller" if request.GET.get("role") == "seller" else "buyer"
+        qs = Order.objects.filter(**{role: request.user}).select_related("listing")
+        if request.GET.get("status"):
+            qs = qs.filter(status=request.GET["status"])
+        paginator = OrderPagination()
+        page = paginator.paginate_queryset(qs, request)
+        return paginator.get_paginated_response(OrderSerializer(page, many=True).data)
+
+    serializer = CreateOrderSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    order = checkout.reserve(
+        request.user, serializer.validated_data["listing_id"], serializer.validated_data.get("shipping_address")
+    )
+    if order is None:
+        return Response({"error": "This listing is not available."}, status=status.HTTP_409_CONFLICT)
+    try:
+        checkout.create_payment(order)
+    except PayPalError:
+        logger.exception("Could not open PayPal order for order %s", order.pk)
+        checkout.act(order.pk, request.user, "cancel", data={"reason": "Payment could not be started."})
+        return Response({"error": "Failed to create payment order."}, status=status.HTTP_502_BAD_GATEWAY)
+    return _order_response(request, order.pk, status.HTTP_201_CREATED)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def order_detail(request, pk):
+    order = _get_order(request, pk)
+    if order is None:
+        return Response({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(OrderDetailSerializer(order).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def order_invoice(request, pk):
+    """GET — invoice PDF for a paid order: ``{"url"}``, or 202 while it is drawn."""
+    order = _get_order(request, pk)
+    if order is None:
+        return Response({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+    return documents.respond(request, documents.ORDER_INVOICE, order)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def order_capture(request, pk):
+    """POST — the buyer approved the PayPal order; capture it in the background and poll the order."""
+    try:
+        order = checkout.begin_capture(pk, request.user)
+    except checkout.InvalidTransition as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_409_CONFLICT)
+    if order is None:
+        return Response({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+    return _order_response(request, pk, status.HTTP_202_ACCEPTED)
+
+
+def _act(request, pk, action, serializer_class=None):
+    data, fields = {}, {}
+    if serializer_class:
+        serializer = serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        if action == "ship":
+            fields = {"tracking_number": data["tracking_number"]}
+    try:
+        order = checkout.act(pk, request.user, action, data, **fields)
+    except checkout.InvalidTransition as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_409_CONFLICT)
+    if order is None:
+        return Response({"error": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+    return _order_response(request, pk)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def order_cancel(request, pk):
+    """POST — buyer gives up an unpaid order; the listing goes back on sale."""
+    return _act(request, pk, "cancel")
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def order_ship(request, pk):
+    """POST — seller marks a paid order shipped with its tracking number."""
+    return _act(request, pk, "ship", ShipOrderSerializer)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def order_confirm(request, pk):
+    """POST — buyer confirms delivery."""
+    return _act(request, pk, "confirm")
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def order_dispute(request, pk):
+    """POST — buyer raises a dispute on a paid order."""
+    return _act(request, pk, "dispute", DisputeOrderSerializer)
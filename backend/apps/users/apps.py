@@ -4,3 +4,16 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
 
+    def ready(self):
+        from django.db import transaction
+        from django.db.models.signals import post_delete, post_save
+        from . import user_cache
+        from .models import User
+
+        def drop_cached_user(sender, instance, **kwargs):
+            # Again after commit, in case a request re-cached the old row in between.
+            user_cache.invalidate(instance.pk)
+            transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
+
+        post_save.connect(drop_cached_user, sender=User, dispatch_uid="users.drop_cached_user.save")
+        post_delete.connect(drop_cached_user, sender=User, dispatch_uid="users.drop_cached_user.delete")
@@ -0,0 +1,28 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .models import User
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """
+    Authenticate with an email address or a username, case-insensitively.
+
+    The user is found in one query served by the lower(email)/lower(username)
+    indexes, and the password hash is computed exactly once whether or not a
+    user matched.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = User.objects.get_for_login(username)
+        if user is None:
+            # Run the hasher anyway so response time doesn't reveal whether the account exists.
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,99 @@
+"""
+Refresh-token blacklist served from Redis.
+
+The token_blacklist tables remain the source of truth. Every blacklisted jti
+is mirrored to a Redis key that expires together with the token. Redis
+answers on its own only while the warm marker is set, meaning the mirror was
+fully loaded from the database. If the marker is missing (Redis was flushed
+or restarted), checks fall back to the database and a reload is queued.
+
+The marker lasts WARM_TTL and Celery beat reloads the mirror more often than
+that. On a shared Redis that evicts keys, a dropped jti key would otherwise
+let its revoked token through for as long as the marker survived; the reload
+puts it back, so that window is at most WARM_TTL.
+"""
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+WARM_KEY = "users:blacklist:warm"
+WARMING_KEY = "users:blacklist:warming"
+WARM_TTL = 60 * 60  # seconds; beat re-warms every 30 minutes (see config/settings.py)
+
+
+def _key(jti):
+    return f"users:blacklist:{jti}"
+
+
+def _ttl(expires_at):
+    return int((expires_at - timezone.now()).total_seconds())
+
+
+def add(jti, expires_at):
+    ttl = _ttl(expires_at)
+    if ttl <= 0:
+        return
+    try:
+        cache.set(_key(jti), 1, timeout=ttl)
+    except Exception:
+        logger.exception("Could not mirror blacklisted token %s to Redis", jti)
+        # The mirror is now incomplete; make checks go to the database until it is reloaded.
+        try:
+            cache.delete(WARM_KEY)
+        except Exception:
+            pass
+
+
+def _in_database(jti):
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def is_blacklisted(jti):
+    try:
+        found = cache.get_many([WARM_KEY, _key(jti)])
+    except Exception:
+        logger.exception("Blacklist cache unavailable, checking database")
+        return _in_database(jti)
+    if _key(jti) in found:
+        return True
+    if WARM_KEY in found:
+        return False
+    schedule_warm()
+    return _in_database(jti)
+
+
+def schedule_warm():
+    from .tasks import warm_token_blacklist
+
+    try:
+        if cache.add(WARMING_KEY, 1, timeout=300):
+            warm_token_blacklist.delay()
+    except Exception:
+        logger.exception("Could not schedule blacklist warm-up")
+
+
+def warm(batch_size=1000):
+    """Mirror every unexpired blacklisted token into Redis, then set the warm marker."""
+    now = timezone.now()
+    loaded = 0
+    last_pk = None
+    while True:
+        qs = BlacklistedToken.objects.filter(token__expires_at__gt=now).order_by("pk")
+        if last_pk is not None:
+            qs = qs.filter(pk__gt=last_pk)
+        batch = list(qs.values_list("pk", "token__jti", "token__expires_at")[:batch_size])
+        if not batch:
+            break
+        for _, jti, expires_at in batch:
+            ttl = _ttl(expires_at)
+            if ttl > 0:
+                cache.set(_key(jti), 1, timeout=ttl)
+        loaded += len(batch)
+        last_pk = batch[-1][0]
+    cache.set(WARM_KEY, 1, timeout=WARM_TTL)
+    cache.delete(WARMING_KEY)
+    return loaded
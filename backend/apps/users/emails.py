@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.urls import reverse
+
+from apps.notifications import outbox
+
+
+def send_verification_email(request, user, verification):
+    url = request.build_absolute_uri(reverse("auth-verify-email", args=[verification.token]))
+    outbox.enqueue(
+        user.email,
+        "Verify your TimeTrader email",
+        f"Hi {user.full_name},\n\n"
+        f"Confirm your email address by opening this link within 24 hours:\n{url}\n\n"
+        "If you did not create a TimeTrader account, you can ignore this email.",
+    )
+
+
+def send_password_reset_email(user, reset_token):
+    url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token.token}"
+    outbox.enqueue(
+        user.email,
+        "Reset your TimeTrader password",
+        f"Hi {user.full_name},\n\n"
+        f"Set a new password by opening this link within the next hour:\n{url}\n\n"
+        "If you did not ask for a password reset, you can ignore this email.",
+    )
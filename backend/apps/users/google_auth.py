@@ -0,0 +1,108 @@
+"""
+Google ID-token verification with a cached signing-certificate set.
+
+google.oauth2.id_token.verify_oauth2_token downloads Google's certificates on
+every call. GoogleTokenVerifier fetches them over one pooled HTTP session,
+keeps them (in-process and in the shared cache) for as long as the endpoint's
+Cache-Control max-age allows, and verifies tokens locally. An unknown key id
+triggers one early refetch, so Google's key rotation still works.
+"""
+import logging
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+CACHE_KEY = "users:google_certs"
+DEFAULT_MAX_AGE = 3600
+# Refetch at most this often when a token names a key id we don't have.
+MIN_REFRESH_INTERVAL = 60
+CLOCK_SKEW_SECONDS = 10
+
+
+class CertificateFetchError(Exception):
+    """Google's certificate endpoint could not be reached or returned garbage."""
+
+
+def _max_age(response):
+    match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE
+
+
+class GoogleTokenVerifier:
+    def __init__(self, certs_url=None, timeout=5):
+        self.certs_url = certs_url or settings.GOOGLE_OAUTH_CERTS_URL
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._certs = None
+        self._expires = 0.0
+        self._fetched = 0.0
+
+    def _fetch(self):
+        try:
+            response = self.session.get(self.certs_url, timeout=self.timeout)
+            response.raise_for_status()
+            certs = response.json()
+        except (requests.RequestException, ValueError) as exc:
+            raise CertificateFetchError(str(exc)) from exc
+        max_age = _max_age(response)
+        try:
+            cache.set(CACHE_KEY, certs, timeout=max_age)
+        except Exception:
+            logger.exception("Could not share Google certificates via cache")
+        self._store(certs, max_age)
+        self._fetched = time.monotonic()
+        return certs
+
+    def _store(self, certs, max_age):
+        self._certs, self._expires = certs, time.monotonic() + max_age
+
+    def certs(self, force=False):
+        with self._lock:
+            if not force and self._certs is not None and time.monotonic() < self._expires:
+                return self._certs
+            if not force:
+                try:
+                    shared = cache.get(CACHE_KEY)
+                except Exception:
+                    shared = None
+                if shared is not None:
+                    # The shared copy's remaining lifetime is unknown; hold it locally for a short while.
+                    self._store(shared, MIN_REFRESH_INTERVAL)
+                    return shared
+            elif time.monotonic() - self._fetched < MIN_REFRESH_INTERVAL:
+                return self._certs
+            return self._fetch()
+
+    def verify(self, token, audience):
+        """
+        Decode and verify ``token``. Raises ValueError when the token is
+        invalid, CertificateFetchError when certificates cannot be loaded.
+        """
+        certs = self.certs()
+        key_id = jwt.decode_header(token).get("kid")
+        if key_id and key_id not in certs:
+            certs = self.certs(force=True)
+        claims = jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=CLOCK_SKEW_SECONDS)
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError("Wrong issuer.")
+        return claims
+
+
+_verifier = None
+
+
+def verify_id_token(token, audience):
+    """Verify a Google ID token with the process-wide verifier."""
+    global _verifier
+    if _verifier is None:
+        _verifier = GoogleTokenVerifier()
+    return _verifier.verify(token, audience)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.users import user_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit rate of the JWT user cache across all workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing.")
+
+    def handle(self, *args, **opts):
+        stats = user_cache.stats()
+        self.stdout.write(
+            f"lookups {stats['total']:,}: local {stats['local']:,}, redis {stats['redis']:,}, miss {stats['miss']:,}"
+        )
+        if stats["hit_rate"] is not None:
+            self.stdout.write(f"hit rate {stats['hit_rate']:.1%}")
+        if opts["reset"]:
+            user_cache.reset_stats()
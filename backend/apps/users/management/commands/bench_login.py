@@ -0,0 +1,88 @@
+import random
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.models import User
+
+BENCH_DOMAIN = "login-bench.invalid"
+PASSWORD = "bench-password-1"
+
+
+def legacy_login(login, password):
+    """The resolution LoginSerializer used before EmailOrUsernameBackend."""
+    from django.contrib.auth.backends import ModelBackend
+
+    backend = ModelBackend()
+    user = None
+    if "@" in login:
+        user = backend.authenticate(None, username=login, password=password)
+    if not user:
+        try:
+            matched = User.objects.get(username__iexact=login)
+            user = backend.authenticate(None, username=matched.email, password=password)
+        except User.DoesNotExist:
+            pass
+    return user
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare login throughput of the legacy two-step lookup against "
+        "EmailOrUsernameBackend, single worker, using the configured password hasher."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--attempts", type=int, default=100)
+
+    def handle(self, *args, **opts):
+        password_hash = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [
+                User(email=f"user{i}@{BENCH_DOMAIN}", username=f"bench_user_{i}", password=password_hash)
+                for i in range(opts["users"])
+            ],
+            batch_size=1000,
+        )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {User._meta.db_table}")
+            attempts = self._attempts(opts["users"], opts["attempts"])
+            self._run("legacy", legacy_login, attempts)
+            self._run("backend", lambda login, password: authenticate(None, username=login, password=password), attempts)
+        finally:
+            User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").delete()
+
+    def _attempts(self, users, count):
+        """Equal mix of email, upper-cased username, wrong-password and unknown logins."""
+        rng = random.Random(0)
+        attempts = []
+        for i in range(count):
+            n = rng.randrange(users)
+            kind = i % 4
+            if kind == 0:
+                attempts.append((f"user{n}@{BENCH_DOMAIN}", PASSWORD))
+            elif kind == 1:
+                attempts.append((f"BENCH_USER_{n}", PASSWORD))
+            elif kind == 2:
+                attempts.append((f"user{n}@{BENCH_DOMAIN}", "wrong-password"))
+            else:
+                attempts.append((f"nobody{n}@{BENCH_DOMAIN}", PASSWORD))
+        return attempts
+
+    def _run(self, label, login, attempts):
+        ok = 0
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for username, password in attempts:
+                ok += login(username, password) is not None
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {len(attempts) / elapsed:,.1f} logins/s, "
+            f"{len(queries) / len(attempts):.2f} queries/login, {ok}/{len(attempts)} succeeded"
+        )
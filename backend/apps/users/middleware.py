@@ -0,0 +1,45 @@
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from .authentication import CachedJWTAuthentication
+
+
+@database_sync_to_async
+def _user_for_token(raw_token):
+    auth = CachedJWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+def _raw_token(scope):
+    """Access token from ``?token=`` (browsers) or an ``Authorization: Bearer`` header."""
+    query = parse_qs(scope.get("query_string", b"").decode())
+    if query.get("token"):
+        return query["token"][0]
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] == "Bearer":
+                return parts[1]
+    return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Authenticate WebSocket connections with the same SimpleJWT access tokens as the REST API."""
+
+    async def __call__(self, scope, receive, send):
+        raw_token = _raw_token(scope)
+        if raw_token:
+            scope = dict(scope, user=await _user_for_token(raw_token))
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
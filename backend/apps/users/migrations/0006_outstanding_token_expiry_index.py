@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:45
+
+from django.db import migrations
+
+# token_blacklist belongs to simplejwt, so its models cannot declare the index
+# purge_expired_tokens needs to find expired outstanding tokens.
+CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS token_outstanding_expires_idx "
+    "ON token_blacklist_outstandingtoken (expires_at)"
+)
+DROP_INDEX = "DROP INDEX IF EXISTS token_outstanding_expires_idx"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_token_expiry_indexes'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
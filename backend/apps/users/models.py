@@ -1,6 +1,7 @@
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import timedelta
 
@@ -15,6 +16,18 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def get_for_login(self, login):
+        """The user whose email or username matches ``login`` case-insensitively, email first."""
+        login = login.strip().lower()
+        matches = list(
+            self.alias(email_lower=Lower("email"), username_lower=Lower("username"))
+            .filter(models.Q(email_lower=login) | models.Q(username_lower=login))[:2]
+        )
+        for user in matches:
+            if user.email.lower() == login:
+                return user
+        return matches[0] if matches else None
+
     def create_superuser(self, email, password=None, **extra_fields):
         extra_fields.setdefault("is_staff", True)
         extra_fields.setdefault("is_superuser", True)
@@ -51,6 +64,10 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         db_table = "users"
+        indexes = [
+            models.Index(Lower("email"), name="users_email_lower_idx"),
+            models.Index(Lower("username"), name="users_username_lower_idx"),
+        ]
 
     def __str__(self):
         return self.email
@@ -78,6 +95,7 @@ class EmailVerificationToken(models.Model):
 
     class Meta:
         db_table = "email_verification_tokens"
+        indexes = [models.Index(fields=["expires_at"])]
 
 
 class PasswordResetToken(models.Model):
@@ -99,3 +117,4 @@ class PasswordResetToken(models.Model):
 
     class Meta:
         db_table = "password_reset_tokens"
+        indexes = [models.Index(fields=["expires_at"])]
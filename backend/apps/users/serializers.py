@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
 from .models import User
+from .tokens import RefreshToken
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -37,17 +39,8 @@ class LoginSerializer(serializers.Serializer):
         login = attrs["email"].strip()
         password = attrs["password"]
 
-        # Try email first, then username
-        user = None
-        if "@" in login:
-            user = authenticate(username=login, password=password)
-        if not user:
-            try:
-                matched = User.objects.get(username__iexact=login)
-                user = authenticate(username=matched.email, password=password)
-            except User.DoesNotExist:
-                pass
-
+        # EmailOrUsernameBackend matches either field in one query
+        user = authenticate(self.context.get("request"), username=login, password=password)
         if not user:
             raise serializers.ValidationError("Invalid credentials.")
         if not user.is_active:
@@ -56,6 +49,10 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    token_class = RefreshToken
+
+
 class UserPublicSerializer(serializers.ModelSerializer):
     """Safe public profile — no sensitive fields."""
     full_name = serializers.CharField(read_only=True)
@@ -0,0 +1,43 @@
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from . import blacklist
+from .models import EmailVerificationToken, PasswordResetToken
+
+logger = logging.getLogger(__name__)
+
+
+def _purge(qs, batch_size):
+    """Delete the rows of ``qs`` in primary-key chunks so no statement holds locks for long."""
+    deleted = 0
+    while True:
+        pks = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += qs.model.objects.filter(pk__in=pks).delete()[1].get(qs.model._meta.label, 0)
+
+
+@shared_task
+def purge_expired_tokens(batch_size=1000):
+    """Remove expired JWT bookkeeping rows and expired email/password tokens."""
+    now = timezone.now()
+    counts = {
+        # Blacklist entries first, so deleting outstanding tokens has nothing to cascade.
+        "blacklisted": _purge(BlacklistedToken.objects.filter(token__expires_at__lt=now), batch_size),
+        "outstanding": _purge(OutstandingToken.objects.filter(expires_at__lt=now), batch_size),
+        "email_verification": _purge(EmailVerificationToken.objects.filter(expires_at__lt=now), batch_size),
+        "password_reset": _purge(PasswordResetToken.objects.filter(expires_at__lt=now), batch_size),
+    }
+    logger.info("Purged expired tokens: %s", counts)
+    return counts
+
+
+@shared_task
+def warm_token_blacklist():
+    """Reload the Redis blacklist mirror and renew its warm marker."""
+    loaded = blacklist.warm()
+    logger.info("Loaded %d blacklisted tokens into Redis", loaded)
+    return loaded
@@ -0,0 +1,150 @@
+"""
+Two-tier cache of User rows for JWT-authenticated requests: a small
+per-process LRU in front of Redis, falling back to the database on a miss.
+
+Saving or deleting a user replaces its Redis entry with a short-lived
+tombstone and drops this process's local entry. Misses write Redis with
+cache.add, so a request that read the old row just before the change cannot
+put it back while the tombstone stands. Other processes keep their local copy
+for at most AUTH_USER_CACHE_LOCAL_TTL seconds, which bounds how long a role
+change or deactivation can go unnoticed.
+
+Entries hold every column except the password hash, pickled, and are
+unpickled per lookup into a User with ``password`` deferred, so each request
+gets its own instance and the hash is only read (from the database) by code
+that actually needs it.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+STATS_FLUSH_EVERY = 100
+TOMBSTONE = "invalidated"
+TOMBSTONE_TTL = 30  # seconds; far longer than a miss takes from its query to its cache write
+CACHED_FIELDS = tuple(f.attname for f in User._meta.concrete_fields if f.attname != "password")
+OUTCOMES = ("local", "redis", "miss")
+
+_local = OrderedDict()
+_lock = threading.Lock()
+_pending_stats = dict.fromkeys(OUTCOMES, 0)
+
+
+def _key(user_id):
+    return f"users:auth:{user_id}"
+
+
+def _stats_key(outcome):
+    return f"users:auth_cache:{outcome}"
+
+
+def _local_get(user_id):
+    with _lock:
+        entry = _local.get(user_id)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires < time.monotonic():
+            del _local[user_id]
+            return None
+        _local.move_to_end(user_id)
+        return data
+
+
+def _local_set(user_id, data):
+    with _lock:
+        _local[user_id] = (time.monotonic() + settings.AUTH_USER_CACHE_LOCAL_TTL, data)
+        _local.move_to_end(user_id)
+        while len(_local) > settings.AUTH_USER_CACHE_LOCAL_SIZE:
+            _local.popitem(last=False)
+
+
+def _record(outcome):
+    """Count a lookup; counts are pushed to Redis in batches to keep them off the hot path."""
+    with _lock:
+        _pending_stats[outcome] += 1
+        if sum(_pending_stats.values()) < STATS_FLUSH_EVERY:
+            return
+        pending = dict(_pending_stats)
+        for name in OUTCOMES:
+            _pending_stats[name] = 0
+    try:
+        for name, count in pending.items():
+            if count:
+                cache.add(_stats_key(name), 0, timeout=None)
+                cache.incr(_stats_key(name), count)
+    except Exception:
+        logger.exception("Could not flush auth cache stats")
+
+
+def _dumps(user):
+    return pickle.dumps(tuple(getattr(user, name) for name in CACHED_FIELDS))
+
+
+def _loads(data):
+    return User.from_db("default", CACHED_FIELDS, pickle.loads(data))
+
+
+def get_user(user_id):
+    """The User with ``user_id``, or None if there is no such user."""
+    user_id = str(user_id)
+    data = _local_get(user_id)
+    if data is not None:
+        _record("local")
+        return _loads(data)
+
+    try:
+        data = cache.get(_key(user_id))
+    except Exception:
+        logger.exception("Auth cache read failed for user %s", user_id)
+        data = None
+    if data is not None and data != TOMBSTONE:
+        _record("redis")
+        _local_set(user_id, data)
+        return _loads(data)
+
+    _record("miss")
+    user = User.objects.filter(pk=user_id).defer("password").first()
+    if user is None:
+        return None
+    data = _dumps(user)
+    try:
+        cache.add(_key(user_id), data, timeout=settings.AUTH_USER_CACHE_TTL)
+    except Exception:
+        logger.exception("Auth cache write failed for user %s", user_id)
+    _local_set(user_id, data)
+    return user
+
+
+def invalidate(user_id):
+    user_id = str(user_id)
+    with _lock:
+        _local.pop(user_id, None)
+    try:
+        cache.set(_key(user_id), TOMBSTONE, timeout=TOMBSTONE_TTL)
+    except Exception:
+        logger.exception("Auth cache invalidation failed for user %s", user_id)
+
+
+def stats():
+    """Lookup counts across all processes (as last flushed) and the overall hit rate."""
+    counts = {name: 0 for name in OUTCOMES}
+    stored = cache.get_many([_stats_key(name) for name in OUTCOMES])
+    for name in OUTCOMES:
+        counts[name] = stored.get(_stats_key(name), 0)
+    total = sum(counts.values())
+    counts["total"] = total
+    counts["hit_rate"] = (counts["local"] + counts["redis"]) / total if total else None
+    return counts
+
+
+def reset_stats():
+    cache.delete_many([_stats_key(name) for name in OUTCOMES])
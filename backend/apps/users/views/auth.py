@@ -3,13 +3,13 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from google.oauth2 import id_token as google_id_token
-from google.auth.transport import requests as google_requests
 from django.conf import settings
 
+from ..emails import send_verification_email, send_password_reset_email
+from ..google_auth import CertificateFetchError, verify_id_token
 from ..models import User, EmailVerificationToken, PasswordResetToken
+from ..tokens import RefreshToken
 from ..serializers import (
     RegisterSerializer,
     LoginSerializer,
@@ -35,15 +35,15 @@ def register(request):
     serializer = RegisterSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = serializer.save()
-    user.is_verified = True
-    user.save(update_fields=["is_verified"])
+    verification = EmailVerificationToken.objects.create(user=user)
+    send_verification_email(request, user, verification)
     return Response(_token_response(user), status=status.HTTP_201_CREATED)
 
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def login(request):
-    serializer = LoginSerializer(data=request.data)
+    serializer = LoginSerializer(data=request.data, context={"request": request})
     serializer.is_valid(raise_exception=True)
     user = serializer.validated_data["user"]
     return Response(_token_response(user))
@@ -95,8 +95,8 @@ def password_reset_request(request):
     email = serializer.validated_data["email"]
     try:
         user = User.objects.get(email=email)
-        PasswordResetToken.objects.create(user=user)
-        # TODO: send reset email via Celery task (Stage 8)
+        reset_token = PasswordResetToken.objects.create(user=user)
+        send_password_reset_email(user, reset_token)
     except User.DoesNotExist:
         pass  # Don't reveal whether email exists
     return Response({"message": "If that email exists, a reset link has been sent."})
@@ -138,13 +138,14 @@ def google_oauth(request):
 
     try:
         google_client_id = getattr(settings, "GOOGLE_CLIENT_ID", None)
-        id_info = google_id_token.verify_oauth2_token(
-            id_token_str,
-            google_requests.Request(),
-            google_client_id,
-        )
+        id_info = verify_id_token(id_token_str, google_client_id)
     except ValueError:
         return Response({"error": "Invalid Google token."}, status=status.HTTP_400_BAD_REQUEST)
+    except CertificateFetchError:
+        return Response(
+            {"error": "Google sign-in is temporarily unavailable."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
 
     email = id_info.get("email")
     if not email:
@@ -156,7 +157,6 @@ def google_oauth(request):
             "username": email.split("@")[0],
             "first_name": id_info.get("given_name", ""),
             "last_name": id_info.get("family_name", ""),
-            "avatar_url": id_info.get("picture", ""),
             "is_verified": True,
             "role": role,
         },
@@ -1,17 +1,20 @@
 import os
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 django_asgi_app = get_asgi_application()
 
+# Imported after Django is set up — these pull in models.
+from apps.users.middleware import JWTAuthMiddlewareStack  # noqa: E402
+from apps.messaging.routing import websocket_urlpatterns as messaging_ws  # noqa: E402
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    "websocket": JWTAuthMiddlewareStack(
         URLRouter([
-            # WebSocket routes added in Stage 8 (messaging)
+            *messaging_ws,
         ])
     ),
 })
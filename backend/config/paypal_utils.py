@@ -1,48 +1,217 @@
+"""
+PayPal Orders API client.
+
+One PayPalClient per process holds a pooled keep-alive session. The OAuth
+access token is cached in Redis until shortly before it expires, so workers
+share it instead of fetching one per call. Writes carry a PayPal-Request-Id,
+so retrying a call (ours or urllib3's) cannot create or capture twice. A
+circuit breaker shared through the cache fails calls fast for a cool-down
+period once PayPal keeps erroring.
+"""
+import hashlib
+import logging
+import uuid
+
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+TOKEN_EXPIRY_MARGIN = 60  # seconds
+TIMEOUT = (3.05, 10)  # connect, read
+
+
+class PayPalError(Exception):
+    """PayPal rejected the request."""
+
+
+class PayPalUnavailable(PayPalError):
+    """PayPal could not be reached or is failing; the circuit may be open."""
 
 
 def _base_url():
+    if getattr(settings, "PAYPAL_BASE_URL", ""):
+        return settings.PAYPAL_BASE_URL.rstrip("/")
     if getattr(settings, "PAYPAL_MODE", "sandbox") == "live":
         return "https://api-m.paypal.com"
     return "https://api-m.sandbox.paypal.com"
 
 
-def _get_access_token():
-    resp = requests.post(
-        f"{_base_url()}/v1/oauth2/token",
-        data={"grant_type": "client_credentials"},
-        auth=(settings.PAYPAL_CLIENT_ID, settings.PAYPAL_CLIENT_SECRET),
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()["access_token"]
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` failures within a ``window``-second window and
+    stays open for ``cooldown`` seconds. Successes do not reset the count, so
+    an endpoint failing every other call still trips it; and since the count
+    outlives the cool-down, the first failure after the circuit closes again
+    reopens it while the window lasts. State lives in the cache so every
+    worker trips together.
+    """
+
+    def __init__(self, name, threshold=5, window=60, cooldown=30):
+        self.failures_key = f"paypal:circuit:{name}:failures"
+        self.open_key = f"paypal:circuit:{name}:open"
+        self.threshold, self.window, self.cooldown = threshold, window, cooldown
+
+    def is_open(self):
+        try:
+            return bool(cache.get(self.open_key))
+        except Exception:
+            return False
+
+    def record_failure(self):
+        try:
+            cache.add(self.failures_key, 0, timeout=self.window)
+            if cache.incr(self.failures_key) >= self.threshold:
+                cache.set(self.open_key, 1, timeout=self.cooldown)
+                logger.warning("PayPal circuit open for %ss", self.cooldown)
+        except Exception:
+            logger.exception("Could not record PayPal failure")
+
+
+class PayPalClient:
+    def __init__(self, client_id=None, client_secret=None, base_url=None):
+        self.client_id = client_id if client_id is not None else settings.PAYPAL_CLIENT_ID
+        self.client_secret = client_secret if client_secret is not None else settings.PAYPAL_CLIENT_SECRET
+        self.base_url = base_url or _base_url()
+        credentials = hashlib.sha256(f"{self.base_url}|{self.client_id}".encode()).hexdigest()[:16]
+        self.token_key = f"paypal:token:{credentials}"
+        self.breaker = CircuitBreaker(credentials)
+
+        # Transient 5xx/429 answers and failed connects are retried in place;
+        # safe because every POST carries a PayPal-Request-Id. Read timeouts
+        # are not: the caller is usually a request thread, and a third 10s wait
+        # on a PayPal that is already slow is better spent failing fast.
+        retry = Retry(
+            total=2,
+            read=0,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _fetch_token(self):
+        resp = self.session.post(
+            f"{self.base_url}/v1/oauth2/token",
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id, self.client_secret),
+            timeout=TIMEOUT,
+        )
+        if resp.status_code >= 400:
+            raise PayPalError(f"Token request failed: {resp.status_code}")
+        data = resp.json()
+        token = data["access_token"]
+        ttl = int(data.get("expires_in", 0)) - TOKEN_EXPIRY_MARGIN
+        if ttl > 0:
+            try:
+                cache.set(self.token_key, token, timeout=ttl)
+            except Exception:
+                logger.exception("Could not cache PayPal access token")
+        return token
+
+    def access_token(self, refresh=False):
+        if not refresh:
+            try:
+                token = cache.get(self.token_key)
+            except Exception:
+                token = None
+            if token:
+                return token
+        return self._fetch_token()
+
+    def request(self, method, path, json=None, request_id=None):
+        if self.breaker.is_open():
+            raise PayPalUnavailable("PayPal circuit is open.")
+        headers = {"Content-Type": "application/json"}
+        if request_id:
+            headers["PayPal-Request-Id"] = request_id
+        try:
+            token = self.access_token()
+            resp = None
+            for refresh in (False, True):
+                if refresh:
+                    # Cached token was revoked or expired early.
+                    token = self.access_token(refresh=True)
+                headers["Authorization"] = f"Bearer {token}"
+                resp = self.session.request(method, f"{self.base_url}{path}", json=json, headers=headers, timeout=TIMEOUT)
+                if resp.status_code != 401:
+                    break
+        except requests.RequestException as exc:
+            self.breaker.record_failure()
+            raise PayPalUnavailable(str(exc)) from exc
+
+        if resp.status_code >= 500 or resp.status_code == 429:
+            self.breaker.record_failure()
+            raise PayPalUnavailable(f"PayPal returned {resp.status_code}")
+        if resp.status_code >= 400:
+            raise PayPalError(f"PayPal returned {resp.status_code}: {resp.text[:500]}")
+        return resp.json()
+
+    def create_order(self, amount, description, request_id=None, currency="EUR"):
+        return self.request(
+            "POST",
+            "/v2/checkout/orders",
+            json={
+                "intent": "CAPTURE",
+                "purchase_units": [{
+                    "amount": {"currency_code": currency, "value": amount},
+                    "description": description,
+                }],
+            },
+            request_id=request_id or str(uuid.uuid4()),
+        )
+
+    def capture_order(self, order_id, request_id=None):
+        # Keyed on the order so any repeat of this capture is a no-op at PayPal.
+        return self.request(
+            "POST",
+            f"/v2/checkout/orders/{order_id}/capture",
+            request_id=request_id or f"capture-{order_id}",
+        )
+
+    def get_order(self, order_id):
+        return self.request("GET", f"/v2/checkout/orders/{order_id}")
+
+    def verify_webhook_signature(self, headers, event):
+        """Ask PayPal whether a webhook delivery is genuine."""
+        if not settings.PAYPAL_WEBHOOK_ID:
+            raise PayPalError("PAYPAL_WEBHOOK_ID is not configured.")
+        result = self.request(
+            "POST",
+            "/v1/notifications/verify-webhook-signature",
+            json={
+                "auth_algo": headers.get("Paypal-Auth-Algo", ""),
+                "cert_url": headers.get("Paypal-Cert-Url", ""),
+                "transmission_id": headers.get("Paypal-Transmission-Id", ""),
+                "transmission_sig": headers.get("Paypal-Transmission-Sig", ""),
+                "transmission_time": headers.get("Paypal-Transmission-Time", ""),
+                "webhook_id": settings.PAYPAL_WEBHOOK_ID,
+                "webhook_event": event,
+            },
+        )
+        return result.get("verification_status") == "SUCCESS"
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = PayPalClient()
+    return _client
 
 
 def create_order(amount: str, description: str) -> dict:
-    token = _get_access_token()
-    resp = requests.post(
-        f"{_base_url()}/v2/checkout/orders",
-        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-        json={
-            "intent": "CAPTURE",
-            "purchase_units": [{
-                "amount": {"currency_code": "EUR", "value": amount},
-                "description": description,
-            }],
-        },
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    return get_client().create_order(amount, description)
 
 
 def capture_order(order_id: str) -> dict:
-    token = _get_access_token()
-    resp = requests.post(
-        f"{_base_url()}/v2/checkout/orders/{order_id}/capture",
-        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-        timeout=10,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    return get_client().capture_order(order_id)
@@ -0,0 +1,52 @@
+"""
+Raw Redis client behind the default cache.
+
+Django's cache API covers get/set/incr, but featured rankings need sorted sets
+and pipelines and the analytics buffer needs lists and RENAME. Rather than
+open a second connection pool, those modules borrow the redis-py client of
+the default cache (django.core.cache.backends.redis.RedisCache), which Django
+only exposes through the private ``_cache`` attribute. Keeping that access
+here means a change of cache backend breaks one function, not every caller.
+Keys must still go through ``cache.make_key`` to share the cache's prefix.
+
+The lock helpers give a background job a single-flight lock: each holder has
+its own token, so only the holder can renew or release it, and a holder that
+renews per unit of work notices as soon as it has lost the lock.
+"""
+import uuid
+
+from django.core.cache import cache
+
+# Extend the lock if ARGV[1] still holds it.
+RENEW_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def get_redis():
+    """The redis-py client the default cache writes with."""
+    return cache._cache.get_client(write=True)
+
+
+def acquire_lock(name, timeout):
+    """Take lock ``name`` for ``timeout`` seconds. Returns the holder's token, or None if it is taken."""
+    token = uuid.uuid4().hex
+    return token if get_redis().set(cache.make_key(name), token, nx=True, ex=timeout) else None
+
+
+def renew_lock(name, token, timeout):
+    """Extend lock ``name`` by ``timeout`` seconds if ``token`` still holds it. Returns whether it does."""
+    return bool(get_redis().eval(RENEW_LOCK, 1, cache.make_key(name), token, timeout))
+
+
+def release_lock(name, token):
+    get_redis().eval(RELEASE_LOCK, 1, cache.make_key(name), token)
@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party
     "rest_framework",
     "rest_framework_simplejwt",
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "django_filters",
     "storages",
+    "channels",
     # Local apps
     "apps.users",
     "apps.listings",
@@ -37,6 +39,9 @@ INSTALLED_APPS = [
     "apps.transactions",
     "apps.messaging",
     "apps.notifications",
+    "apps.analytics",
+    "apps.images",
+    "apps.documents",
 ]
 
 MIDDLEWARE = [
@@ -98,20 +103,121 @@ CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
-
-# Channels
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer",
-        "CONFIG": {
-            "hosts": [REDIS_URL],
-        },
+# Authentication jobs run on their own worker (see docker-compose.yml, celery-authentication)
+CELERY_TASK_ROUTES = {
+    "apps.authentication.tasks.run_authentication": {"queue": "authentication"},
+}
+CELERY_BEAT_SCHEDULE = {
+    "repair-unread-counters": {
+        "task": "apps.messaging.tasks.repair_unread_counters",
+        "schedule": timedelta(hours=1),
+    },
+    "maintain-message-partitions": {
+        "task": "apps.messaging.tasks.maintain_message_partitions",
+        "schedule": timedelta(days=1),
+    },
+    "send-email-outbox": {
+        "task": "apps.notifications.tasks.send_outbox",
+        "schedule": timedelta(minutes=1),
+    },
+    "reconcile-pending-payments": {
+        "task": "apps.transactions.tasks.reconcile_pending_payments",
+        "schedule": timedelta(minutes=5),
+    },
+    "expire-orders": {
+        "task": "apps.transactions.tasks.expire_orders",
+        "schedule": timedelta(minutes=1),
+    },
+    "expire-promotions": {
+        "task": "apps.transactions.tasks.expire_promotions",
+        "schedule": timedelta(minutes=10),
+    },
+    "flush-promotion-events": {
+        "task": "apps.analytics.tasks.flush_promotion_events",
+        "schedule": timedelta(minutes=1),
+    },
+    "roll-up-listing-stats": {
+        "task": "apps.analytics.tasks.roll_up_listing_stats",
+        "schedule": timedelta(minutes=5),
+    },
+    "rebuild-featured": {
+        "task": "apps.transactions.tasks.rebuild_featured",
+        "schedule": timedelta(hours=1),
+    },
+    "send-appointment-reminders": {
+        "task": "apps.repairs.tasks.send_appointment_reminders",
+        "schedule": timedelta(minutes=5),
+    },
+    "collect-unused-images": {
+        "task": "apps.images.tasks.collect_unused_images",
+        "schedule": timedelta(hours=6),
+    },
+    "purge-expired-tokens": {
+        "task": "apps.users.tasks.purge_expired_tokens",
+        "schedule": timedelta(hours=6),
+    },
+    "warm-token-blacklist": {
+        "task": "apps.users.tasks.warm_token_blacklist",
+        "schedule": timedelta(minutes=30),
     },
 }
 
+# Messages are range-partitioned by month (see apps/messaging/partitions.py).
+# Partitions older than MESSAGE_PARTITION_KEEP_MONTHS are detached into the
+# messages_archive schema; 0 keeps everything attached.
+MESSAGE_PARTITION_MONTHS_AHEAD = 3
+MESSAGE_PARTITION_KEEP_MONTHS = int(os.environ.get("MESSAGE_PARTITION_KEEP_MONTHS", "0"))
+
+# Notifications — events for a user within the digest window go out as one email
+NOTIFICATION_DIGEST_WINDOW = int(os.environ.get("NOTIFICATION_DIGEST_WINDOW", "900"))  # seconds
+NOTIFICATION_BATCH_SIZE = 1000
+
+# Email — the console backend prints mail locally; point EMAIL_BACKEND at SMTP in production
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "False") == "True"
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "TimeTrader <no-reply@timetrader.app>")
+EMAIL_TIMEOUT = 10
+
+# Email outbox — mail is queued in the database and sent by Celery workers in
+# batches over one connection; failures back off exponentially from EMAIL_OUTBOX_RETRY_DELAY
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60  # seconds
+
+# Links in outgoing email point here
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000")
+
+# Public URL of this API; media links in cached featured cards are built against it
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
+
+# Channels — set CHANNEL_LAYER_BACKEND=memory to run without Redis (tests, local dev)
+if os.environ.get("CHANNEL_LAYER_BACKEND") == "memory":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [REDIS_URL],
+            },
+        },
+    }
+
 # Auth
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = [
+    "apps.users.backends.EmailOrUsernameBackend",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator", "OPTIONS": {"min_length": 8}},
 ]
@@ -119,7 +225,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -143,10 +249,18 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.TokenRefreshSerializer",
 }
 
+# Users resolved from access tokens are cached in-process for
+# AUTH_USER_CACHE_LOCAL_TTL seconds and in Redis for AUTH_USER_CACHE_TTL
+AUTH_USER_CACHE_TTL = 300
+AUTH_USER_CACHE_LOCAL_TTL = 5
+AUTH_USER_CACHE_LOCAL_SIZE = 1024
+
 # Google OAuth
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", "")
+GOOGLE_OAUTH_CERTS_URL = os.environ.get("GOOGLE_OAUTH_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
 
 # CORS
 CORS_ALLOWED_ORIGINS = os.environ.get(
@@ -155,9 +269,13 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
 ).split(",")
 
 # Storage
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
 USE_S3 = os.environ.get("USE_S3", "False") == "True"
 if USE_S3:
-    DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+    STORAGES["default"] = {"BACKEND": "storages.backends.s3boto3.S3Boto3Storage"}
     AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
     AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME")
@@ -171,10 +289,65 @@ else:
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Listing, store and showcase photos are stored once per distinct content under
+# IMAGE_STORE_PREFIX (apps/images/storage.py); files nothing references are
+# deleted IMAGE_GC_GRACE_HOURS after their last use
+IMAGE_STORE_PREFIX = "cas"
+IMAGE_GC_GRACE_HOURS = 24
+IMAGE_GC_BATCH_SIZE = 500
+
+# Watch authentication — AUTHENTICATION_BACKEND is the model client class
+# (apps.authentication.backends.StubBackend runs locally without Gemini).
+# Photos are downscaled to AUTHENTICATION_IMAGE_MAX_SIDE before inference,
+# results are cached per set of photos for AUTHENTICATION_RESULT_TTL seconds and
+# at most AUTHENTICATION_MODEL_CONCURRENCY model calls run at once across workers
+AUTHENTICATION_BACKEND = os.environ.get("AUTHENTICATION_BACKEND", "apps.authentication.backends.GeminiBackend")
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
+GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")
+AUTHENTICATION_MODEL_CONCURRENCY = int(os.environ.get("AUTHENTICATION_MODEL_CONCURRENCY", "4"))
+AUTHENTICATION_IMAGE_MAX_SIDE = 1024
+AUTHENTICATION_RESIZE_WORKERS = 2
+AUTHENTICATION_RESULT_TTL = 60 * 60 * 24 * 30
+AUTHENTICATION_PASS_SCORE = 0.85
+AUTHENTICATION_SUSPICIOUS_SCORE = 0.5
+
 # PayPal
 PAYPAL_CLIENT_ID     = os.environ.get("PAYPAL_CLIENT_ID", "")
 PAYPAL_CLIENT_SECRET = os.environ.get("PAYPAL_CLIENT_SECRET", "")
 PAYPAL_MODE          = os.environ.get("PAYPAL_MODE", "sandbox")  # "sandbox" or "live"
+PAYPAL_BASE_URL      = os.environ.get("PAYPAL_BASE_URL", "")  # overrides PAYPAL_MODE, e.g. a local fake_paypal server
+PAYPAL_WEBHOOK_ID    = os.environ.get("PAYPAL_WEBHOOK_ID", "")
+
+# Repair appointments are booked in fixed slots cut from each shop's opening hours
+APPOINTMENT_SLOT_MINUTES = 30
+
+# Confirmed appointments get one reminder once they are this close; the beat
+# task claims them APPOINTMENT_REMINDER_BATCH_SIZE at a time
+APPOINTMENT_REMINDER_LEAD_MINUTES = int(os.environ.get("APPOINTMENT_REMINDER_LEAD_MINUTES", "1440"))
+APPOINTMENT_REMINDER_BATCH_SIZE = 500
+
+# Promotion impressions/clicks are buffered per process, pushed to Redis in
+# batches and flushed into PostgreSQL by Celery beat (apps/analytics/events.py)
+ANALYTICS_BUFFER_SIZE = 200
+ANALYTICS_BUFFER_SECONDS = 5
+ANALYTICS_FLUSH_BATCH_SIZE = 5000
+
+# Seller dashboard rollups fold listing views ANALYTICS_ROLLUP_BATCH_SIZE events
+# at a time; saves and conversations are folded up to
+# ANALYTICS_ROLLUP_SETTLE_SECONDS ago so late commits are not skipped
+# (apps/analytics/rollups.py)
+ANALYTICS_ROLLUP_BATCH_SIZE = 50000
+ANALYTICS_ROLLUP_SETTLE_SECONDS = 120
+
+# Promotions past expires_at are deactivated this many per statement (apps/transactions/expiry.py)
+PROMOTION_EXPIRY_BATCH_SIZE = int(os.environ.get("PROMOTION_EXPIRY_BATCH_SIZE", "1000"))
+
+# Checkout holds a listing for ORDER_RESERVATION_MINUTES while the buyer pays;
+# a capture in progress extends that by ORDER_CAPTURE_GRACE_MINUTES. Unpaid
+# orders are expired ORDER_EXPIRY_BATCH_SIZE per statement (apps/transactions/checkout.py)
+ORDER_RESERVATION_MINUTES = int(os.environ.get("ORDER_RESERVATION_MINUTES", "15"))
+ORDER_CAPTURE_GRACE_MINUTES = 15
+ORDER_EXPIRY_BATCH_SIZE = 500
 
 # Third-party API keys
 
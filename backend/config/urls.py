@@ -14,6 +14,7 @@ urlpatterns = [
     path("api/v1/orders/", include("apps.transactions.urls")),
     path("api/v1/messages/", include("apps.messaging.urls")),
     path("api/v1/notifications/", include("apps.notifications.urls")),
+    path("api/v1/analytics/", include("apps.analytics.urls")),
 ]
 
 if settings.DEBUG:
@@ -5,6 +5,7 @@ import { useParams, useRouter } from "next/navigation";
 import Link from "next/link";
 import { useAuthStore } from "@/store/auth";
 import { messagesApi } from "@/lib/messages-api";
+import { connectMessagesSocket } from "@/lib/messages-socket";
 import { ConversationDetail, Message } from "@/types";
 
 function formatTime(dateStr: string) {
@@ -33,7 +34,6 @@ export default function ConversationPage() {
 
   const bottomRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLTextAreaElement>(null);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   const fetchConv = useCallback(async () => {
     const { data } = await messagesApi.get(id);
@@ -46,9 +46,10 @@ export default function ConversationPage() {
 
     fetchConv().finally(() => setLoading(false));
 
-    // Poll for new messages every 4 seconds
-    pollRef.current = setInterval(fetchConv, 4000);
-    return () => { if (pollRef.current) clearInterval(pollRef.current); };
+    // New messages are pushed over the messaging socket; refetching marks them read
+    return connectMessagesSocket((e) => {
+      if (e.event === "message.new" && e.data.conversation_id === id) fetchConv();
+    });
   }, [id, isInitialized, user, router, fetchConv]);
 
   // Scroll to bottom when messages change
@@ -27,7 +27,7 @@ export default function MessagesPage() {
     if (!isInitialized) return;
     if (!user) { router.push("/login?from=/messages"); return; }
     messagesApi.list()
-      .then(({ data }) => setConversations(data))
+      .then(({ data }) => setConversations(data.results))
       .finally(() => setLoading(false));
   }, [isInitialized, user, router]);
 
@@ -4,7 +4,8 @@ import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
 import Image from "next/image";
 import Link from "next/link";
-import { RepairShopDetail, RepairShowcase, Review } from "@/types";
+import { AxiosError } from "axios";
+import { AppointmentAvailability, RepairShopDetail, RepairShowcase, Review } from "@/types";
 import { repairsApi } from "@/lib/repairs-api";
 import { useAuthStore } from "@/store/auth";
 import StarRating from "@/components/shared/StarRating";
@@ -39,6 +40,7 @@ export default function RepairShopDetailPage() {
   const [apptSuccess, setApptSuccess]         = useState(false);
   const [apptError, setApptError]             = useState<string | null>(null);
   const [submittingAppt, setSubmittingAppt]   = useState(false);
+  const [availability, setAvailability]       = useState<AppointmentAvailability | null>(null);
 
   useEffect(() => {
     Promise.all([
@@ -55,6 +57,15 @@ export default function RepairShopDetailPage() {
       .finally(() => setLoading(false));
   }, [slug, router]);
 
+  const shopHasHours = !!shop && Object.values(shop.opening_hours).some(Boolean);
+
+  useEffect(() => {
+    if (!shopHasHours) return;
+    repairsApi.availability(slug, { service: selectedService || undefined })
+      .then(({ data }) => setAvailability(data))
+      .catch(() => setAvailability(null));
+  }, [slug, shopHasHours, selectedService, apptSuccess]);
+
   const submitReview = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!reviewRating) { setReviewError("Please select a rating."); return; }
@@ -79,7 +90,11 @@ export default function RepairShopDetailPage() {
       });
       setApptSuccess(true);
       setSelectedService(""); setScheduledAt(""); setApptNotes("");
-    } catch { setApptError("Failed to book appointment."); }
+    } catch (err) {
+      const axiosErr = err as AxiosError<{ error?: string; scheduled_at?: string[] }>;
+      const data = axiosErr.response?.data;
+      setApptError(data?.error ?? data?.scheduled_at?.[0] ?? "Failed to book appointment.");
+    }
     finally { setSubmittingAppt(false); }
   };
 
@@ -248,6 +263,24 @@ export default function RepairShopDetailPage() {
                 )}
                 <div>
                   <label className="block text-[10px] font-semibold tracking-[0.12em] uppercase text-[#9E9585] mb-1.5">Date & Time</label>
+                  {availability ? (
+                    <select
+                      value={scheduledAt}
+                      onChange={(e) => setScheduledAt(e.target.value)}
+                      className="w-full border border-[#EDE9E3] rounded-lg px-3 py-2.5 text-sm text-[#0E1520] bg-white focus:outline-none focus:ring-2 focus:ring-[#B09145]"
+                    >
+                      <option value="">— Pick a free slot —</option>
+                      {availability.days.filter((d) => d.slots.length > 0).map((d) => (
+                        <optgroup key={d.date} label={new Date(`${d.date}T00:00:00`).toLocaleDateString(undefined, { weekday: "long", day: "numeric", month: "short" })}>
+                          {d.slots.map((s) => (
+                            <option key={s} value={s}>
+                              {new Date(s).toLocaleTimeString(undefined, { hour: "2-digit", minute: "2-digit" })}
+                            </option>
+                          ))}
+                        </optgroup>
+                      ))}
+                    </select>
+                  ) : (
                   <input
                     type="datetime-local"
                     value={scheduledAt}
@@ -255,6 +288,7 @@ export default function RepairShopDetailPage() {
                     min={new Date().toISOString().slice(0, 16)}
                     className="w-full border border-[#EDE9E3] rounded-lg px-3 py-2.5 text-sm text-[#0E1520] focus:outline-none focus:ring-2 focus:ring-[#B09145] bg-white"
                   />
+                  )}
                 </div>
                 <div>
                   <label className="block text-[10px] font-semibold tracking-[0.12em] uppercase text-[#9E9585] mb-1.5">Notes</label>
@@ -0,0 +1,71 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { useParams } from "next/navigation";
+import Link from "next/link";
+import { CertificateVerification } from "@/types";
+import { authenticationApi } from "@/lib/authentication-api";
+import { VerifiedBadge } from "@/components/shared/Badge";
+
+export default function VerifyCertificatePage() {
+  const { id } = useParams<{ id: string }>();
+
+  const [certificate, setCertificate] = useState<CertificateVerification | null>(null);
+  const [loading, setLoading]         = useState(true);
+
+  useEffect(() => {
+    authenticationApi.verify(id)
+      .then(({ data }) => setCertificate(data))
+      .catch(() => setCertificate(null))
+      .finally(() => setLoading(false));
+  }, [id]);
+
+  if (loading) return (
+    <div className="max-w-xl mx-auto px-4 py-16 animate-pulse">
+      <div className="h-56 bg-[#EDE9E3] rounded-2xl" />
+    </div>
+  );
+
+  if (!certificate) return (
+    <div className="max-w-xl mx-auto px-4 py-16 text-center">
+      <div className="bg-white border border-[#EDE9E3] rounded-2xl p-8">
+        <h1 className="text-xl font-bold text-[#0E1520] mb-2">Certificate not valid</h1>
+        <p className="text-sm text-[#9E9585]">
+          No valid TimeTrader certificate matches this link. It may have been withdrawn after a later review.
+        </p>
+        <Link href="/" className="inline-block mt-6 text-xs font-semibold text-[#B09145] hover:underline">
+          Back to TimeTrader
+        </Link>
+      </div>
+    </div>
+  );
+
+  const rows: [string, string][] = [
+    ["Certificate", certificate.number],
+    ["Watch", certificate.watch],
+    ["Verdict", certificate.verdict],
+    ["Issued", certificate.issued],
+  ];
+
+  return (
+    <div className="max-w-xl mx-auto px-4 py-16">
+      <div className="bg-white border border-[#EDE9E3] rounded-2xl p-8">
+        <div className="flex items-center gap-2 mb-1">
+          <h1 className="text-xl font-bold text-[#0E1520]">Certificate verified</h1>
+          <VerifiedBadge />
+        </div>
+        <p className="text-sm text-[#9E9585] mb-6">
+          This certificate was issued by TimeTrader. Check that the details match the printout.
+        </p>
+        <dl className="divide-y divide-[#EDE9E3] border-t border-[#EDE9E3]">
+          {rows.map(([label, value]) => (
+            <div key={label} className="flex justify-between gap-4 py-3 text-sm">
+              <dt className="text-[#9E9585]">{label}</dt>
+              <dd className="text-[#0E1520] font-medium text-right">{value}</dd>
+            </div>
+          ))}
+        </dl>
+      </div>
+    </div>
+  );
+}
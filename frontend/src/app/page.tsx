@@ -51,8 +51,13 @@ export default function HomePage() {
   const [search, setSearch] = useState("");
 
   useEffect(() => {
-    listingsApi.list({ sort: "-created_at" })
-      .then(({ data }) => setFeatured(data.results.slice(0, 3)))
+    listingsApi.featured(3)
+      .then(({ data }) =>
+        data.results.length
+          ? data.results
+          : listingsApi.list({ sort: "-created_at" }).then(({ data }) => data.results.slice(0, 3))
+      )
+      .then(setFeatured)
       .catch(() => {});
   }, []);
 
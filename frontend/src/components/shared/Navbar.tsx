@@ -6,6 +6,7 @@ import { useAuthStore } from "@/store/auth";
 import { useRouter, usePathname } from "next/navigation";
 import { useState, useEffect } from "react";
 import { messagesApi } from "@/lib/messages-api";
+import { connectMessagesSocket } from "@/lib/messages-socket";
 
 const NAV_LINKS = [
   { href: "/listings", label: "Browse" },
@@ -40,10 +41,10 @@ export default function Navbar() {
 
   useEffect(() => {
     if (!user) return;
-    const fetch = () => messagesApi.unread().then(({ data }) => setUnread(data.unread)).catch(() => {});
-    fetch();
-    const interval = setInterval(fetch, 30000);
-    return () => clearInterval(interval);
+    messagesApi.unread().then(({ data }) => setUnread(data.unread)).catch(() => {});
+    return connectMessagesSocket((e) => {
+      if (e.event === "unread.count") setUnread(e.data.unread);
+    });
   }, [user]);
 
   const handleLogout = async () => {
@@ -0,0 +1,12 @@
+import { api } from "./api";
+import { PromotionStats, SellerDashboard } from "@/types";
+
+export const analyticsApi = {
+  // Daily impressions/clicks for the current promotion, or the last `days` days
+  promotionStats: (targetType: PromotionStats["target_type"], targetId: string, days?: number) =>
+    api.get<PromotionStats>(`/analytics/promotions/${targetType}/${targetId}/`, { params: { days } }),
+
+  // Views, saves and conversations across the caller's listings (or one `listing`) over the last `days` days
+  dashboard: (params?: { days?: number; listing?: string }) =>
+    api.get<SellerDashboard>("/analytics/dashboard/", { params }),
+};
@@ -0,0 +1,51 @@
+import { api } from "./api";
+import { AuthenticationAngle, AuthenticationRequest, AuthenticationStatus, CertificateVerification, DocumentLink, PaginatedResponse } from "@/types";
+
+export interface AuthenticationPhoto {
+  file: File;
+  angle?: AuthenticationAngle;
+}
+
+function photosForm(photos: AuthenticationPhoto[]) {
+  const form = new FormData();
+  photos.forEach(({ file, angle }) => {
+    form.append("images", file);
+    form.append("angles", angle ?? "other");
+  });
+  return form;
+}
+
+export const authenticationApi = {
+  list: (params?: { status?: AuthenticationStatus; page?: number }) =>
+    api.get<PaginatedResponse<AuthenticationRequest>>("/authentication/", { params }),
+
+  get: (id: string) =>
+    api.get<AuthenticationRequest>(`/authentication/${id}/`),
+
+  // Returns 202 with status "processing"; poll get() or wait for the notification
+  create: (photos: AuthenticationPhoto[], listingId?: string) => {
+    const form = photosForm(photos);
+    if (listingId) form.append("listing_id", listingId);
+    return api.post<AuthenticationRequest>("/authentication/", form, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+  },
+
+  // Add photos to a finished request and check it again
+  addImages: (id: string, photos: AuthenticationPhoto[]) =>
+    api.post<AuthenticationRequest>(`/authentication/${id}/images/`, photosForm(photos), {
+      headers: { "Content-Type": "multipart/form-data" },
+    }),
+
+  // Authenticated watches only
+  certificate: (id: string) =>
+    api.get<DocumentLink>(`/authentication/${id}/certificate/`),
+
+  // Public — what the QR code on a certificate links to
+  verify: (id: string) =>
+    api.get<CertificateVerification>(`/authentication/${id}/verify/`),
+
+  // Staff only
+  review: (id: string, status: Exclude<AuthenticationStatus, "processing" | "failed">, note?: string) =>
+    api.patch<AuthenticationRequest>(`/authentication/${id}/review/`, { status, note }),
+};
@@ -1,5 +1,5 @@
 import { api } from "./api";
-import { ListingCard, ListingDetail, MyListing, CreateListingData, ListingFilters, PaginatedResponse, ListingImage, ListingPromotion, PromotionPlan } from "@/types";
+import { ListingCard, ListingDetail, MyListing, CreateListingData, ListingFilters, PaginatedResponse, Carousel, ListingImage, ListingPromotion, PromotionPlan, PromotionPayment } from "@/types";
 
 export const listingsApi = {
   list: (filters: ListingFilters = {}) => {
@@ -17,6 +17,9 @@ export const listingsApi = {
     return api.get<PaginatedResponse<ListingCard>>("/listings/", { params });
   },
 
+  featured: (limit?: number) =>
+    api.get<Carousel<ListingCard>>("/listings/featured/", { params: { limit } }),
+
   get: (id: string) =>
     api.get<ListingDetail>(`/listings/${id}/`),
 
@@ -68,5 +71,5 @@ export const listingsApi = {
     api.post<{ order_id: string }>(`/listings/${id}/promote/create-order/`, { plan }),
 
   capturePayPalOrder: (id: string, plan: PromotionPlan, orderId: string) =>
-    api.post<ListingPromotion>(`/listings/${id}/promote/capture-order/`, { plan, order_id: orderId }),
+    api.post<PromotionPayment>(`/listings/${id}/promote/capture-order/`, { plan, order_id: orderId }),
 };
@@ -1,15 +1,15 @@
 import { api } from "./api";
-import { Conversation, ConversationDetail, Message } from "@/types";
+import { Conversation, ConversationDetail, CursorPage, Message } from "@/types";
 
 export const messagesApi = {
-  list: () =>
-    api.get<Conversation[]>("/messages/conversations/"),
+  list: (cursor?: string) =>
+    api.get<CursorPage<Conversation>>("/messages/conversations/", { params: cursor ? { cursor } : undefined }),
 
   start: (listing_id: string, message: string) =>
     api.post<ConversationDetail>("/messages/conversations/", { listing_id, message }),
 
-  get: (id: string) =>
-    api.get<ConversationDetail>(`/messages/conversations/${id}/`),
+  get: (id: string, params?: { before?: string; after?: string; limit?: number }) =>
+    api.get<ConversationDetail>(`/messages/conversations/${id}/`, { params }),
 
   send: (id: string, content: string) =>
     api.post<Message>(`/messages/conversations/${id}/messages/`, { content }),
@@ -0,0 +1,40 @@
+import { getStoredTokens } from "./api";
+import { Message } from "@/types";
+
+export type MessagingEvent =
+  | { event: "message.new"; data: { conversation_id: string; message: Message } }
+  | { event: "message.read"; data: { conversation_id: string; reader_id: string; read_at: string } }
+  | { event: "unread.count"; data: { unread: number } };
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000/api/v1";
+const WS_URL = process.env.NEXT_PUBLIC_WS_URL ?? API_URL.replace(/^http/, "ws").replace(/\/api\/v1\/?$/, "");
+
+/**
+ * Open the per-user messaging socket and reconnect with backoff until the
+ * returned cleanup function is called.
+ */
+export function connectMessagesSocket(onEvent: (event: MessagingEvent) => void): () => void {
+  let socket: WebSocket | null = null;
+  let retry = 0;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let closed = false;
+
+  const open = () => {
+    const token = getStoredTokens()?.access;
+    if (!token || closed) return;
+    socket = new WebSocket(`${WS_URL}/ws/messages/?token=${encodeURIComponent(token)}`);
+    socket.onopen = () => { retry = 0; };
+    socket.onmessage = (e) => onEvent(JSON.parse(e.data) as MessagingEvent);
+    socket.onclose = () => {
+      if (closed) return;
+      timer = setTimeout(open, Math.min(30000, 1000 * 2 ** retry++));
+    };
+  };
+
+  open();
+  return () => {
+    closed = true;
+    if (timer) clearTimeout(timer);
+    socket?.close();
+  };
+}
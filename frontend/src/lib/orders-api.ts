@@ -0,0 +1,34 @@
+import { api } from "./api";
+import { DocumentLink, Order, OrderStatus, PaginatedResponse } from "@/types";
+
+export const ordersApi = {
+  list: (params?: { role?: "buyer" | "seller"; status?: OrderStatus; page?: number }) =>
+    api.get<PaginatedResponse<Order>>("/orders/", { params }),
+
+  get: (id: string) =>
+    api.get<Order>(`/orders/${id}/`),
+
+  // Reserves the listing (409 if someone else has it) and returns the PayPal order to approve
+  create: (listingId: string, shippingAddress?: Record<string, string>) =>
+    api.post<Order>("/orders/", { listing_id: listingId, shipping_address: shippingAddress }),
+
+  // After PayPal approval; returns 202, poll get() until the status leaves "pending"
+  capture: (id: string) =>
+    api.post<Order>(`/orders/${id}/capture/`),
+
+  cancel: (id: string) =>
+    api.post<Order>(`/orders/${id}/cancel/`),
+
+  ship: (id: string, trackingNumber: string) =>
+    api.post<Order>(`/orders/${id}/ship/`, { tracking_number: trackingNumber }),
+
+  confirm: (id: string) =>
+    api.post<Order>(`/orders/${id}/confirm/`),
+
+  dispute: (id: string, reason: string) =>
+    api.post<Order>(`/orders/${id}/dispute/`, { reason }),
+
+  // Paid orders only
+  invoice: (id: string) =>
+    api.get<DocumentLink>(`/orders/${id}/invoice/`),
+};
@@ -0,0 +1,12 @@
+import { api } from "./api";
+import { DocumentLink, PromotionPayment } from "@/types";
+
+export const paymentsApi = {
+  // capture-order returns 202 with a pending payment; poll this until it settles
+  get: (orderId: string) =>
+    api.get<PromotionPayment>(`/orders/payments/${orderId}/`),
+
+  // Completed payments only
+  invoice: (orderId: string) =>
+    api.get<DocumentLink>(`/orders/payments/${orderId}/invoice/`),
+};
@@ -1,10 +1,16 @@
 import { api } from "./api";
-import { RepairShopCard, RepairShopDetail, RepairService, RepairShowcase, RepairPromotion, RepairPromotionPlan, Appointment, Review, PaginatedResponse } from "@/types";
+import { RepairShopCard, RepairShopMatch, RepairShopDetail, RepairService, RepairShowcase, RepairPromotion, RepairPromotionPlan, Appointment, AppointmentAvailability, Review, PaginatedResponse, CursorPage, Carousel, PromotionPayment } from "@/types";
 
 export const repairsApi = {
   list: (params?: { search?: string; city?: string; country?: string; featured?: boolean; page?: number }) =>
     api.get<PaginatedResponse<RepairShopCard>>("/repairs/", { params }),
 
+  featured: (limit?: number) =>
+    api.get<Carousel<RepairShopCard>>("/repairs/featured/", { params: { limit } }),
+
+  searchServices: (params: { q?: string; min_price?: number; max_price?: number; city?: string; country?: string; page?: number }) =>
+    api.get<PaginatedResponse<RepairShopMatch>>("/repairs/services/search/", { params }),
+
   get: (slug: string) =>
     api.get<RepairShopDetail>(`/repairs/${slug}/`),
 
@@ -29,8 +35,18 @@ export const repairsApi = {
   bookAppointment: (slug: string, data: { service?: string; scheduled_at: string; notes?: string }) =>
     api.post<Appointment>(`/repairs/${slug}/appointments/`, data),
 
-  getAppointments: (slug: string, page = 1) =>
-    api.get<PaginatedResponse<Appointment>>(`/repairs/${slug}/appointments/`, { params: { page } }),
+  // Free slots per day; defaults to the next 7 days
+  availability: (slug: string, params?: { start?: string; end?: string; service?: string }) =>
+    api.get<AppointmentAvailability>(`/repairs/${slug}/appointments/availability/`, { params }),
+
+  getAppointments: (slug: string, params?: { from?: string; to?: string; status?: string; order?: "asc"; cursor?: string }) =>
+    api.get<CursorPage<Appointment>>(`/repairs/${slug}/appointments/`, { params }),
+
+  calendarFeed: () =>
+    api.get<{ url: string }>("/repairs/mine/calendar/"),
+
+  rotateCalendarFeed: () =>
+    api.post<{ url: string }>("/repairs/mine/calendar/"),
 
   updateAppointmentStatus: (slug: string, apptId: string, status: string) =>
     api.patch<Appointment>(`/repairs/${slug}/appointments/${apptId}/`, { status }),
@@ -68,7 +84,7 @@ export const repairsApi = {
     api.post<{ order_id: string }>(`/repairs/${slug}/promote/create-order/`, { plan }),
 
   capturePayPalOrder: (slug: string, plan: RepairPromotionPlan, orderId: string) =>
-    api.post<RepairPromotion>(`/repairs/${slug}/promote/capture-order/`, { plan, order_id: orderId }),
+    api.post<PromotionPayment>(`/repairs/${slug}/promote/capture-order/`, { plan, order_id: orderId }),
 
   uploadLogo: (file: File) => {
     const fd = new FormData();
@@ -1,10 +1,13 @@
 import { api } from "./api";
-import { StoreCard, StoreDetail, StorePromotion, StorePromotionPlan, Review, PaginatedResponse, ListingCard } from "@/types";
+import { StoreCard, StoreDetail, StorePromotion, StorePromotionPlan, Review, PaginatedResponse, Carousel, ListingCard, PromotionPayment } from "@/types";
 
 export const storesApi = {
   list: (params?: { search?: string; city?: string; country?: string; featured?: boolean; page?: number }) =>
     api.get<PaginatedResponse<StoreCard>>("/stores/", { params }),
 
+  featured: (limit?: number) =>
+    api.get<Carousel<StoreCard>>("/stores/featured/", { params: { limit } }),
+
   get: (slug: string) =>
     api.get<StoreDetail>(`/stores/${slug}/`),
 
@@ -38,7 +41,7 @@ export const storesApi = {
     api.post<{ order_id: string }>(`/stores/${slug}/promote/create-order/`, { plan }),
 
   capturePayPalOrder: (slug: string, plan: StorePromotionPlan, orderId: string) =>
-    api.post<StorePromotion>(`/stores/${slug}/promote/capture-order/`, { plan, order_id: orderId }),
+    api.post<PromotionPayment>(`/stores/${slug}/promote/capture-order/`, { plan, order_id: orderId }),
 
   getReviews: (slug: string, page = 1) =>
     api.get<PaginatedResponse<Review>>(`/stores/${slug}/reviews/`, { params: { page } }),
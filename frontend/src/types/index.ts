@@ -43,6 +43,10 @@ export interface ApiError {
   fields?: Record<string, string[]>;
 }
 
+export interface Carousel<T> {
+  results: T[];
+}
+
 export interface PaginatedResponse<T> {
   count: number;
   next: string | null;
@@ -50,6 +54,12 @@ export interface PaginatedResponse<T> {
   results: T[];
 }
 
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 // ── Promotions ────────────────────────────────────────────
 
 // Seller listing promotions
@@ -110,6 +120,86 @@ export interface ListingPromotion {
   is_expired: boolean;
 }
 
+export interface PromotionPayment {
+  id: string;
+  order_id: string;
+  target_type: "listing" | "store" | "repair_shop";
+  target_id: string;
+  plan: string;
+  amount: string;
+  status: "pending" | "completed" | "failed";
+  failure_reason: string;
+  created_at: string;
+  completed_at: string | null;
+}
+
+// Invoice/certificate endpoints: the PDF's URL, or 202 { status: "rendering" } — ask again shortly
+export type DocumentLink = { url: string } | { status: "rendering" };
+
+// Public check behind a certificate's verify URL (404 when no valid certificate matches)
+export interface CertificateVerification {
+  number: string;
+  watch: string;
+  verdict: string;
+  issued: string;
+}
+
+export type OrderStatus =
+  | "pending" | "paid" | "shipped" | "delivered" | "disputed" | "refunded" | "cancelled" | "expired";
+
+export interface OrderEvent {
+  id: number;
+  from_status: OrderStatus | "";
+  to_status: OrderStatus;
+  data: Record<string, unknown>;
+  created_at: string;
+}
+
+export interface Order {
+  id: string;
+  listing: string;
+  listing_title: string;
+  buyer: string;
+  seller: string;
+  amount: string;
+  currency: string;
+  status: OrderStatus;
+  paypal_order_id: string | null;
+  shipping_address: Record<string, string>;
+  tracking_number: string;
+  expires_at: string;
+  capture_requested_at: string | null;
+  paid_at: string | null;
+  created_at: string;
+  updated_at: string;
+  events?: OrderEvent[];
+}
+
+export interface PromotionStats {
+  target_type: PromotionPayment["target_type"];
+  target_id: string;
+  promotion: { plan: string; started_at: string; expires_at: string; is_active: boolean } | null;
+  since: string;
+  totals: { impressions: number; clicks: number; ctr: number | null };
+  days: { day: string; impressions: number; clicks: number }[];
+}
+
+export interface ListingStats {
+  views: number;
+  saves: number;
+  conversations: number;
+  conversion: number | null;
+  save_rate: number | null;
+}
+
+export interface SellerDashboard {
+  since: string;
+  updated_at: string | null;
+  totals: ListingStats;
+  days: (ListingStats & { day: string })[];
+  listings: (ListingStats & { listing_id: string; title: string })[];
+}
+
 // ── Listings ──────────────────────────────────────────────
 
 export type ListingCondition = "new" | "excellent" | "good" | "fair" | "poor";
@@ -196,6 +286,33 @@ export interface Conversation {
 
 export interface ConversationDetail extends Conversation {
   messages: Message[];
+  cursors: { before: string | null; after: string | null };
+}
+
+// ── Authentication ────────────────────────────────────────
+
+export type AuthenticationStatus = "processing" | "authenticated" | "needs_review" | "suspicious" | "failed";
+export type AuthenticationAngle = "dial" | "caseback" | "crown" | "serial_number" | "clasp" | "other";
+
+export interface AuthenticationImage {
+  id: string;
+  angle: AuthenticationAngle;
+  url: string;
+}
+
+export interface AuthenticationRequest {
+  id: string;
+  listing: string | null;
+  status: AuthenticationStatus;
+  ai_score: number | null;
+  ai_report: Record<string, unknown> | null;
+  ai_model: string;
+  error: string;
+  review_note: string;
+  images: AuthenticationImage[];
+  completed_at: string | null;
+  created_at: string;
+  updated_at: string;
 }
 
 // ── Store Promotions ───────────────────────────────────────
@@ -353,6 +470,19 @@ export interface RepairShopCard {
   service_count: number;
 }
 
+export interface RepairServiceMatch {
+  id: string;
+  name: string;
+  description: string;
+  price_from: string | null;
+  price_to: string | null;
+  duration_days: number | null;
+}
+
+export interface RepairShopMatch extends RepairShopCard {
+  matched_services: RepairServiceMatch[];
+}
+
 export interface RepairShopDetail extends RepairShopCard {
   description: string;
   phone: string;
@@ -389,6 +519,12 @@ export interface Appointment {
   created_at: string;
 }
 
+export interface AppointmentAvailability {
+  slot_minutes: number;
+  time_zone: string;
+  days: { date: string; slots: string[]; ready_by: string | null }[];
+}
+
 export interface MyListing {
   id: string;
   title: string;